@@ -1,65 +1,193 @@
-from flask import Flask, send_from_directory, redirect, request, jsonify
+import time
+HUB_IMPORT_START = time.perf_counter()
+
+from flask import Flask, send_from_directory, jsonify
+import gzip
+import json
 import os
 import sys
+import threading
 import importlib.util
+import uuid
+import click
+from collections import OrderedDict
+from itertools import chain
+from werkzeug.datastructures import Headers
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
 from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.http import parse_accept_header
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import ClosingIterator
+from fusia_common.snapshot import CacheSnapshot
 
 # Créer l'app Flask principale
 app = Flask(__name__)
-app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
 
-# Ajouter le dossier wiki au path pour pouvoir importer l'app
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'wiki'))
+HUB_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Importer l'app du wiki summarizer
-try:
-    from app import app as summarizer_app, summarizer
-    print("✅ App Wikisummarizer importée avec succès")
-except ImportError as e:
-    print(f"❌ Erreur import Wikisummarizer: {e}")
-    summarizer_app = None
-    summarizer = None
+def jsonify_response(payload, status):
+    """Réponse JSON hors contexte Flask (couche WSGI)"""
+    return Response(json.dumps(payload, ensure_ascii=False), status=status, mimetype='application/json')
 
-# Importer l'app de Mathia avec importlib pour éviter les conflits
-try:
-    mathia_path = os.path.join(os.path.dirname(__file__), 'mathia', 'app.py')
-    if os.path.exists(mathia_path):
-        spec = importlib.util.spec_from_file_location("mathia_module", mathia_path)
-        mathia_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mathia_module)
-        
-        mathia_app = mathia_module.app
-        mathia = mathia_module.mathia
-        
-        print("✅ App Mathia importée avec succès")
-    else:
-        print(f"❌ Fichier Mathia non trouvé: {mathia_path}")
-        mathia_app = None
-        mathia = None
-except Exception as e:
-    print(f"❌ Erreur import Mathia: {e}")
-    mathia_app = None
-    mathia = None
+# Un seul chargement à la fois: le chronomètre d'imports n'est actif que pendant un chargement
+LOAD_LOCK = threading.Lock()
 
-@app.route('/')
-def hub():
-    """Servir le hub (index.html)"""
-    return send_from_directory('.', 'index.html')
+class ImportTimer:
+    """Finder placé en tête de sys.meta_path le temps d'un chargement de sous-application
+    
+    Il délègue la recherche aux finders suivants et remplace, sur l'instance du
+    loader trouvé, exec_module par une version chronométrée: chaque module reçoit
+    son temps propre (imports imbriqués déduits). Seul le thread qui charge est
+    mesuré; les imports des autres threads passent sans détour. Les durées sont
+    partagées entre sous-applications: un module déjà importé par l'une compte
+    aussi pour l'autre si elle en dépend (voir dependencies).
+    """
+    
+    timings = {}  # nom du module -> ms propres
+    
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.nested = []
+    
+    def __enter__(self):
+        sys.meta_path.insert(0, self)
+        return self
+    
+    def __exit__(self, *exc_info):
+        sys.meta_path.remove(self)
+    
+    def find_spec(self, name, path=None, target=None):
+        if threading.get_ident() != self.thread:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        # Loaders partagés (classes des modules intégrés ou gelés): non chronométrés
+        loader = spec.loader
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, 'exec_module'):
+            loader.exec_module = self.timed(name, loader)
+        return spec
+    
+    def timed(self, name, loader):
+        execute = loader.exec_module
+        
+        def exec_module(module):
+            del loader.exec_module
+            start = time.perf_counter()
+            self.nested.append(0.0)
+            try:
+                execute(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = self.nested.pop()
+                if self.nested:
+                    self.nested[-1] += elapsed
+                self.timings[name] = round((elapsed - children) * 1000, 2)
+        
+        return exec_module
+    
+    @classmethod
+    def dependencies(cls, module):
+        """Modules chronométrés atteignables depuis module (modules et objets importés dans ses globales)"""
+        found = set()
+        pending = [module]
+        while pending:
+            for value in list(vars(pending.pop()).values()):
+                name = value.__name__ if isinstance(value, type(sys)) else getattr(value, '__module__', None)
+                if isinstance(name, str) and name in cls.timings and name not in found and name in sys.modules:
+                    found.add(name)
+                    pending.append(sys.modules[name])
+        return found
 
-@app.route('/wikisummarizer')
-def wikisummarizer():
-    """Servir l'interface Wikisummarizer complète"""
-    if summarizer_app:
-        # Si l'app wiki est disponible, servir son interface
-        try:
-            # Chercher le fichier index.html dans le dossier wiki
-            return send_from_directory('wiki', 'index.html')
-        except:
-            # Si pas de fichier HTML, utiliser l'interface de l'app importée
-            return summarizer_app.view_functions['index']() if 'index' in summarizer_app.view_functions else redirect('/')
-    else:
-        # Interface de fallback si l'import a échoué
-        html_interface = '''<!DOCTYPE html>
+class SubApp:
+    """Sous-application (wiki, Mathia) importée à la demande avec importlib
+    
+    Le hub démarre sans importer mistralai, wikipedia, markdown ni les
+    templates: chaque sous-application est chargée par le thread de
+    réchauffage ou, à défaut, par la première requête qui en a besoin.
+    La durée totale et le temps d'import de chaque module dont elle dépend
+    (ImportTimer, sans toucher à builtins.__import__) sont conservés pour
+    suivre les régressions de démarrage, quel que soit l'ordre de
+    chargement des sous-applications. L'objet est lui-même l'application
+    WSGI montée sous son préfixe.
+    """
+    
+    def __init__(self, name, title, path, instance_name, fallback_html):
+        self.name = name
+        self.title = title
+        self.fallback_html = fallback_html
+        self.path = path
+        self.instance_name = instance_name
+        self.module = None
+        self.app = None
+        self.instance = None
+        self.status = 'pending'
+        self.error = None
+        self.load_ms = None
+    
+    def load(self):
+        """Charge le module une seule fois; retourne (app Flask, instance) ou (None, None)"""
+        if self.status in ('available', 'unavailable'):
+            return self.app, self.instance
+        
+        with LOAD_LOCK:
+            if self.status in ('available', 'unavailable'):
+                return self.app, self.instance
+            
+            self.status = 'loading'
+            start = time.perf_counter()
+            try:
+                spec = importlib.util.spec_from_file_location(f"{self.name}_module", self.path)
+                module = importlib.util.module_from_spec(spec)
+                with ImportTimer():
+                    spec.loader.exec_module(module)
+                
+                self.module = module
+                self.app = module.app
+                self.instance = getattr(module, self.instance_name)
+                self.status = 'available'
+                print(f"✅ App {self.name} importée avec succès")
+            except Exception as e:
+                self.error = str(e)
+                self.status = 'unavailable'
+                print(f"❌ Erreur import {self.name}: {e}")
+            finally:
+                self.load_ms = round((time.perf_counter() - start) * 1000, 1)
+        
+        return self.app, self.instance
+    
+    def __call__(self, environ, start_response):
+        """Point d'entrée WSGI du montage: charge la sous-application au premier appel"""
+        sub_app, _ = self.load()
+        if sub_app:
+            return sub_app(environ, start_response)
+        
+        # Sous-application indisponible: page d'erreur pour l'interface, JSON pour l'API
+        if environ.get('PATH_INFO', '').startswith('/api/'):
+            response = jsonify_response({'success': False, 'error': f'{self.title} non disponible'}, 503)
+        else:
+            response = Response(self.fallback_html, status=503, mimetype='text/html')
+        return response(environ, start_response)
+    
+    def report(self):
+        dependencies = ImportTimer.dependencies(self.module) if self.module else set()
+        timings = {name: ImportTimer.timings[name] for name in dependencies}
+        heaviest = sorted(timings.items(), key=lambda item: -item[1])[:15]
+        return {
+            'status': self.status,
+            'load_ms': self.load_ms,
+            'error': self.error,
+            'imported_modules': len(timings),
+            'imports_ms': round(sum(timings.values()), 1),
+            'slowest_imports_ms': dict(heaviest)
+        }
+
+WIKI_FALLBACK_HTML = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -121,22 +249,8 @@ def wikisummarizer():
     </div>
 </body>
 </html>'''
-        return html_interface
 
-@app.route('/mathia')
-@app.route('/mathia/')
-def mathia_page():
-    """Servir l'interface Mathia complète"""
-    if mathia_app:
-        # Utiliser directement la fonction index de l'app Mathia
-        try:
-            return mathia_app.view_functions['index']()
-        except Exception as e:
-            print(f"Erreur lors de l'appel de l'interface Mathia: {e}")
-            return redirect('/')
-    else:
-        # Interface de fallback si l'import a échoué
-        html_interface = '''<!DOCTYPE html>
+MATHIA_FALLBACK_HTML = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -198,70 +312,231 @@ def mathia_page():
     </div>
 </body>
 </html>'''
-        return html_interface
 
-# Routes API du Wikisummarizer - GARDÉES IDENTIQUES
-@app.route('/api/summarize', methods=['POST'])
-def api_summarize():
-    """Proxy vers l'API du summarizer"""
-    if summarizer_app and summarizer:
-        return summarizer_app.view_functions['summarize']()
-    else:
-        return jsonify({'success': False, 'error': 'Wikisummarizer non disponible'}), 500
+wiki = SubApp('wiki', 'Wikisummarizer', os.path.join(HUB_DIR, 'wiki', 'app.py'), 'summarizer', WIKI_FALLBACK_HTML)
+mathia = SubApp('mathia', 'Mathia', os.path.join(HUB_DIR, 'mathia', 'app.py'), 'mathia', MATHIA_FALLBACK_HTML)
 
-@app.route('/api/stats', methods=['GET'])
-def api_stats():
-    """Proxy vers les stats du summarizer"""
-    if summarizer_app and summarizer:
-        return summarizer_app.view_functions['get_stats']()
-    else:
-        return jsonify({'error': 'Wikisummarizer non disponible'}), 500
+# Anciennes URLs de l'API du hub → routes des sous-applications montées
+LEGACY_ROUTES = {
+    '/api/summarize': '/wikisummarizer/api/summarize',
+    '/api/stats': '/wikisummarizer/api/stats',
+    '/api/stats/top': '/wikisummarizer/api/stats/top',
+    '/api/suggest': '/wikisummarizer/api/suggest',
+    '/api/calculate': '/mathia/api/calculate',
+    '/api/chat': '/mathia/api/chat',
+    '/api/mathia/stats': '/mathia/api/stats',
+    '/api/mathia/stats/top': '/mathia/api/stats/top',
+    '/api/mathia/suggest': '/mathia/api/suggest'
+}
 
-# Routes API de Mathia - SIMPLIFIÉES POUR LA NOUVELLE VERSION
-@app.route('/api/calculate', methods=['POST'])
-def api_mathia_calculate():
-    """Proxy vers l'API principale de calcul de Mathia"""
-    if mathia_app and mathia:
-        try:
-            return mathia_app.view_functions['calculate']()
-        except KeyError:
-            return jsonify({'success': False, 'error': 'Route calculate non trouvée dans Mathia'}), 500
-    else:
-        return jsonify({'success': False, 'error': 'Mathia non disponible'}), 500
+class LegacyRoutes:
+    """Réécrit les anciennes URLs de l'API (PATH_INFO) avant le dispatch"""
+    
+    def __init__(self, wsgi_app, routes):
+        self.wsgi_app = wsgi_app
+        self.routes = routes
+    
+    def __call__(self, environ, start_response):
+        target = self.routes.get(environ.get('PATH_INFO', ''))
+        if target:
+            environ['PATH_INFO'] = target
+        return self.wsgi_app(environ, start_response)
 
-@app.route('/api/chat', methods=['POST'])
-def api_mathia_chat():
-    """Proxy vers l'API chat de Mathia"""
-    if mathia_app and mathia:
-        try:
-            return mathia_app.view_functions['chat']()
-        except KeyError:
-            return jsonify({'success': False, 'error': 'Route chat non trouvée dans Mathia'}), 500
-    else:
-        return jsonify({'success': False, 'error': 'Mathia non disponible'}), 500
+class RequestTiming:
+    """Middleware commun à tout le hub: identifiant de requête et durée de traitement
+    
+    X-Request-ID est repris du client (ou généré) et renvoyé; la durée
+    jusqu'aux en-têtes est ajoutée en Server-Timing.
+    """
+    
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+    
+    def __call__(self, environ, start_response):
+        start = time.perf_counter()
+        request_id = environ.get('HTTP_X_REQUEST_ID') or uuid.uuid4().hex[:16]
+        environ['HTTP_X_REQUEST_ID'] = request_id
+        
+        def timed_start_response(status, headers, exc_info=None):
+            duration = (time.perf_counter() - start) * 1000
+            headers = [(name, value) for name, value in headers if name.lower() != 'x-request-id']
+            headers.append(('X-Request-ID', request_id))
+            headers.append(('Server-Timing', f'app;dur={duration:.1f}'))
+            return start_response(status, headers, exc_info)
+        
+        return self.wsgi_app(environ, timed_start_response)
 
-@app.route('/api/mathia/stats', methods=['GET'])
-def api_mathia_stats():
-    """Proxy vers les stats de Mathia"""
-    if mathia_app and mathia:
+class Compression:
+    """Compression gzip/brotli des réponses de tout le hub (HTML, JSON, CSS, JS)
+    
+    Le corps n'est mis en tampon que pour les types textuels de taille connue:
+    les flux (SSE, réponses sans Content-Length), les petits corps et les
+    réponses déjà encodées (fichiers précompressés, hits gzip du cache de
+    réponses) passent tels quels. Une réponse avec un ETag est identifiée par
+    son contenu: sa forme compressée est gardée en mémoire et resservie sans
+    recompresser. L'ETag devient faible (W/) puisque les octets changent.
+    """
+    
+    COMPRESSIBLE = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+    
+    def __init__(self, wsgi_app, min_size=1024, cache_size=256):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.brotli = None
+        self.brotli_checked = False
+        self.stats = {
+            'compressed': 0,
+            'skipped': 0,
+            'cache_hits': 0,
+            'bytes_in': 0,
+            'bytes_out': 0,
+            'by_encoding': {'br': 0, 'gzip': 0}
+        }
+    
+    def negotiate(self, header):
+        """Meilleur encodage accepté par le client (br, puis gzip) ou None"""
+        if not header:
+            return None
+        if not self.brotli_checked:
+            try:
+                import brotli
+                self.brotli = brotli
+            except ImportError:
+                pass
+            self.brotli_checked = True
+        
+        accepted = parse_accept_header(header)
+        for encoding in ('br', 'gzip'):
+            if accepted[encoding] and (encoding == 'gzip' or self.brotli):
+                return encoding
+        return None
+    
+    def compressible(self, status, headers):
+        content_type = headers.get('Content-Type', '')
+        return (status.startswith('200')
+                and 'Content-Encoding' not in headers
+                and headers.get('Content-Length') is not None
+                and not content_type.startswith('text/event-stream')
+                and content_type.startswith(self.COMPRESSIBLE))
+    
+    def compress(self, body, encoding, cacheable):
+        if encoding == 'br':
+            # Forme mise en cache: compression plus poussée, payée une seule fois
+            return self.brotli.compress(body, quality=9 if cacheable else 5)
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    
+    def __call__(self, environ, start_response):
+        encoding = self.negotiate(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None or environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.wsgi_app(environ, start_response)
+        
+        captured = []
+        written = []
+        
+        def capture(status, headers, exc_info=None):
+            captured[:] = [status, headers, exc_info]
+            return written.append
+        
+        app_iter = self.wsgi_app(environ, capture)
+        first = []
+        if not captured:
+            # start_response différé jusqu'au premier morceau du corps
+            for chunk in app_iter:
+                first.append(chunk)
+                break
+        
+        status, header_list, exc_info = captured
+        headers = Headers(header_list)
+        if not self.compressible(status, headers) or int(headers['Content-Length']) < self.min_size:
+            with self.lock:
+                self.stats['skipped'] += 1
+            write = start_response(status, header_list, exc_info)
+            for chunk in written:
+                write(chunk)
+            return ClosingIterator(chain(first, app_iter), getattr(app_iter, 'close', None))
+        
         try:
-            return mathia_app.view_functions['get_stats']()
-        except KeyError:
-            return jsonify({'error': 'Route stats non trouvée dans Mathia'}), 500
-    else:
-        return jsonify({'error': 'Mathia non disponible'}), 500
+            body = b''.join(written + first + list(app_iter))
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        
+        etag = headers.get('ETag')
+        cache_key = (environ.get('PATH_INFO', ''), etag, encoding) if etag else None
+        with self.lock:
+            compressed = self.cache.get(cache_key) if cache_key else None
+            if compressed is not None:
+                self.cache.move_to_end(cache_key)
+                self.stats['cache_hits'] += 1
+        
+        if compressed is None:
+            compressed = self.compress(body, encoding, cacheable=cache_key is not None)
+            if cache_key:
+                with self.lock:
+                    self.cache[cache_key] = compressed
+                    while len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+        
+        with self.lock:
+            self.stats['compressed'] += 1
+            self.stats['by_encoding'][encoding] += 1
+            self.stats['bytes_in'] += len(body)
+            self.stats['bytes_out'] += len(compressed)
+        
+        headers['Content-Encoding'] = encoding
+        headers['Content-Length'] = str(len(compressed))
+        vary = headers.get('Vary')
+        if not vary:
+            headers['Vary'] = 'Accept-Encoding'
+        elif 'accept-encoding' not in vary.lower():
+            headers['Vary'] = f'{vary}, Accept-Encoding'
+        if etag and not etag.startswith('W/'):
+            headers['ETag'] = f'W/{etag}'
+        
+        start_response(status, headers.to_wsgi_list(), exc_info)
+        return [compressed]
+    
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats, by_encoding=dict(self.stats['by_encoding']))
+            stats['cache_size'] = len(self.cache)
+        stats['bytes_saved'] = stats['bytes_in'] - stats['bytes_out']
+        stats['ratio'] = round(stats['bytes_out'] / stats['bytes_in'], 3) if stats['bytes_in'] else None
+        stats['brotli'] = self.brotli is not None
+        return stats
+
+# Pile WSGI: proxy Render → identifiant/durée → compression → anciennes URLs → montages
+compression = Compression(
+    LegacyRoutes(DispatcherMiddleware(app.wsgi_app, {
+        '/wikisummarizer': wiki,
+        '/mathia': mathia
+    }), LEGACY_ROUTES),
+    min_size=int(os.environ.get('HUB_COMPRESSION_MIN_SIZE', 1024)),
+    cache_size=int(os.environ.get('HUB_COMPRESSION_CACHE', 256))
+)
+app.wsgi_app = ProxyFix(RequestTiming(compression), x_for=1, x_proto=1, x_host=1, x_prefix=1)
+
+def warm_up():
+    """Charge les sous-applications en arrière-plan pendant que le hub répond déjà"""
+    for sub_app in (wiki, mathia):
+        sub_app.load()
 
-# Routes pour servir les fichiers statiques du wiki
-@app.route('/wiki/<path:filename>')
-def serve_wiki_static(filename):
-    """Servir les fichiers statiques du dossier wiki"""
-    return send_from_directory('wiki', filename)
+# Les sous-applications se chargent hors du thread principal, où signal.signal() est interdit:
+# le hub installe ici le SIGTERM qui sauvegarde leurs instantanés de cache
+CacheSnapshot.install_sigterm()
 
-# Routes pour servir les fichiers statiques de Mathia
-@app.route('/mathia/<path:filename>')
-def serve_mathia_static(filename):
-    """Servir les fichiers statiques du dossier mathia"""
-    return send_from_directory('mathia', filename)
+if os.environ.get('FUSIA_WARMUP', '1') == '1':
+    threading.Thread(target=warm_up, name='fusia-warmup', daemon=True).start()
+
+HUB_IMPORT_MS = round((time.perf_counter() - HUB_IMPORT_START) * 1000, 1)
+
+@app.route('/')
+def hub():
+    """Servir le hub (index.html)"""
+    return send_from_directory('.', 'index.html')
 
 # Routes pour servir les fichiers statiques généraux
 @app.route('/static/<path:filename>')
@@ -276,11 +551,52 @@ def health_check():
     status = {
         'status': 'OK',
         'service': 'Fusia Hub',
-        'wikisummarizer': 'available' if summarizer_app else 'unavailable',
-        'mathia': 'available' if mathia_app else 'unavailable'
+        'wikisummarizer': wiki.status,
+        'mathia': mathia.status
     }
     return jsonify(status), 200
 
+@app.route('/api/startup')
+def startup_report():
+    """Temps de démarrage: import du hub et chargement de chaque sous-application (ms)"""
+    return jsonify({
+        'hub_import_ms': HUB_IMPORT_MS,
+        'subapps': {'wikisummarizer': wiki.report(), 'mathia': mathia.report()}
+    }), 200
+
+@app.route('/api/compression')
+def compression_stats():
+    """Compression du hub: réponses compressées, ignorées et octets économisés"""
+    return jsonify(compression.get_stats()), 200
+
+@app.cli.command('bench-dispatch')
+@click.option('--requests', 'request_count', default=2000, show_default=True, help="Requêtes par variante")
+def bench_dispatch(request_count):
+    """Compare le montage WSGI à l'ancien proxy par view_functions"""
+    from flask import Flask as ProxyApp
+    
+    mathia_app, _ = mathia.load()
+    if not mathia_app:
+        click.echo("❌ Mathia non disponible")
+        return
+    
+    # Ancien hub: une route Flask qui appelle la vue de Mathia dans son propre contexte
+    legacy = ProxyApp('legacy_proxy')
+    legacy.add_url_rule('/api/mathia/suggest', 'suggest', lambda: mathia_app.view_functions['suggest']())
+    
+    variants = [
+        ('proxy view_functions', legacy.test_client(), '/api/mathia/suggest'),
+        ('montage WSGI', app.test_client(), '/mathia/api/suggest'),
+        ('ancienne URL réécrite', app.test_client(), '/api/mathia/suggest')
+    ]
+    for label, client, path in variants:
+        client.get(path, query_string={'q': 'deri'})
+        start = time.perf_counter()
+        for _ in range(request_count):
+            client.get(path, query_string={'q': 'deri'})
+        elapsed = (time.perf_counter() - start) / request_count * 1e6
+        click.echo(f"   {label:<24} {elapsed:8.1f} µs/requête")
+
 if __name__ == '__main__':
     print("🌐 FUSIA HUB - Démarrage")
     print("="*50)
@@ -291,8 +607,7 @@ if __name__ == '__main__':
     
     print(f"🌐 Port: {port}")
     print(f"🔧 Debug: {debug_mode}")
-    print(f"📊 Wikisummarizer: {'✅' if summarizer_app else '❌'}")
-    print(f"🔢 Mathia: {'✅' if mathia_app else '❌'}")
+    print(f"⏱️ Import du hub: {HUB_IMPORT_MS} ms (sous-applications chargées en arrière-plan)")
     
     print("🚀 DÉMARRAGE...")
     
@@ -0,0 +1,19 @@
+"""Briques communes au wiki et à Mathia: interface, caches, autocomplétion, tâches, calculs isolés, passerelle Mistral
+
+Les deux applications sont des fichiers Flask uniques; ce qu'elles partagent
+vit ici et est importé depuis la racine du dépôt.
+"""
+from .assets import StaticAssets
+from .caches import (CacheCodec, CompressedCache, LRUCache, PopularityTracker, ResponseCache, TinyLFUCache,
+                     make_cache)
+from .compute import IsolatedPool
+from .gateway import ConcurrencyLimiter, GatewayOverloaded, HedgePolicy, KeyPool, ModelRouter, UsageMeter
+from .jobs import JobQueue
+from .snapshot import CacheSnapshot
+from .suggest import PrefixTrie
+
+__all__ = [
+    'CacheCodec', 'CacheSnapshot', 'CompressedCache', 'ConcurrencyLimiter', 'GatewayOverloaded', 'HedgePolicy',
+    'IsolatedPool', 'JobQueue', 'KeyPool', 'LRUCache', 'ModelRouter', 'PopularityTracker', 'PrefixTrie',
+    'ResponseCache', 'StaticAssets', 'TinyLFUCache', 'UsageMeter', 'make_cache'
+]
@@ -0,0 +1,112 @@
+"""Interface statique (HTML, CSS, JS) hachée et précompressée au démarrage"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import time
+
+from flask import Response, request
+
+class StaticAssets:
+    """Interface (HTML, CSS, JS) servie depuis la mémoire avec des noms hachés
+    
+    Les fichiers de static/ sont lus une seule fois au démarrage: chaque
+    fichier reçoit un nom contenant l'empreinte de son contenu
+    (mathia.3f2a9c1b7d.js), référencé tel quel par la page, et ses variantes
+    gzip et brotli sont précalculées. Les fichiers hachés ne changent jamais
+    (Cache-Control immutable sur un an); la page, elle, est revalidée via
+    son ETag. Brotli est optionnel: sans le module, seul gzip est proposé.
+    """
+    
+    def __init__(self, directory, page='index.html', page_max_age=300, asset_max_age=31536000):
+        self.directory = directory
+        self.page = page
+        self.page_max_age = page_max_age
+        self.asset_max_age = asset_max_age
+        self.files = {}
+        self.hashed = {}
+        self.stats = {'served': 0, 'not_modified': 0, 'bytes': {'raw': 0, 'gzip': 0, 'br': 0}, 'build_ms': 0}
+        self.build()
+    
+    def encode(self, body, mimetype, immutable):
+        try:
+            import brotli
+            compressed_br = brotli.compress(body, quality=11)
+        except ImportError:
+            compressed_br = None
+        self.stats['brotli'] = compressed_br is not None
+        
+        compressed_gzip = gzip.compress(body, compresslevel=9, mtime=0)
+        entry = {
+            'body': body,
+            'gzip': compressed_gzip if len(compressed_gzip) < len(body) else None,
+            'br': compressed_br if compressed_br and len(compressed_br) < len(body) else None,
+            'mimetype': mimetype,
+            'immutable': immutable
+        }
+        # Un ETag fort par représentation: les octets diffèrent selon l'encodage
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        entry['etags'] = {None: etag, 'gzip': f'{etag}-gz', 'br': f'{etag}-br'}
+        for encoding in ('gzip', 'br'):
+            self.stats['bytes'][encoding] += len(entry[encoding] or body)
+        self.stats['bytes']['raw'] += len(body)
+        return entry
+    
+    def build(self):
+        """Hache, réécrit les références de la page et précompresse tous les fichiers"""
+        start = time.perf_counter()
+        names = sorted(name for name in os.listdir(self.directory)
+                       if os.path.isfile(os.path.join(self.directory, name)))
+        
+        for name in names:
+            if name == self.page:
+                continue
+            with open(os.path.join(self.directory, name), 'rb') as f:
+                body = f.read()
+            stem, extension = os.path.splitext(name)
+            hashed_name = f"{stem}.{hashlib.sha256(body).hexdigest()[:10]}{extension}"
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            self.hashed[name] = hashed_name
+            # Nom haché: immuable; nom d'origine: revalidé (anciens liens, débogage)
+            self.files[hashed_name] = self.encode(body, mimetype, immutable=True)
+            self.files[name] = dict(self.files[hashed_name], immutable=False)
+        
+        with open(os.path.join(self.directory, self.page), encoding='utf-8') as f:
+            html = f.read()
+        for name, hashed_name in self.hashed.items():
+            html = html.replace(f'"static/{name}"', f'"static/{hashed_name}"')
+        self.files[self.page] = self.encode(html.encode('utf-8'), 'text/html', immutable=False)
+        
+        self.stats['build_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    
+    def respond(self, name):
+        """Réponse précompressée (br, gzip ou brute) ou 304; None si le fichier est inconnu"""
+        entry = self.files.get(name)
+        if entry is None:
+            return None
+        
+        encoding = next((encoding for encoding in ('br', 'gzip')
+                         if entry[encoding] and request.accept_encodings[encoding]), None)
+        etag = entry['etags'][encoding]
+        
+        if request.if_none_match.contains_weak(etag):
+            self.stats['not_modified'] += 1
+            response = Response(status=304)
+        else:
+            self.stats['served'] += 1
+            response = Response(entry[encoding] if encoding else entry['body'], status=200, mimetype=entry['mimetype'])
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        if entry['immutable']:
+            response.cache_control.max_age = self.asset_max_age
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.max_age = self.page_max_age
+        return response
+    
+    def get_stats(self):
+        return dict(self.stats, files=len(self.hashed) + 1, hashed=dict(self.hashed))
@@ -0,0 +1,457 @@
+"""Caches en mémoire partagés par le wiki et Mathia
+
+LRU ou W-TinyLFU (make_cache), compression des valeurs (CacheCodec,
+CompressedCache), réponses JSON pré-sérialisées (ResponseCache) et
+popularité des requêtes (PopularityTracker).
+"""
+import gzip
+import hashlib
+import heapq
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+
+from flask import Response, request
+
+class PopularityTracker:
+    """Requêtes populaires en mémoire constante (count-min sketch + top-K)
+    
+    Le sketch (mise à jour conservatrice) estime la fréquence de n'importe
+    quelle clé; seules les top_k plus fréquentes sont gardées avec leur
+    libellé, dans un tas min. Tous les compteurs sont divisés par deux à
+    chaque fenêtre pour que la popularité suive la tendance récente.
+    """
+    
+    def __init__(self, width=2048, depth=4, top_k=100, window=3600):
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.window = window
+        self.rows = [[0] * width for _ in range(depth)]
+        self.top = {}
+        self.heap = []
+        self.total = 0
+        self.window_start = time.time()
+        self.lock = threading.Lock()
+    
+    def indexes(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[4 * i:4 * i + 4], 'little') % self.width for i in range(self.depth)]
+    
+    def decay(self):
+        periods = int((time.time() - self.window_start) // self.window)
+        if periods <= 0:
+            return
+        
+        shift = min(periods, 32)
+        for row in self.rows:
+            row[:] = [count >> shift for count in row]
+        self.total >>= shift
+        self.top = {key: [count >> shift, label] for key, (count, label) in self.top.items() if count >> shift}
+        self.heap = [(count, key) for key, (count, _) in self.top.items()]
+        heapq.heapify(self.heap)
+        self.window_start += periods * self.window
+    
+    def update_top(self, key, label, count):
+        if key in self.top:
+            # L'entrée du tas devient périmée; elle est corrigée quand elle remonte au sommet
+            self.top[key] = [count, label if label is not None else self.top[key][1]]
+            return
+        
+        if len(self.top) < self.top_k:
+            self.top[key] = [count, label]
+            heapq.heappush(self.heap, (count, key))
+            return
+        
+        while self.heap[0][0] != self.top[self.heap[0][1]][0]:
+            stale_key = self.heap[0][1]
+            heapq.heapreplace(self.heap, (self.top[stale_key][0], stale_key))
+        
+        smallest, smallest_key = self.heap[0]
+        if count > smallest:
+            heapq.heapreplace(self.heap, (count, key))
+            del self.top[smallest_key]
+            self.top[key] = [count, label]
+    
+    def record(self, key, label=None, weight=1):
+        """Compte une occurrence et retourne la fréquence estimée"""
+        with self.lock:
+            self.decay()
+            positions = self.indexes(key)
+            count = min(row[i] for row, i in zip(self.rows, positions)) + weight
+            for row, i in zip(self.rows, positions):
+                if row[i] < count:
+                    row[i] = count
+            self.total += weight
+            self.update_top(key, label, count)
+            return count
+    
+    def estimate(self, key):
+        """Fréquence estimée (jamais sous-estimée)"""
+        with self.lock:
+            self.decay()
+            return min(row[i] for row, i in zip(self.rows, self.indexes(key)))
+    
+    def most_common(self, n=20):
+        """[(clé, libellé, fréquence)] par fréquence décroissante"""
+        with self.lock:
+            self.decay()
+            items = sorted(self.top.items(), key=lambda item: -item[1][0])[:n]
+            return [(key, label, count) for key, (count, label) in items]
+    
+    def get_stats(self):
+        return {
+            'tracked': len(self.top),
+            'total': self.total,
+            'sketch': f"{self.depth}x{self.width}",
+            'window_seconds': self.window
+        }
+
+class LRUCache:
+    def __init__(self, max_size=100):
+        self.cache = {}
+        self.access_order = []
+        self.max_size = max_size
+        self.lock = threading.RLock()
+    
+    def get(self, key):
+        with self.lock:
+            if key in self.cache:
+                self.access_order.remove(key)
+                self.access_order.append(key)
+                return self.cache[key]
+            return None
+    
+    def peek(self, key):
+        """Présence d'une clé sans modifier l'ordre d'accès"""
+        with self.lock:
+            return key in self.cache
+    
+    def set(self, key, value):
+        with self.lock:
+            if key in self.cache:
+                self.access_order.remove(key)
+            elif len(self.cache) >= self.max_size:
+                oldest = self.access_order.pop(0)
+                del self.cache[oldest]
+            
+            self.cache[key] = value
+            self.access_order.append(key)
+    
+    def items(self):
+        """Copie des (clé, valeur), de la plus récemment utilisée à la plus ancienne"""
+        with self.lock:
+            return [(key, self.cache[key]) for key in reversed(self.access_order)]
+    
+    def victim(self):
+        """Clé évincée par la prochaine insertion d'une nouvelle clé (None si place libre)"""
+        with self.lock:
+            if len(self.cache) < self.max_size or not self.access_order:
+                return None
+            return self.access_order[0]
+    
+    def size(self):
+        return len(self.cache)
+
+class TinyLFUCache:
+    """Cache W-TinyLFU, même interface que LRUCache
+    
+    Les nouvelles entrées passent par une petite fenêtre LRU (1%, au moins 4
+    entrées). En sortant de la fenêtre, une entrée n'entre dans la zone
+    principale (SLRU: probation 20% / protégée 80%) que si le sketch de
+    fréquence ne l'estime pas moins demandée que la victime qu'elle évincerait
+    (à égalité, tirage à pile ou face). Un balayage d'entrées vues une seule
+    fois ne chasse donc plus les entrées populaires.
+    Le sketch compte tous les accès (hits et misses), plafonnés à 15 et
+    divisés par deux tous les 10 × max_size accès.
+    """
+    
+    def __init__(self, max_size=100):
+        self.max_size = max_size
+        self.window_size = max(min(4, max_size // 2), max_size // 100, 1)
+        self.protected_size = int((max_size - self.window_size) * 0.8)
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        
+        self.depth = 4
+        self.width = 1 << max(6, (4 * max_size - 1).bit_length())
+        self.rows = [bytearray(self.width) for _ in range(self.depth)]
+        self.sample_size = 10 * max_size
+        self.additions = 0
+        
+        self.lock = threading.RLock()
+        self.stats = {'admitted': 0, 'rejected': 0, 'evicted': 0}
+    
+    def indexes(self, key):
+        digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[4 * i:4 * i + 4], 'little') & (self.width - 1) for i in range(self.depth)]
+    
+    def increment(self, key):
+        for row, i in zip(self.rows, self.indexes(key)):
+            if row[i] < 15:
+                row[i] += 1
+        
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            # Vieillissement: les anciennes popularités s'estompent
+            for row in self.rows:
+                row[:] = bytes(count >> 1 for count in row)
+            self.additions //= 2
+    
+    def frequency(self, key):
+        return min(row[i] for row, i in zip(self.rows, self.indexes(key)))
+    
+    def get(self, key):
+        with self.lock:
+            self.increment(key)
+            
+            if key in self.window:
+                self.window.move_to_end(key)
+                return self.window[key]
+            if key in self.protected:
+                self.protected.move_to_end(key)
+                return self.protected[key]
+            if key in self.probation:
+                # Deuxième accès: promotion vers la zone protégée
+                value = self.probation.pop(key)
+                self.protected[key] = value
+                if len(self.protected) > self.protected_size:
+                    demoted, demoted_value = self.protected.popitem(last=False)
+                    self.probation[demoted] = demoted_value
+                return value
+            return None
+    
+    def peek(self, key):
+        """Présence d'une clé sans modifier l'ordre d'accès ni les fréquences"""
+        with self.lock:
+            return key in self.window or key in self.probation or key in self.protected
+    
+    def set(self, key, value):
+        with self.lock:
+            for segment in (self.window, self.probation, self.protected):
+                if key in segment:
+                    segment[key] = value
+                    segment.move_to_end(key)
+                    return True
+            
+            self.window[key] = value
+            if len(self.window) <= self.window_size:
+                return True
+            
+            candidate, candidate_value = self.window.popitem(last=False)
+            if len(self.probation) + len(self.protected) < self.max_size - self.window_size:
+                self.probation[candidate] = candidate_value
+                return True
+            
+            victim_segment = self.probation if self.probation else self.protected
+            victim = next(iter(victim_segment))
+            candidate_frequency, victim_frequency = self.frequency(candidate), self.frequency(victim)
+            if candidate_frequency > victim_frequency or (candidate_frequency == victim_frequency
+                                                          and random.random() < 0.5):
+                del victim_segment[victim]
+                self.probation[candidate] = candidate_value
+                self.stats['admitted'] += 1
+                self.stats['evicted'] += 1
+            else:
+                self.stats['rejected'] += 1
+            return True
+    
+    def items(self):
+        """Copie des (clé, valeur), fenêtre puis zone protégée puis probation (récentes d'abord)"""
+        with self.lock:
+            return [(key, segment[key]) for segment in (self.window, self.protected, self.probation)
+                    for key in reversed(segment)]
+    
+    def victim(self):
+        """L'admission est décidée par le sketch interne"""
+        return None
+    
+    def size(self):
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+def make_cache(policy, max_size):
+    """Cache selon la politique configurée ('lru' ou 'tinylfu')"""
+    if policy == 'tinylfu':
+        return TinyLFUCache(max_size=max_size)
+    return LRUCache(max_size=max_size)
+
+class CacheCodec:
+    """Sérialise les entrées en JSON compressé par zlib avec un dictionnaire partagé
+    
+    Le dictionnaire initial reprend le squelette des entrées; il est ensuite
+    ré-entraîné une fois sur les premières entrées réelles (phrases présentes
+    dans plusieurs entrées, les plus rentables en fin de dictionnaire). Chaque
+    blob garde la version du dictionnaire utilisée pour le décompresser.
+    """
+    
+    MAX_DICT_SIZE = 32768
+    
+    def __init__(self, seed, level=6, training_samples=64):
+        self.level = level
+        self.training_samples = training_samples
+        self.dictionaries = [seed.encode('utf-8')]
+        self.samples = []
+        self.lock = threading.Lock()
+        self.stats = {'encoded': 0, 'decoded': 0, 'trainings': 0}
+    
+    def train(self, samples):
+        """Dictionnaire des phrases (trigrammes de mots) communes à plusieurs entrées"""
+        frequency = Counter()
+        for sample in samples:
+            words = re.findall(rb'\S+\s*', sample)
+            frequency.update({b''.join(words[i:i + 3]) for i in range(len(words) - 2)})
+        
+        phrases = [(count * len(phrase), phrase) for phrase, count in frequency.items() if count >= 3]
+        phrases.sort(reverse=True)
+        
+        selected = []
+        size = 0
+        for _, phrase in phrases:
+            if size + len(phrase) > self.MAX_DICT_SIZE:
+                break
+            selected.append(phrase)
+            size += len(phrase)
+        # zlib atteint mieux la fin du dictionnaire: les plus rentables en dernier
+        return self.dictionaries[0][-2048:] + b''.join(reversed(selected))
+    
+    def encode(self, value):
+        raw = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        
+        with self.lock:
+            if len(self.dictionaries) == 1 and len(self.samples) < self.training_samples:
+                self.samples.append(raw)
+                if len(self.samples) == self.training_samples:
+                    self.dictionaries.append(self.train(self.samples))
+                    self.samples = []
+                    self.stats['trainings'] += 1
+            version = len(self.dictionaries) - 1
+            self.stats['encoded'] += 1
+        
+        compressor = zlib.compressobj(self.level, zdict=self.dictionaries[version])
+        return (version, len(raw), compressor.compress(raw) + compressor.flush())
+    
+    def decode(self, blob):
+        version, _, data = blob
+        decompressor = zlib.decompressobj(zdict=self.dictionaries[version])
+        self.stats['decoded'] += 1
+        return json.loads(decompressor.decompress(data) + decompressor.flush())
+
+class CompressedCache:
+    """Enveloppe un cache (LRU ou TinyLFU): valeurs compressées, décompressées à la lecture"""
+    
+    def __init__(self, backend, codec):
+        self.backend = backend
+        self.codec = codec
+        self.max_size = backend.max_size
+    
+    def get(self, key):
+        blob = self.backend.get(key)
+        return self.codec.decode(blob) if blob is not None else None
+    
+    def peek(self, key):
+        return self.backend.peek(key)
+    
+    def set(self, key, value):
+        return self.backend.set(key, self.codec.encode(value))
+    
+    def items(self):
+        return [(key, self.codec.decode(blob)) for key, blob in self.backend.items()]
+    
+    def victim(self):
+        return self.backend.victim()
+    
+    def size(self):
+        return self.backend.size()
+    
+    def get_stats(self):
+        """Taux de compression des entrées présentes"""
+        blobs = [blob for _, blob in self.backend.items()]
+        raw_bytes = sum(blob[1] for blob in blobs)
+        stored_bytes = sum(len(blob[2]) for blob in blobs)
+        stats = self.codec.stats.copy()
+        stats.update({
+            'raw_bytes': raw_bytes,
+            'stored_bytes': stored_bytes,
+            'bytes_saved': raw_bytes - stored_bytes,
+            'compression_ratio': round(raw_bytes / stored_bytes, 2) if stored_bytes else None,
+            'dictionary_version': len(self.codec.dictionaries) - 1,
+            'dictionary_size': len(self.codec.dictionaries[-1])
+        })
+        return stats
+
+class ResponseCache:
+    """Corps JSON déjà encodés (et gzippés) des réponses servies depuis le cache
+    
+    Un hit répété ne repasse plus par jsonify: les octets sont servis tels
+    quels avec un ETag fort; en GET, If-None-Match donne un 304 et
+    Cache-Control permet aux navigateurs et proxies de réutiliser la réponse.
+    """
+    
+    def __init__(self, max_size=128, max_age=3600):
+        self.entries = OrderedDict()
+        self.max_size = max_size
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'stored': 0, 'not_modified': 0}
+    
+    def encode(self, payload, meta=None):
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return {
+            'body': body,
+            'gzip': gzip.compress(body, compresslevel=6, mtime=0),
+            'etag': hashlib.sha256(body).hexdigest()[:32],
+            'meta': meta or {}
+        }
+    
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+            return entry
+    
+    def store(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            self.stats['stored'] += 1
+    
+    def discard(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+    
+    def respond(self, entry):
+        """200 (gzip si accepté) ou 304 quand l'ETag du client correspond (GET)
+        
+        Les corps gzip et identité sont des représentations distinctes: chacune a son
+        propre ETag fort (suffixe -gz pour gzip), comparé à celui de l'encodage servi.
+        """
+        compressed = request.accept_encodings['gzip'] > 0
+        etag = entry['etag'] + '-gz' if compressed else entry['etag']
+        
+        if request.method == 'GET' and request.if_none_match.contains_weak(etag):
+            self.stats['not_modified'] += 1
+            response = Response(status=304)
+        elif compressed:
+            response = Response(entry['gzip'], status=200, mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(entry['body'], status=200, mimetype='application/json')
+        
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        if request.method == 'GET':
+            response.cache_control.public = True
+            response.cache_control.max_age = self.max_age
+        return response
+    
+    def size(self):
+        return len(self.entries)
@@ -0,0 +1,157 @@
+"""Calculs isolés dans des processus que l'on peut tuer (sympy, numpy)
+
+Un thread Python bloqué dans une boucle C (grand entier, factorielle) ne
+rend jamais la main: au-delà du délai on ne peut que l'abandonner, et il
+garde son créneau. Ici chaque calcul part dans un processus ouvrier
+(`python -m fusia_common.compute`) relié par un tube; au-delà du délai
+l'ouvrier est tué, le créneau libéré et un nouvel ouvrier démarre à la
+demande suivante.
+"""
+import atexit
+import os
+import subprocess
+import sys
+import threading
+from multiprocessing import Pipe
+from multiprocessing.connection import Connection
+
+# Exceptions de l'ouvrier relancées telles quelles, les autres deviennent des ValueError
+ERRORS = {error.__name__: error for error in (ValueError, TypeError, NotImplementedError, AttributeError,
+                                               ZeroDivisionError)}
+
+class IsolatedPool:
+    """Pool borné de processus ouvriers, un calcul à la fois par ouvrier
+
+    run(func, *args) envoie la fonction (par référence, elle doit être
+    importable) et ses arguments picklés à un ouvrier libre. Sans ouvrier
+    libre parmi `workers`, le calcul est refusé plutôt que mis en file. Les
+    ouvriers importent `preload` au démarrage et sont limités à memory_mb
+    Mo d'espace d'adressage (0 = sans limite, Linux uniquement).
+    """
+
+    def __init__(self, workers=2, timeout=5.0, preload=(), memory_mb=0, startup_timeout=30.0):
+        self.timeout = timeout
+        self.preload = ','.join(preload)
+        self.memory_mb = memory_mb
+        self.startup_timeout = startup_timeout
+        self.slots = threading.BoundedSemaphore(workers)
+        self.lock = threading.Lock()
+        self.idle = []
+        self.stats = {'calls': 0, 'timeouts': 0, 'busy': 0, 'started': 0, 'killed': 0}
+        atexit.register(self.close)
+
+    def start(self):
+        """Démarre un ouvrier et attend qu'il ait chargé ses modules"""
+        parent, child = Pipe()
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'fusia_common.compute', str(child.fileno()), self.preload, str(self.memory_mb)],
+            pass_fds=[child.fileno()], stdin=subprocess.DEVNULL, env=env
+        )
+        child.close()
+        worker = {'process': process, 'conn': parent}
+
+        try:
+            ready = parent.poll(self.startup_timeout) and parent.recv() == 'ready'
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            self.kill(worker)
+            raise ValueError("Moteur de calcul indisponible")
+
+        with self.lock:
+            self.stats['started'] += 1
+        return worker
+
+    def kill(self, worker):
+        worker['process'].kill()
+        worker['process'].wait()
+        worker['conn'].close()
+        with self.lock:
+            self.stats['killed'] += 1
+
+    def run(self, func, *args):
+        """Exécute func(*args) dans un ouvrier; ValueError si occupé, trop long ou ouvrier perdu"""
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.stats['busy'] += 1
+            raise ValueError("Moteur de calcul occupé, réessayez dans un instant")
+
+        try:
+            with self.lock:
+                self.stats['calls'] += 1
+                worker = self.idle.pop() if self.idle else None
+            worker = worker or self.start()
+
+            try:
+                worker['conn'].send((func, args))
+                if not worker['conn'].poll(self.timeout):
+                    self.kill(worker)
+                    with self.lock:
+                        self.stats['timeouts'] += 1
+                    raise ValueError(f"Calcul trop long (plus de {self.timeout:g} s)")
+                ok, value = worker['conn'].recv()
+            except (EOFError, OSError):
+                # Ouvrier mort en route (mémoire épuisée, tué de l'extérieur)
+                self.kill(worker)
+                raise ValueError("Calcul interrompu (ressources épuisées)")
+
+            with self.lock:
+                self.idle.append(worker)
+        finally:
+            self.slots.release()
+
+        if not ok:
+            name, message = value
+            raise ERRORS.get(name, ValueError)(message)
+        return value
+
+    def close(self):
+        """Arrête les ouvriers inactifs (fin du tube: ils sortent d'eux-mêmes)"""
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for worker in idle:
+            worker['conn'].close()
+            try:
+                worker['process'].wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                worker['process'].kill()
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, idle=len(self.idle))
+
+def serve(fd, preload, memory_mb):
+    """Boucle d'un ouvrier: reçoit (func, args), renvoie (True, valeur) ou (False, (type, message))"""
+    import importlib
+    import signal
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C vise le serveur, qui tue ses ouvriers
+    if memory_mb > 0:
+        try:
+            import resource
+            limit = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError):
+            pass
+
+    conn = Connection(fd)
+    for module in filter(None, preload.split(',')):
+        importlib.import_module(module)
+    conn.send('ready')
+
+    while True:
+        try:
+            func, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, func(*args)))
+        except MemoryError:
+            conn.send((False, ('MemoryError', "Calcul trop gourmand en mémoire")))
+        except Exception as e:
+            conn.send((False, (type(e).__name__, str(e))))
+
+if __name__ == '__main__':
+    serve(int(sys.argv[1]), sys.argv[2], int(sys.argv[3]))
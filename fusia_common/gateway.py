@@ -0,0 +1,497 @@
+"""Passerelle vers Mistral: admission, concurrence par clé, hedging, routage et usage
+
+Utilisée par les deux applications; seuls les appels au SDK restent dans
+chacune d'elles.
+"""
+import math
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FuturesTimeout, wait
+
+class GatewayOverloaded(Exception):
+    """Appel LLM refusé par le limiteur (file pleine, délai intenable ou attente expirée)"""
+    
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Service surchargé ({reason}), réessayez dans {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+class ConcurrencyLimiter:
+    """Limiteur de concurrence avec courte file d'attente devant les appels LLM
+    
+    Au plus max_concurrent appels en vol; au-delà, max_queue requêtes
+    attendent une place. Une requête est refusée immédiatement si la file
+    est pleine ou si l'attente estimée (moyenne mobile de la durée d'un
+    appel, rapportée au nombre de places) dépasse le temps qui lui reste
+    avant son échéance: mieux vaut un 503 rapide avec Retry-After qu'un
+    timeout gunicorn après 30 s. Avec queue=False (préchargement), seule une
+    place libre est acceptée: jamais d'attente derrière les utilisateurs.
+    """
+    
+    def __init__(self, max_concurrent=4, max_queue=8, initial_service_time=5.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.service_time = initial_service_time
+        self.in_flight = 0
+        self.waiting = 0
+        self.condition = threading.Condition()
+        self.stats = {
+            'admitted': 0,
+            'queued': 0,
+            'rejected_queue_full': 0,
+            'rejected_deadline': 0,
+            'rejected_busy': 0,
+            'timed_out': 0,
+            'max_queue_depth': 0,
+            'total_wait': 0.0
+        }
+    
+    def estimated_wait(self):
+        """Attente estimée d'une nouvelle requête (appelé sous verrou)"""
+        if self.in_flight < self.max_concurrent:
+            return 0.0
+        return (self.waiting + 1) / self.max_concurrent * self.service_time
+    
+    def retry_after(self):
+        return max(1, min(30, math.ceil(self.estimated_wait())))
+    
+    def acquire(self, deadline, queue=True):
+        """Réserve une place avant deadline (timestamp) ou lève GatewayOverloaded"""
+        with self.condition:
+            if self.in_flight < self.max_concurrent and not self.waiting:
+                self.in_flight += 1
+                self.stats['admitted'] += 1
+                return
+            
+            if not queue:
+                self.stats['rejected_busy'] += 1
+                raise GatewayOverloaded('aucune place libre', self.retry_after())
+            if self.waiting >= self.max_queue:
+                self.stats['rejected_queue_full'] += 1
+                raise GatewayOverloaded('file pleine', self.retry_after())
+            if time.time() + self.estimated_wait() > deadline:
+                self.stats['rejected_deadline'] += 1
+                raise GatewayOverloaded('attente trop longue', self.retry_after())
+            
+            self.waiting += 1
+            self.stats['queued'] += 1
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.waiting)
+            start = time.time()
+            try:
+                admitted = self.condition.wait_for(lambda: self.in_flight < self.max_concurrent,
+                                                   timeout=max(0.0, deadline - start))
+            finally:
+                self.waiting -= 1
+                self.stats['total_wait'] += time.time() - start
+            
+            if not admitted:
+                self.stats['timed_out'] += 1
+                raise GatewayOverloaded('délai dépassé', self.retry_after())
+            self.in_flight += 1
+            self.stats['admitted'] += 1
+    
+    def release(self, duration=None):
+        with self.condition:
+            self.in_flight -= 1
+            if duration is not None:
+                self.service_time = 0.8 * self.service_time + 0.2 * duration
+            self.condition.notify()
+    
+    def get_stats(self):
+        with self.condition:
+            stats = dict(self.stats, in_flight=self.in_flight, queue_depth=self.waiting,
+                         max_concurrent=self.max_concurrent, max_queue=self.max_queue,
+                         service_time=round(self.service_time, 2),
+                         estimated_wait=round(self.estimated_wait(), 2))
+        stats['total_wait'] = round(stats['total_wait'], 2)
+        return stats
+
+class KeyPool:
+    """Concurrence soutenable de chaque clé API apprise par AIMD
+    
+    Chaque clé a une limite de concurrence (flottante): +1/limite par succès
+    obtenu alors que la clé était proche de sa limite (environ +1 par fenêtre
+    complète d'appels réussis; une clé peu sollicitée ne gonfle pas sa limite),
+    ×decrease sur 429 ou dépassement de capacité, au plus une fois par fenêtre
+    (les appels déjà en vol au moment de la réduction ne la répètent pas). Le
+    trafic est réparti au hasard en proportion de la capacité libre de chaque
+    clé; l'historique des limites est conservé pour key_stats.
+    """
+    
+    def __init__(self, size, initial=2.0, minimum=1.0, maximum=8.0, decrease=0.5, history=60):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.lock = threading.Lock()
+        self.keys = [{
+            'limit': initial,
+            'in_flight': 0,
+            'used': 0,
+            'successes': 0,
+            'errors': 0,
+            'rate_limits': 0,
+            'recovering': 0,
+            'history': deque([(round(time.time()), initial)], maxlen=history)
+        } for _ in range(size)]
+    
+    def acquire(self, avoid=None):
+        """Choisit une clé (pondérée par sa capacité libre, en évitant avoid si possible)"""
+        with self.lock:
+            candidates = [i for i in range(len(self.keys)) if i != avoid] or list(range(len(self.keys)))
+            spare = [self.keys[i]['limit'] - self.keys[i]['in_flight'] for i in candidates]
+            if max(spare) > 0:
+                index = random.choices(candidates, weights=[max(0.0, s) for s in spare])[0]
+            else:
+                # Toutes les clés saturées: celle qui dépasse le moins sa limite
+                index = candidates[spare.index(max(spare))]
+            key = self.keys[index]
+            key['in_flight'] += 1
+            key['used'] += 1
+            return index
+    
+    def release(self, index, outcome):
+        """outcome: 'success', 'rate_limited' (429/capacité) ou 'error'"""
+        with self.lock:
+            key = self.keys[index]
+            in_flight = key['in_flight']  # y compris cet appel
+            key['in_flight'] -= 1
+            # Appels partis avant la dernière réduction: leur 429 ne la répète pas
+            sent_before_decrease = key['recovering'] > 0
+            if sent_before_decrease:
+                key['recovering'] -= 1
+            
+            if outcome == 'success':
+                key['successes'] += 1
+                previous = key['limit']
+                if in_flight >= previous - 1:
+                    key['limit'] = min(self.maximum, previous + 1 / previous)
+                    if int(key['limit']) != int(previous):
+                        key['history'].append((round(time.time()), round(key['limit'], 2)))
+            elif outcome == 'rate_limited':
+                key['rate_limits'] += 1
+                if not sent_before_decrease:
+                    key['limit'] = max(self.minimum, key['limit'] * self.decrease)
+                    key['recovering'] = key['in_flight']
+                    key['history'].append((round(time.time()), round(key['limit'], 2)))
+            else:
+                key['errors'] += 1
+    
+    def capacity(self):
+        """Somme des limites apprises (appels simultanés soutenables)"""
+        with self.lock:
+            return sum(key['limit'] for key in self.keys)
+    
+    def headroom(self):
+        """Part de la capacité apprise encore libre (0 à 1)"""
+        with self.lock:
+            limit = sum(key['limit'] for key in self.keys)
+            in_flight = sum(key['in_flight'] for key in self.keys)
+        return max(0.0, 1 - in_flight / limit) if limit else 0.0
+    
+    def get_stats(self):
+        with self.lock:
+            return {
+                index: {
+                    'used': key['used'],
+                    'successes': key['successes'],
+                    'errors': key['errors'],
+                    'rate_limits': key['rate_limits'],
+                    'in_flight': key['in_flight'],
+                    'limit': round(key['limit'], 2),
+                    'limit_history': list(key['history'])
+                }
+                for index, key in enumerate(self.keys)
+            }
+
+class HedgePolicy:
+    """Requêtes couvertes (hedging) contre la longue traîne de latence de Mistral
+    
+    L'appel principal tourne sur un pool de threads; s'il n'a pas répondu
+    au bout du p90 des latences observées, un doublon part sur une autre
+    clé (éventuellement sur un modèle plus petit) et la première réponse
+    valide l'emporte. Les appels synchrones du SDK ne pouvant être
+    interrompus, le perdant est abandonné: son résultat est ignoré et sa
+    clé libérée à son retour. Un seau de jetons (budget par appel, 12% par
+    défaut, au-dessus des ~10% d'appels qui dépassent le p90) borne le
+    surcoût: sans jeton disponible, on attend l'appel principal. Avec un
+    limiter, le doublon prend une place libre (jamais de file d'attente),
+    gardée jusqu'à la fin des deux appels: un perdant abandonné reste compté.
+    """
+    
+    def __init__(self, enabled=False, percentile=0.9, budget=0.12, burst=3.0, min_samples=20, max_workers=8, window=500,
+                 limiter=None):
+        self.enabled = enabled
+        self.limiter = limiter
+        self.percentile = percentile
+        self.budget = budget
+        self.burst = burst
+        self.min_samples = min_samples
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge') if enabled else None
+        self.latencies = deque(maxlen=window)
+        self.tokens = 0.0
+        self.lock = threading.Lock()
+        self.stats = {'calls': 0, 'hedged': 0, 'hedge_wins': 0, 'budget_denied': 0, 'slot_denied': 0, 'abandoned': 0}
+    
+    def observe(self, duration):
+        """Latence d'un appel réussi (principal ou doublon)"""
+        with self.lock:
+            self.latencies.append(duration)
+    
+    def quantile(self, q):
+        with self.lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+    
+    def delay(self):
+        """Délai avant doublon (p90 observé), None tant que l'échantillon est trop petit"""
+        if len(self.latencies) < self.min_samples:
+            return None
+        return self.quantile(self.percentile)
+    
+    def spend(self):
+        with self.lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self.stats['budget_denied'] += 1
+            return False
+    
+    def call(self, primary, hedge):
+        """Exécute primary(); après le délai, lance hedge() si le budget le permet"""
+        with self.lock:
+            self.stats['calls'] += 1
+            self.tokens = min(self.burst, self.tokens + self.budget)
+        
+        delay = self.delay() if self.enabled else None
+        if delay is None:
+            return primary()
+        
+        first = self.executor.submit(primary)
+        try:
+            return first.result(timeout=delay)
+        except FuturesTimeout:
+            pass
+        
+        if not self.spend():
+            return first.result()
+        
+        if self.limiter:
+            try:
+                self.limiter.acquire(time.time(), queue=False)
+            except GatewayOverloaded:
+                with self.lock:
+                    self.stats['slot_denied'] += 1
+                return first.result()
+        
+        with self.lock:
+            self.stats['hedged'] += 1
+        second = self.executor.submit(hedge)
+        pending = {first, second}
+        if self.limiter:
+            # L'appelant rend sa place à son retour: la place du doublon couvre l'appel encore en vol
+            running = [len(pending)]
+            
+            def finished(_):
+                with self.lock:
+                    running[0] -= 1
+                    last = running[0] == 0
+                if last:
+                    self.limiter.release()
+            
+            for future in pending:
+                future.add_done_callback(finished)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    with self.lock:
+                        if future is second:
+                            self.stats['hedge_wins'] += 1
+                        for loser in pending:
+                            if not loser.cancel():
+                                self.stats['abandoned'] += 1
+                    return future.result()
+                if future is first or error is None:
+                    error = future.exception()
+        raise error
+    
+    def get_stats(self):
+        stats = dict(self.stats, enabled=self.enabled, budget=self.budget, samples=len(self.latencies))
+        stats['extra_call_ratio'] = round(stats['hedged'] / stats['calls'], 3) if stats['calls'] else 0
+        for name, q in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+            value = self.quantile(q)
+            stats[f'latency_{name}'] = round(value, 3) if value is not None else None
+        return stats
+
+class ModelRouter:
+    """Choix du modèle (large ou small) avant l'appel, par route et niveau de détail
+    
+    Chaque route associe à un niveau ('court', 'moyen', 'long') une règle:
+    'large', 'small' ou 'auto' (small si l'entrée fait au plus
+    small_input_chars caractères). Un choix large passe sur le small si le
+    temps restant avant l'échéance est inférieur à la latence observée du
+    large (moyenne mobile), ou si la capacité libre des clés tombe sous
+    min_headroom. Les décisions sont comptées par route, modèle et raison.
+    """
+    
+    RULES = ('large', 'small', 'auto')
+    
+    def __init__(self, rules, large, small, small_input_chars=2500, min_headroom=0.2,
+                 large_latency=8.0, small_latency=3.0):
+        self.rules = {}
+        self.models = {'large': large, 'small': small}
+        self.small_input_chars = small_input_chars
+        self.min_headroom = min_headroom
+        self.latency = {'large': large_latency, 'small': small_latency}  # secondes, moyenne mobile
+        self.lock = threading.Lock()
+        self.decisions = defaultdict(lambda: {'large': 0, 'small': 0})
+        self.reasons = defaultdict(int)
+        self.update_rules(rules)
+    
+    def update_rules(self, rules):
+        """Fusionne des règles {route: {niveau: 'large'|'small'|'auto'}} (ValueError si invalide)"""
+        for route, levels in rules.items():
+            for level, rule in levels.items():
+                if rule not in self.RULES:
+                    raise ValueError(f"Règle de routage inconnue pour {route}/{level}: {rule}")
+            self.rules.setdefault(route, {}).update(levels)
+    
+    def observe(self, model, duration):
+        """Latence d'un appel réussi, pour le critère d'échéance"""
+        for tier, name in self.models.items():
+            if name == model:
+                with self.lock:
+                    self.latency[tier] = 0.8 * self.latency[tier] + 0.2 * duration
+    
+    def choose(self, route, level, input_chars, deadline=None, headroom=1.0):
+        """Décision {'route', 'model', 'tier', 'reason'}; deadline=None: pas de contrainte de délai"""
+        rule = self.rules.get(route, {}).get(level, 'large')
+        if rule == 'auto':
+            tier, reason = ('small', 'short_input') if input_chars <= self.small_input_chars else ('large', 'long_input')
+        else:
+            tier, reason = rule, 'rule'
+        
+        if tier == 'large':
+            if deadline is not None and deadline - time.time() < self.latency['large']:
+                tier, reason = 'small', 'deadline'
+            elif headroom < self.min_headroom:
+                tier, reason = 'small', 'capacity'
+        
+        with self.lock:
+            self.decisions[route][tier] += 1
+            self.reasons[reason] += 1
+        return {'route': route, 'model': self.models[tier], 'tier': tier, 'reason': reason}
+    
+    def get_stats(self):
+        with self.lock:
+            return {
+                'rules': {route: dict(levels) for route, levels in self.rules.items()},
+                'decisions': {route: dict(counts) for route, counts in self.decisions.items()},
+                'reasons': dict(self.reasons),
+                'latency': {tier: round(value, 2) for tier, value in self.latency.items()},
+                'small_input_chars': self.small_input_chars,
+                'min_headroom': self.min_headroom
+            }
+
+class UsageMeter:
+    """Tokens consommés (usage des réponses Mistral) par clé, modèle et étiquettes de requête
+    
+    Chaque appel réussi ajoute ses prompt/completion tokens à un seau par
+    minute (24 h conservées) et au cumul depuis le démarrage, sous une clé
+    (clé API, modèle, étiquettes: endpoint, langue, mode...). Les fenêtres
+    sont agrégées à la lecture, par dimension, avec un coût estimé
+    d'après prices ({modèle: (entrée, sortie)} en $ par million de
+    tokens). Le compteur de la requête (start) cumule aussi ses appels, y
+    compris un doublon de hedging.
+    """
+    
+    WINDOWS = (('5m', 300), ('1h', 3600), ('24h', 86400))
+    
+    def __init__(self, prices=None, retention=86400):
+        self.prices = prices or {}
+        self.buckets = deque(maxlen=retention // 60)  # (minute, {dimensions: [appels, prompt, completion]})
+        self.totals = defaultdict(lambda: [0, 0, 0])
+        self.missing = 0
+        self.lock = threading.Lock()
+    
+    def start(self, **labels):
+        """Compteur d'une requête, à passer jusqu'aux appels Mistral"""
+        return {'labels': labels, 'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cost_usd': 0.0}
+    
+    def record(self, usage, key_index, model, response):
+        """Ajoute l'usage d'une réponse (ignoré, mais compté, s'il est absent)"""
+        info = getattr(response, 'usage', None)
+        if info is None:
+            with self.lock:
+                self.missing += 1
+            return
+        prompt_tokens = getattr(info, 'prompt_tokens', 0) or 0
+        completion_tokens = getattr(info, 'completion_tokens', 0) or 0
+        labels = usage['labels'] if usage else {}
+        dimensions = (('key', key_index + 1), ('model', model)) + tuple(sorted(labels.items()))
+        minute = int(time.time() // 60)
+        
+        with self.lock:
+            if usage:
+                usage['calls'] += 1
+                usage['prompt_tokens'] += prompt_tokens
+                usage['completion_tokens'] += completion_tokens
+                usage['cost_usd'] += self.cost(model, prompt_tokens, completion_tokens)
+            if not self.buckets or self.buckets[-1][0] != minute:
+                self.buckets.append((minute, defaultdict(lambda: [0, 0, 0])))
+            for counts in (self.buckets[-1][1][dimensions], self.totals[dimensions]):
+                counts[0] += 1
+                counts[1] += prompt_tokens
+                counts[2] += completion_tokens
+    
+    def cost(self, model, prompt_tokens, completion_tokens):
+        input_price, output_price = self.prices.get(model, (0, 0))
+        return (prompt_tokens * input_price + completion_tokens * output_price) / 1e6
+    
+    def summary(self, usage):
+        """Usage d'une requête pour la réponse API"""
+        with self.lock:
+            return dict(calls=usage['calls'], prompt_tokens=usage['prompt_tokens'],
+                        completion_tokens=usage['completion_tokens'], cost_usd=round(usage['cost_usd'], 5))
+    
+    def aggregate(self, rows, breakdown):
+        """Somme de lignes (dimensions, comptes), au total et par dimension"""
+        empty = lambda: {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cost_usd': 0.0}
+        total = empty()
+        groups = defaultdict(lambda: defaultdict(empty))
+        for dimensions, (calls, prompt_tokens, completion_tokens) in rows:
+            model = dict(dimensions)['model']
+            cost = self.cost(model, prompt_tokens, completion_tokens)
+            targets = [total] + ([groups[name][value] for name, value in dimensions] if breakdown else [])
+            for target in targets:
+                target['calls'] += calls
+                target['prompt_tokens'] += prompt_tokens
+                target['completion_tokens'] += completion_tokens
+                target['cost_usd'] += cost
+        for target in [total] + [group for values in groups.values() for group in values.values()]:
+            target['cost_usd'] = round(target['cost_usd'], 4)
+        if breakdown:
+            total['by'] = {name: {str(value): counts for value, counts in values.items()} for name, values in groups.items()}
+        return total
+    
+    def window(self, seconds, breakdown=True):
+        since = int(time.time() // 60) - seconds // 60
+        with self.lock:
+            rows = [(dimensions, list(counts)) for minute, bucket in self.buckets if minute > since
+                    for dimensions, counts in bucket.items()]
+        return self.aggregate(rows, breakdown)
+    
+    def get_stats(self, breakdown=False):
+        with self.lock:
+            rows = [(dimensions, list(counts)) for dimensions, counts in self.totals.items()]
+            missing = self.missing
+        return {
+            'total': self.aggregate(rows, True),
+            'windows': {name: self.window(seconds, breakdown) for name, seconds in self.WINDOWS},
+            'missing_usage': missing
+        }
@@ -0,0 +1,148 @@
+"""File de tâches en arrière-plan (résumés, explorations) avec suivi par SSE"""
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+class JobQueue:
+    """Tâches longues (appels Mistral) exécutées hors de la requête HTTP
+    
+    La soumission renvoie immédiatement un identifiant; le travail tourne sur
+    un pool borné de threads et le client interroge l'état de la tâche ou
+    s'abonne à son flux SSE. Deux soumissions de la même clé partagent la
+    même tâche tant qu'elle est en cours ou terminée avec succès et encore
+    conservée; un résultat dégradé (délestage) reste lisible par ceux qui
+    l'attendaient, mais la soumission suivante relance le travail. describe()
+    et events() acceptent une vue pour adapter le résultat commun à chaque
+    client. Au-delà de max_pending tâches en attente ou en cours, la
+    soumission est refusée plutôt que de s'accumuler.
+    """
+    
+    def __init__(self, workers=4, max_pending=32, retention=600, max_jobs=1000, name='job'):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self.by_key = {}
+        self.condition = threading.Condition()
+        self.stats = {'submitted': 0, 'deduplicated': 0, 'rejected': 0, 'completed': 0, 'failed': 0}
+    
+    def pending(self):
+        return sum(1 for job in self.jobs.values() if job['status'] in ('queued', 'running'))
+    
+    def purge(self):
+        """Oublie les tâches terminées depuis plus de retention secondes (appelé sous verrou)"""
+        expired_before = time.time() - self.retention
+        finished = [job for job in self.jobs.values() if job['finished_at']]
+        overflow = len(self.jobs) - self.max_jobs
+        for job in finished:
+            if job['finished_at'] >= expired_before and overflow <= 0:
+                continue
+            del self.jobs[job['id']]
+            if self.by_key.get(job['key']) == job['id']:
+                del self.by_key[job['key']]
+            overflow -= 1
+    
+    def submit(self, key, func):
+        """Retourne (tâche, dédupliquée); (None, False) si la file est pleine"""
+        with self.condition:
+            self.purge()
+            job = self.jobs.get(self.by_key.get(key))
+            if job and job['status'] != 'failed':
+                self.stats['deduplicated'] += 1
+                return job, True
+            
+            if self.pending() >= self.max_pending:
+                self.stats['rejected'] += 1
+                return None, False
+            
+            job = {
+                'id': uuid.uuid4().hex,
+                'key': key,
+                'status': 'queued',
+                'version': 0,
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None
+            }
+            self.jobs[job['id']] = job
+            self.by_key[key] = job['id']
+            self.stats['submitted'] += 1
+        
+        self.executor.submit(self.run, job, func)
+        return job, False
+    
+    def update(self, job, **changes):
+        with self.condition:
+            job.update(changes)
+            job['version'] += 1
+            self.condition.notify_all()
+    
+    def run(self, job, func):
+        self.update(job, status='running', started_at=time.time())
+        try:
+            result = func()
+            error = None if result.get('success') else result.get('error', 'Erreur inconnue')
+        except Exception as e:
+            result, error = None, str(e)
+        
+        with self.condition:
+            self.stats['failed' if error else 'completed'] += 1
+            if result and result.get('degraded') and self.by_key.get(job['key']) == job['id']:
+                # Réponse de repli: ne pas la resservir aux soumissions suivantes
+                del self.by_key[job['key']]
+        self.update(job, status='failed' if error else 'done', finished_at=time.time(), result=result, error=error)
+    
+    def get(self, job_id):
+        with self.condition:
+            return self.jobs.get(job_id)
+    
+    def describe(self, job, view=None):
+        """État public d'une tâche (résultat inclus une fois terminée, passé par view si fournie)"""
+        with self.condition:
+            now = time.time()
+            info = {
+                'job_id': job['id'],
+                'status': job['status'],
+                'wait_time': round((job['started_at'] or now) - job['submitted_at'], 3),
+                'run_time': round((job['finished_at'] or now) - job['started_at'], 3) if job['started_at'] else None
+            }
+            if job['status'] == 'done':
+                info['result'] = view(job['result']) if view else job['result']
+            elif job['status'] == 'failed':
+                info['error'] = job['error']
+            return info
+    
+    def events(self, job, heartbeat=15, view=None):
+        """Flux SSE: un événement par changement d'état, commentaire keepalive sinon"""
+        version = -1
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: job['version'] != version, timeout=heartbeat)
+                changed = job['version'] != version
+                version = job['version']
+                info = self.describe(job, view) if changed else None
+            
+            if info is None:
+                yield ': keepalive\n\n'
+                continue
+            
+            yield f"event: {info['status']}\ndata: {json.dumps(info, ensure_ascii=False)}\n\n"
+            if info['status'] in ('done', 'failed'):
+                return
+    
+    def get_stats(self):
+        with self.condition:
+            running = sum(1 for job in self.jobs.values() if job['status'] == 'running')
+            return dict(self.stats,
+                        queued=self.pending() - running,
+                        running=running,
+                        retained=len(self.jobs),
+                        workers=self.workers,
+                        max_pending=self.max_pending)
@@ -0,0 +1,180 @@
+"""Instantané du cache sur disque, rechargé au démarrage"""
+import atexit
+import gzip
+import json
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+
+class CacheSnapshot:
+    """Instantané des entrées chaudes du cache, rechargé au démarrage
+    
+    Sauvegardé périodiquement et à l'arrêt (SIGTERM, atexit) dans un JSON
+    gzip écrit de façon atomique. Au démarrage, le rechargement se fait dans
+    un thread avec un budget de temps: le service répond immédiatement et
+    les premières requêtes trouvent déjà les entrées populaires en cache.
+    Les messages passent par log (print par défaut, logger.info pour Mathia).
+    """
+    
+    VERSION = 1
+    
+    # Instantanés à sauvegarder par le gestionnaire SIGTERM commun au processus
+    registered = []
+    sigterm_installed = False
+    shutdown_timeout = 5  # secondes accordées aux sauvegardes sur SIGTERM
+    
+    def __init__(self, path, fingerprint, collect, restore, max_age=7 * 86400, name='snapshot', log=print):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.collect = collect
+        self.restore = restore
+        self.max_age = max_age
+        self.name = name
+        self.log = log
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stats = {
+            'status': 'idle',
+            'loaded': 0,
+            'skipped': 0,
+            'load_time': 0,
+            'saves': 0,
+            'last_save': None,
+            'errors': 0
+        }
+    
+    def save(self):
+        """Écrit l'instantané (fichier temporaire puis os.replace)"""
+        with self.lock:
+            try:
+                items = self.collect()
+                if not items:
+                    # Ne jamais remplacer un instantané utile par un cache vide
+                    return 0
+                payload = {
+                    'version': self.VERSION,
+                    'fingerprint': self.fingerprint,
+                    'saved_at': time.time(),
+                    'entries': items
+                }
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                    json.dump(payload, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                
+                self.stats['saves'] += 1
+                self.stats['last_save'] = datetime.now().isoformat()
+                self.log(f"💾 Instantané du cache sauvegardé ({len(items)} entrées)")
+                return len(items)
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.log(f"⚠️ Sauvegarde de l'instantané impossible: {e}")
+                return 0
+    
+    def load(self, budget):
+        """Recharge les entrées, les plus populaires d'abord, dans le budget de temps"""
+        start = time.time()
+        self.stats['status'] = 'loading'
+        
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            self.stats['status'] = 'empty'
+            return
+        except Exception as e:
+            self.stats['status'] = 'error'
+            self.stats['errors'] += 1
+            self.log(f"⚠️ Instantané illisible: {e}")
+            return
+        
+        if payload.get('version') != self.VERSION or payload.get('fingerprint') != self.fingerprint:
+            self.stats['status'] = 'stale'
+            self.log("📸 Instantané ignoré (prompts, modèle ou format modifiés)")
+            return
+        if time.time() - payload.get('saved_at', 0) > self.max_age:
+            self.stats['status'] = 'expired'
+            return
+        
+        for item in payload.get('entries', []):
+            if time.time() - start > budget:
+                self.stats['skipped'] += 1
+                continue
+            if self.restore(item):
+                self.stats['loaded'] += 1
+            else:
+                self.stats['skipped'] += 1
+        
+        self.stats['load_time'] = round(time.time() - start, 3)
+        self.stats['status'] = 'loaded'
+        self.log(f"📸 Cache réchauffé: {self.stats['loaded']} entrées en {self.stats['load_time']}s")
+    
+    def run(self, budget, interval):
+        self.load(budget)
+        while True:
+            time.sleep(interval)
+            self.save()
+    
+    def start(self, budget, interval):
+        """Rechargement puis sauvegardes périodiques en arrière-plan"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, args=(budget, interval),
+                                           name=self.name, daemon=True)
+            self.thread.start()
+    
+    def install_handlers(self):
+        """Sauvegarde à l'arrêt: atexit, et SIGTERM via le gestionnaire commun
+        
+        signal.signal() n'est possible que dans le thread principal. Sous le hub, les
+        sous-applications se chargent dans le thread de préchauffage ou d'une requête:
+        le hub appelle install_sigterm() à l'import, et ce gestionnaire sauvegarde tous
+        les instantanés enregistrés ici, y compris ceux créés après coup.
+        """
+        atexit.register(self.save)
+        CacheSnapshot.registered.append(self)
+        
+        if threading.current_thread() is threading.main_thread():
+            CacheSnapshot.install_sigterm()
+    
+    @classmethod
+    def install_sigterm(cls):
+        """Installe une fois le gestionnaire SIGTERM, chaîné à l'existant (gunicorn)
+        
+        Le gestionnaire interrompt le thread principal n'importe où, éventuellement
+        pendant qu'il tient un verrou du cache ou du codec (non réentrants): les
+        sauvegardes tournent donc dans un thread à part, attendu au plus
+        shutdown_timeout secondes, puis l'arrêt continue quoi qu'il arrive.
+        """
+        if cls.sigterm_installed:
+            return True
+        
+        previous = signal.getsignal(signal.SIGTERM)
+        
+        def save_all():
+            for snapshot in list(cls.registered):
+                snapshot.save()
+        
+        def handle_sigterm(signum, frame):
+            saver = threading.Thread(target=save_all, name='snapshot-sigterm', daemon=True)
+            saver.start()
+            saver.join(cls.shutdown_timeout)
+            if saver.is_alive():
+                print("⚠️ Sauvegarde des instantanés abandonnée à l'arrêt (verrou occupé)")
+            if callable(previous):
+                previous(signum, frame)
+            else:
+                raise SystemExit(0)
+        
+        try:
+            signal.signal(signal.SIGTERM, handle_sigterm)
+        except ValueError:
+            return False
+        cls.sigterm_installed = True
+        return True
+    
+    def get_stats(self):
+        stats = self.stats.copy()
+        stats['path'] = self.path
+        return stats
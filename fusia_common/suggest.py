@@ -0,0 +1,130 @@
+"""Autocomplétion: trie compressé (radix) borné, partagé par tous les utilisateurs"""
+import re
+import threading
+import unicodedata
+
+class PrefixTrie:
+    """Trie compressé (radix) avec les meilleures complétions mémorisées par nœud
+    
+    Chaque libellé est indexé depuis son début et depuis chaque mot suivant,
+    de sorte que "pyth" propose aussi "Théorème de Pythagore". Les scores ne
+    font qu'augmenter: le top-K de chaque nœud du chemin est mis à jour à
+    l'insertion et une recherche se limite à descendre le long du préfixe.
+    
+    Le trie est visible de tous: on n'y met que des titres canoniques
+    (concepts de la bibliothèque, titres Wikipedia), jamais la saisie brute.
+    Au-delà de max_terms libellés, il est reconstruit avec les 90% les plus
+    forts (les top-K tronqués des nœuds ne permettent pas de retirer un
+    libellé isolément sans perdre des complétions).
+    """
+    
+    def __init__(self, top_k=8, max_terms=5000, max_label_length=100):
+        self.top_k = top_k
+        self.max_terms = max_terms
+        self.max_label_length = max_label_length
+        self.root = {'edges': {}, 'top': []}
+        self.scores = {}
+        self.lock = threading.Lock()
+        self.stats = {'evicted': 0, 'rebuilds': 0}
+    
+    @staticmethod
+    def normalize(text):
+        """Minuscules sans accents, espaces normalisés"""
+        decomposed = unicodedata.normalize('NFKD', text.lower())
+        folded = ''.join(c for c in decomposed if not unicodedata.combining(c))
+        return ' '.join(re.findall(r'\w+', folded))
+    
+    def update_top(self, node, label, score):
+        top = [item for item in node['top'] if item[1] != label]
+        top.append((score, label))
+        top.sort(key=lambda item: (-item[0], item[1]))
+        node['top'] = top[:self.top_k]
+    
+    def insert_key(self, root, key, label, score):
+        node = root
+        rest = key
+        self.update_top(node, label, score)
+        
+        while rest:
+            edge = node['edges'].get(rest[0])
+            if edge is None:
+                child = {'edges': {}, 'top': []}
+                node['edges'][rest[0]] = [rest, child]
+                self.update_top(child, label, score)
+                return
+            
+            edge_label, child = edge
+            common = 0
+            while common < min(len(edge_label), len(rest)) and edge_label[common] == rest[common]:
+                common += 1
+            
+            # Découpage de l'arête au point de divergence
+            if common < len(edge_label):
+                middle = {'edges': {edge_label[common]: [edge_label[common:], child]}, 'top': list(child['top'])}
+                edge[0], edge[1] = edge_label[:common], middle
+                child = middle
+            
+            node = child
+            rest = rest[common:]
+            self.update_top(node, label, score)
+    
+    def index(self, root, label, score):
+        """Indexe un libellé depuis chacun de ses mots"""
+        words = self.normalize(label).split(' ')
+        for i in range(len(words)):
+            self.insert_key(root, ' '.join(words[i:]), label, score)
+    
+    def add(self, label, weight=1):
+        """Ajoute (ou renforce) un libellé"""
+        label = label.strip()
+        if not self.normalize(label) or len(label) > self.max_label_length:
+            return
+        
+        with self.lock:
+            score = self.scores.get(label, 0) + weight
+            self.scores[label] = score
+            self.index(self.root, label, score)
+            if len(self.scores) > self.max_terms:
+                self.evict()
+    
+    def evict(self):
+        """Reconstruit le trie avec les libellés les plus forts (sous verrou)"""
+        keep = sorted(self.scores.items(), key=lambda item: (-item[1], item[0]))[:int(self.max_terms * 0.9)]
+        root = {'edges': {}, 'top': []}
+        for label, score in keep:
+            self.index(root, label, score)
+        
+        self.stats['evicted'] += len(self.scores) - len(keep)
+        self.stats['rebuilds'] += 1
+        self.scores = dict(keep)
+        # Les recherches en cours gardent l'ancien trie jusqu'au bout
+        self.root = root
+    
+    def search(self, prefix, limit=8):
+        """Meilleures complétions pour un préfixe"""
+        rest = self.normalize(prefix)
+        if prefix.endswith(' ') and rest:
+            rest += ' '
+        node = self.root
+        
+        while rest:
+            edge = node['edges'].get(rest[0])
+            if edge is None:
+                return []
+            edge_label, child = edge
+            if rest.startswith(edge_label):
+                rest = rest[len(edge_label):]
+                node = child
+            elif edge_label.startswith(rest):
+                node = child
+                break
+            else:
+                return []
+        
+        return [label for _, label in node['top'][:limit]]
+    
+    def size(self):
+        return len(self.scores)
+    
+    def get_stats(self):
+        return dict(self.stats, terms=len(self.scores), max_terms=self.max_terms)
@@ -1,13 +1,32 @@
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request, jsonify, Response
+import click
+import ast
 import os
 import json
 import logging
 import time
 import hashlib
+import heapq
+import math
+import mmap
 import re
+import struct
+import sys
+import threading
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 import traceback
+import unicodedata
+from html import escape as html_escape, unescape as html_unescape
+
+# Classes communes au wiki et à Mathia (fusia_common/, à la racine du dépôt)
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from fusia_common import (CacheCodec, CacheSnapshot, CompressedCache, ConcurrencyLimiter, GatewayOverloaded,
+                          HedgePolicy, IsolatedPool, JobQueue, KeyPool, LRUCache, ModelRouter, PopularityTracker,
+                          PrefixTrie, ResponseCache, StaticAssets, TinyLFUCache, UsageMeter, make_cache)
 
 # Configuration du logging
 logging.basicConfig(
@@ -16,7 +35,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+# Interface servie par StaticAssets (noms hachés), pas par le dossier static de Flask
+app = Flask(__name__, static_folder=None)
 
 # CORS Configuration
 @app.after_request
@@ -56,16 +76,132 @@ class Config:
     
     # Performance
     CACHE_MAX_SIZE = 100
+    CACHE_POLICY = os.environ.get('MATHIA_CACHE_POLICY', 'tinylfu')  # 'tinylfu' ou 'lru'
+    
+    # Calcul
+    MAX_EXPRESSION_LENGTH = 500
+    MAX_BATCH_SIZE = 50
+    MAX_EVAL_POINTS = 10000
+    EXPRESSION_CACHE_SIZE = 256
+    SYMBOLIC_TIMEOUT = float(os.environ.get('MATHIA_SYMBOLIC_TIMEOUT', 5))  # secondes par opération
+    SYMBOLIC_WORKERS = int(os.environ.get('MATHIA_SYMBOLIC_WORKERS', 2))  # processus sympy simultanés
+    SYMBOLIC_MEMORY_MB = int(os.environ.get('MATHIA_SYMBOLIC_MEMORY_MB', 1024))  # par ouvrier, 0 = sans limite
+    MAX_SYMBOLIC_OPS = 300  # taille de l'arbre pour simplify/expand/factor/integral/solve
+    MAX_SYMBOLIC_EXPONENT = 100
+    MAX_INTEGER_DIGITS = 4000  # entiers construits au parsing (puissances)
+    MAX_FACTORIAL_ARGUMENT = 1000
+    
+    # Bibliothèque de concepts précompilée
+    LIBRARY_PATH = os.environ.get(
+        'MATHIA_LIBRARY_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mathia_library.bin')
+    )
+    LIBRARY_FORMAT_VERSION = 2
+    LIBRARY_LANGUAGES = ['fr', 'en', 'es']
+    LIBRARY_DETAIL_LEVELS = ['court', 'moyen', 'long']
+    
+    # Préchargement des concepts liés
+    PREFETCH_ENABLED = os.environ.get('MATHIA_PREFETCH', '1') == '1'
+    PREFETCH_MAX_PER_HOUR = int(os.environ.get('MATHIA_PREFETCH_PER_HOUR', 30))
+    PREFETCH_MAX_RELATED = 6
+    PREFETCH_QUEUE_SIZE = 50
+    PREFETCH_IDLE_DELAY = 2  # secondes
+    PREFETCH_RATE_LIMIT_COOLDOWN = 60  # secondes sans 429 avant de précharger
+    
+    # Canonicalisation des concepts
+    CANONICAL_FUZZY_THRESHOLD = 0.7  # suggestions uniquement, jamais la clé de cache
+    CANONICAL_MEMO_SIZE = 5000
+    
+    # Popularité (count-min sketch + top-K)
+    POPULARITY_WIDTH = 2048
+    POPULARITY_DEPTH = 4
+    POPULARITY_TOP_K = 100
+    POPULARITY_WINDOW = 3600  # secondes, les compteurs sont divisés par deux
+    POPULARITY_HOT_THRESHOLD = 3  # demandes pour recharger une entrée évincée
+    
+    # Instantané du cache (réchauffage au démarrage)
+    SNAPSHOT_ENABLED = os.environ.get('MATHIA_SNAPSHOT', '1') == '1'
+    SNAPSHOT_PATH = os.environ.get(
+        'MATHIA_SNAPSHOT_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mathia_snapshot.json.gz')
+    )
+    SNAPSHOT_INTERVAL = int(os.environ.get('MATHIA_SNAPSHOT_INTERVAL', 600))  # secondes
+    SNAPSHOT_MAX_ENTRIES = 60
+    SNAPSHOT_LOAD_BUDGET = 5  # secondes
+    SNAPSHOT_MAX_AGE = 7 * 86400  # secondes
+    
+    # Réponses pré-sérialisées (ETag, GET conditionnel)
+    RESPONSE_CACHE_SIZE = 128
+    RESPONSE_MAX_AGE = 3600  # secondes
+    
+    # Autocomplétion
+    SUGGEST_MAX_RESULTS = 8
+    SUGGEST_MAX_QUERY_LENGTH = 100
+    
+    # Tracé
+    PLOT_BASE_POINTS = 600
+    PLOT_MAX_POINTS = 5000
+    PLOT_REFINE_PASSES = 4
+    PLOT_CACHE_SIZE = 64
+    PLOT_MAX_DOMAIN = 1e6
+    PLOT_MIN_SIZE = 200
+    PLOT_MAX_SIZE = 2000
+    PLOT_CACHE_MAX_AGE = 86400  # secondes
+    PLOT_DATA_DEFAULT_POINTS = 400
+    
+    # Tâches asynchrones (POST /api/jobs/explore)
+    JOB_WORKERS = int(os.environ.get('MATHIA_JOB_WORKERS', 4))
+    JOB_MAX_PENDING = int(os.environ.get('MATHIA_JOB_MAX_PENDING', 32))
+    JOB_RETENTION = int(os.environ.get('MATHIA_JOB_RETENTION', 600))  # secondes après la fin
+    JOB_HEARTBEAT = 15  # secondes entre deux keepalive SSE
+    
+    # Interface (fichiers statiques hachés)
+    STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    PAGE_MAX_AGE = 300  # secondes, revalidée ensuite par ETag
+    ASSET_MAX_AGE = 31536000  # un an: le nom change avec le contenu
     
     # Mistral
     MISTRAL_MODEL_PRIMARY = "mistral-large-latest"
     MISTRAL_MODEL_FALLBACK = "mistral-small-latest"
     MISTRAL_MAX_TOKENS = 1200
+    MISTRAL_UPGRADE_MAX_TOKENS = 700
     MISTRAL_TEMPERATURE = 0.7
+    # Tarifs indicatifs ($ par million de tokens: entrée, sortie), remplaçables par MATHIA_MODEL_PRICES (JSON)
+    MODEL_PRICES = json.loads(os.environ.get('MATHIA_MODEL_PRICES') or 'null') or {
+        'mistral-large-latest': (2.0, 6.0),
+        'mistral-small-latest': (0.2, 0.6),
+    }
     
     # Rate limiting
     MAX_RETRIES_PER_KEY = 2
     RETRY_DELAY = 1  # secondes
+    
+    # Concurrence par clé apprise par AIMD (+1/limite par succès, ×0.5 sur 429)
+    KEY_INITIAL_LIMIT = 2.0
+    KEY_MIN_LIMIT = 1.0
+    KEY_MAX_LIMIT = float(os.environ.get('MATHIA_KEY_MAX_LIMIT', 8))
+    KEY_DECREASE_FACTOR = 0.5
+    
+    # Hedging: doublon sur une autre clé au-delà du p90 de latence (optionnel)
+    HEDGE_ENABLED = os.environ.get('MATHIA_HEDGING', '0') == '1'
+    HEDGE_PERCENTILE = 0.9
+    HEDGE_BUDGET = float(os.environ.get('MATHIA_HEDGE_BUDGET', 0.12))  # doublons par appel (> 1 - percentile)
+    HEDGE_MODEL = os.environ.get('MATHIA_HEDGE_MODEL') or None  # ex. mistral-small-latest
+    
+    # Routage large/small avant l'appel, par route et niveau de détail ('large', 'small' ou 'auto')
+    ROUTING_RULES = {
+        'explore': {'court': 'small', 'moyen': 'large', 'long': 'large'},
+        'upgrade': {'moyen': 'auto', 'long': 'large'},
+        'prefetch': {'court': 'small', 'moyen': 'auto', 'long': 'large'},
+    }
+    ROUTING_OVERRIDES = os.environ.get('MATHIA_ROUTING_RULES')  # JSON fusionné, ex. {"explore": {"moyen": "auto"}}
+    ROUTING_SMALL_INPUT = int(os.environ.get('MATHIA_ROUTING_SMALL_INPUT', 2500))  # caractères de prompt
+    ROUTING_MIN_HEADROOM = 0.2  # capacité libre des clés sous laquelle on passe au small
+    
+    # Admission devant Mistral (au-delà: 503 + Retry-After ou réponse dégradée)
+    LLM_MAX_CONCURRENT = int(os.environ.get('MATHIA_LLM_CONCURRENCY', 4))
+    LLM_MAX_QUEUE = int(os.environ.get('MATHIA_LLM_QUEUE', 8))
+    LLM_DEADLINE = int(os.environ.get('MATHIA_LLM_DEADLINE', 25))  # secondes, sous le timeout gunicorn (30 s)
 
 # Vérification des clés API
 if not Config.API_KEYS:
@@ -86,48 +222,1225 @@ else:
         logger.info(f"   Clé {i}: {masked_key}")
     logger.info("=" * 70)
 
-# Cache LRU
-class LRUCache:
-    def __init__(self, max_size=100):
-        self.cache = {}
-        self.access_order = []
-        self.max_size = max_size
-    
-    def get(self, key):
-        if key in self.cache:
-            self.access_order.remove(key)
-            self.access_order.append(key)
-            return self.cache[key]
+# Concepts les plus demandés, pré-générés par la commande build-library (fr, en, es)
+LIBRARY_CONCEPTS = [
+    ('Théorème de Pythagore', 'Pythagorean theorem', 'Teorema de Pitágoras'),
+    ('Théorème de Thalès', 'Intercept theorem', 'Teorema de Tales'),
+    ('Fonction', 'Function', 'Función'),
+    ('Dérivée', 'Derivative', 'Derivada'),
+    ('Intégrale', 'Integral', 'Integral'),
+    ('Limite', 'Limit', 'Límite'),
+    ('Continuité', 'Continuity', 'Continuidad'),
+    ('Nombres premiers', 'Prime numbers', 'Números primos'),
+    ('Nombres complexes', 'Complex numbers', 'Números complejos'),
+    ('Matrice', 'Matrix', 'Matriz'),
+    ('Déterminant', 'Determinant', 'Determinante'),
+    ('Vecteur', 'Vector', 'Vector'),
+    ('Produit scalaire', 'Dot product', 'Producto escalar'),
+    ('Probabilité', 'Probability', 'Probabilidad'),
+    ('Loi normale', 'Normal distribution', 'Distribución normal'),
+    ('Espérance', 'Expected value', 'Esperanza matemática'),
+    ('Variance', 'Variance', 'Varianza'),
+    ('Équation du second degré', 'Quadratic equation', 'Ecuación de segundo grado'),
+    ('Polynôme', 'Polynomial', 'Polinomio'),
+    ('Logarithme', 'Logarithm', 'Logaritmo'),
+    ('Fonction exponentielle', 'Exponential function', 'Función exponencial'),
+    ('Trigonométrie', 'Trigonometry', 'Trigonometría'),
+    ('Cercle trigonométrique', 'Unit circle', 'Circunferencia goniométrica'),
+    ('Suite arithmétique', 'Arithmetic sequence', 'Progresión aritmética'),
+    ('Suite géométrique', 'Geometric sequence', 'Progresión geométrica'),
+    ('Récurrence', 'Mathematical induction', 'Inducción matemática'),
+    ('Ensemble', 'Set', 'Conjunto'),
+    ('Fraction', 'Fraction', 'Fracción'),
+    ('Pourcentage', 'Percentage', 'Porcentaje'),
+    ('PGCD', 'Greatest common divisor', 'Máximo común divisor'),
+    ('Théorème fondamental de l\'analyse', 'Fundamental theorem of calculus', 'Teorema fundamental del cálculo'),
+    ('Équation différentielle', 'Differential equation', 'Ecuación diferencial'),
+    ('Série de Taylor', 'Taylor series', 'Serie de Taylor'),
+    ('Nombre pi', 'Pi', 'Número pi'),
+    ('Nombre d\'or', 'Golden ratio', 'Número áureo'),
+    ('Statistiques', 'Statistics', 'Estadística'),
+    ('Géométrie', 'Geometry', 'Geometría'),
+    ('Aire et périmètre', 'Area and perimeter', 'Área y perímetro'),
+    ('Combinatoire', 'Combinatorics', 'Combinatoria'),
+    ('Factorielle', 'Factorial', 'Factorial'),
+]
+
+# Synonymes supplémentaires (clé: nom anglais d'un concept de LIBRARY_CONCEPTS)
+CONCEPT_ALIASES = {
+    'Pythagorean theorem': ['Pythagore', 'Pythagoras', 'Pythagoras theorem', 'Pitágoras', 'Théorème de Pythagoras'],
+    'Intercept theorem': ['Thalès', 'Thales', 'Thales theorem', 'Tales'],
+    'Derivative': ['Dérivation', 'Derivation', 'Nombre dérivé', 'Differentiation'],
+    'Integral': ['Intégration', 'Integration', 'Integración', 'Primitive', 'Antiderivative'],
+    'Prime numbers': ['Nombre premier', 'Prime number', 'Primes', 'Número primo'],
+    'Complex numbers': ['Nombre complexe', 'Complex number', 'Número complejo'],
+    'Matrix': ['Matrices', 'Matrices'],
+    'Probability': ['Probabilités', 'Probabilities', 'Probabilidades'],
+    'Normal distribution': ['Loi de Gauss', 'Gaussian distribution', 'Gaussienne', 'Campana de Gauss'],
+    'Quadratic equation': ['Second degré', 'Trinôme', 'Équation quadratique', 'Ecuación cuadrática'],
+    'Logarithm': ['Logarithme népérien', 'Ln', 'Natural logarithm', 'Log'],
+    'Exponential function': ['Exponentielle', 'Exponential', 'Exponencial'],
+    'Greatest common divisor': ['GCD', 'Plus grand commun diviseur', 'MCD'],
+    'Mathematical induction': ['Raisonnement par récurrence', 'Induction', 'Inducción'],
+    'Pi': ['π', 'Pi number'],
+    'Golden ratio': ['Phi', 'Nombre d\'or', 'Proportion dorée', 'Divine proportion'],
+    'Fundamental theorem of calculus': ['Théorème fondamental du calcul'],
+    'Taylor series': ['Développement de Taylor', 'Développement limité', 'Taylor expansion'],
+    'Expected value': ['Espérance mathématique', 'Expectation', 'Mean value'],
+    'Statistics': ['Statistique', 'Estadísticas'],
+}
+
+# Canonicalisation des concepts (clé de cache multilingue)
+class ConceptCanonicalizer:
+    """Associe une saisie libre à un identifiant canonique de concept
+    
+    Repli des accents et des pluriels, suppression des mots vides, puis
+    dictionnaire d'alias multilingue: seule une correspondance exacte après
+    normalisation donne la clé de cache. La correspondance approchée (index
+    de trigrammes) ne sert qu'à proposer un concept proche, jamais à fusionner
+    deux saisies. Les saisies inconnues gardent leur forme normalisée.
+    """
+    
+    VERSION = 2
+    STOPWORDS = {
+        'le', 'la', 'les', 'l', 'de', 'du', 'des', 'd', 'un', 'une', 'et', 'en', 'au', 'aux',
+        'the', 'of', 'a', 'an', 'and', 'to', 'in', 'on', 'for', 's',
+        'el', 'los', 'las', 'del', 'una', 'y', 'al'
+    }
+    
+    def __init__(self, concepts, aliases):
+        self.aliases = {}
+        self.trigrams = defaultdict(set)
+        self.memo = LRUCache(max_size=Config.CANONICAL_MEMO_SIZE)
+        self.stats = {'alias': 0, 'passthrough': 0, 'suggested': 0}
+        
+        for names in concepts:
+            canonical_id = self.normalize(names[1])
+            for name in set(names) | set(aliases.get(names[1], [])):
+                self.add_alias(name, canonical_id)
+        
+        self.fingerprint = hashlib.md5(
+            json.dumps([self.VERSION, sorted(self.aliases.items())]).encode()
+        ).hexdigest()
+    
+    def singular(self, word):
+        """Forme singulière approchée (pluriels réguliers français, anglais et espagnols)"""
+        if len(word) <= 3:
+            return word
+        if word.endswith('iones'):
+            return word[:-2]
+        if word.endswith('aux'):
+            return word[:-3] + 'al'
+        if word[-1] in 'sx':
+            return word[:-1]
+        return word
+    
+    def normalize(self, text):
+        """Minuscules, sans accents, au singulier, sans ponctuation ni mots vides"""
+        decomposed = unicodedata.normalize('NFKD', text.lower())
+        folded = ''.join(c for c in decomposed if not unicodedata.combining(c))
+        words = re.findall(r'[a-z0-9π]+', folded)
+        meaningful = [word for word in words if word not in self.STOPWORDS]
+        return ' '.join(self.singular(word) for word in meaningful or words)
+    
+    def trigram_set(self, text):
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def add_alias(self, name, canonical_id):
+        alias = self.normalize(name)
+        if not alias:
+            return
+        self.aliases[alias] = canonical_id
+        for trigram in self.trigram_set(alias):
+            self.trigrams[trigram].add(alias)
+    
+    def fuzzy_match(self, normalized):
+        """Alias le plus proche (similarité de Jaccard sur les trigrammes)"""
+        grams = self.trigram_set(normalized)
+        candidates = defaultdict(int)
+        for trigram in grams:
+            for alias in self.trigrams.get(trigram, ()):
+                candidates[alias] += 1
+        
+        best_alias, best_score = None, 0.0
+        for alias, shared in candidates.items():
+            score = shared / (len(grams) + len(self.trigram_set(alias)) - shared)
+            if score > best_score:
+                best_alias, best_score = alias, score
+        
+        if best_score >= Config.CANONICAL_FUZZY_THRESHOLD:
+            return best_alias
+        return None
+    
+    def canonicalize(self, concept):
+        """Identifiant canonique d'un concept (mémorisé): alias exact ou forme normalisée"""
+        normalized = self.normalize(concept)
+        canonical_id = self.memo.get(normalized)
+        if canonical_id is not None:
+            return canonical_id
+        
+        if normalized in self.aliases:
+            canonical_id = self.aliases[normalized]
+            self.stats['alias'] += 1
+        else:
+            canonical_id = normalized
+            self.stats['passthrough'] += 1
+        
+        self.memo.set(normalized, canonical_id)
+        return canonical_id
+    
+    def suggest(self, concept):
+        """Identifiant canonique d'un concept connu proche de la saisie (faute de frappe), sinon None"""
+        normalized = self.normalize(concept)
+        if len(normalized) < 4 or normalized in self.aliases:
+            return None
+        alias = self.fuzzy_match(normalized)
+        if alias:
+            self.stats['suggested'] += 1
+            return self.aliases[alias]
         return None
     
-    def set(self, key, value):
-        if key in self.cache:
-            self.access_order.remove(key)
-        elif len(self.cache) >= self.max_size:
-            oldest = self.access_order.pop(0)
-            del self.cache[oldest]
+    def get_stats(self):
+        stats = self.stats.copy()
+        stats['aliases'] = len(self.aliases)
+        stats['canonical_concepts'] = len(set(self.aliases.values()))
+        return stats
+
+# Moteur de calcul (sympy + numpy)
+class ExpressionEngine:
+    """Évaluation numérique et symbolique avec cache d'expressions compilées"""
+    
+    ALLOWED_CHARS = re.compile(r'^[0-9A-Za-z_+\-*/^().,=\s]+$')
+    POWER_TOWER = re.compile(r'\d\s*\*\*\s*\(?\s*\d+\s*\*\*')
+    TOO_COMPLEX = re.compile(r'\d{16,}|\*\*\(?[-+]?\d{5,}|\.[A-Za-z_]')  # entiers géants, exposants énormes, attributs
+    REPLACEMENTS = [
+        ('×', '*'), ('÷', '/'), ('·', '*'), ('−', '-'),
+        ('²', '**2'), ('³', '**3'), ('√', 'sqrt'), ('π', 'pi'), ('^', '**')
+    ]
+    OPERATIONS = ['evaluate', 'simplify', 'expand', 'factor', 'derivative', 'integral', 'solve']
+    BOUNDED_OPERATIONS = ['simplify', 'expand', 'factor', 'integral', 'solve']
+    
+    # Seuls noms visibles par le parseur (jamais les builtins): les noms inconnus deviennent des symboles
+    FUNCTIONS = [
+        'sin', 'cos', 'tan', 'cot', 'sec', 'csc', 'asin', 'acos', 'atan', 'acot', 'atan2',
+        'sinh', 'cosh', 'tanh', 'asinh', 'acosh', 'atanh', 'exp', 'log', 'ln', 'sqrt', 'cbrt', 'root',
+        'Abs', 'sign', 'floor', 'ceiling', 'factorial', 'binomial', 'gamma', 'Min', 'Max',
+        're', 'im', 'arg', 'conjugate'
+    ]
+    CONSTANTS = ['pi', 'E', 'I', 'oo']
+    CONSTRUCTORS = ['Integer', 'Float', 'Rational', 'Symbol', 'Function']  # générés par les transformations
+    ALIASES = {'abs': 'Abs', 'min': 'Min', 'max': 'Max'}
+    SAFE_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+                  ast.operator, ast.unaryop)
+    
+    def __init__(self, max_size=256, timeout=5.0, workers=2):
+        self.cache = LRUCache(max_size=max_size)
+        self.pool = IsolatedPool(workers=workers, timeout=timeout, preload=('sympy',),
+                                 memory_mb=Config.SYMBOLIC_MEMORY_MB)
+        self.namespace = None
+        self.stats = {
+            'compilations': 0,
+            'compiled_cache_hits': 0,
+            'evaluations': 0,
+            'errors': 0
+        }
+    
+    def normalize(self, expression):
+        """Normalise une expression (clé du cache de compilation)"""
+        normalized = expression.strip()
+        for old, new in self.REPLACEMENTS:
+            normalized = normalized.replace(old, new)
+        return re.sub(r'\s+', '', normalized)
+    
+    def validate(self, expression):
+        """Valide une expression avant tout parsing"""
+        if not expression or not isinstance(expression, str):
+            return False, "L'expression doit être une chaîne de caractères"
+        
+        normalized = self.normalize(expression)
+        
+        if not normalized:
+            return False, "L'expression est vide"
+        
+        if len(normalized) > Config.MAX_EXPRESSION_LENGTH:
+            return False, f"L'expression ne doit pas dépasser {Config.MAX_EXPRESSION_LENGTH} caractères"
+        
+        if not self.ALLOWED_CHARS.match(normalized) or '__' in normalized:
+            return False, "L'expression contient des caractères non autorisés"
+        
+        if normalized.count('=') > 1 or self.POWER_TOWER.search(normalized) or self.TOO_COMPLEX.search(normalized):
+            return False, "Expression trop complexe ou mal formée"
+        
+        return True, normalized
+    
+    def get_namespace(self):
+        """Espace de noms du parseur: fonctions et constantes sympy autorisées, sans builtins"""
+        if self.namespace is None:
+            import sympy
+            namespace = {name: getattr(sympy, name) for name in self.FUNCTIONS + self.CONSTANTS + self.CONSTRUCTORS}
+            namespace.update({alias: getattr(sympy, name) for alias, name in self.ALIASES.items()})
+            namespace['__builtins__'] = {}
+            self.namespace = namespace
+        return self.namespace
+    
+    def check_tree(self, code, namespace):
+        """Vérifie le code généré par sympy: arithmétique et appels de noms autorisés uniquement"""
+        for node in ast.walk(ast.parse(code, mode='eval')):
+            if not isinstance(node, self.SAFE_NODES):
+                raise ValueError(f"Construction non autorisée: {type(node).__name__}")
+            if isinstance(node, ast.Name) and node.id not in namespace:
+                raise ValueError(f"Nom non autorisé: {node.id}")
+            if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.keywords):
+                raise ValueError("Appel non autorisé")
+    
+    def check_size(self, expr):
+        """Refuse les expressions que simplify/expand/factor/solve feraient exploser"""
+        import sympy
+        
+        for power in expr.atoms(sympy.Pow):
+            if power.exp.is_Number and abs(power.exp) > Config.MAX_SYMBOLIC_EXPONENT:
+                raise ValueError(f"Exposant trop grand (maximum {Config.MAX_SYMBOLIC_EXPONENT})")
+        if sympy.count_ops(expr) > Config.MAX_SYMBOLIC_OPS:
+            raise ValueError("Expression trop complexe pour un calcul symbolique")
+    
+    def check_node(self, func, args):
+        """Refuse un nœud dont l'évaluation produirait un entier géant (puissance, factorielle)
+        
+        Appelé sur chaque nœud avant son évaluation, ses arguments étant déjà évalués et bornés:
+        le coût d'une puissance est estimé par la taille en bits des nombres de la base fois l'exposant.
+        """
+        import sympy
+        
+        if func is sympy.Pow:
+            base, exponent = args
+            if exponent.is_Rational and base not in (sympy.S.Zero, sympy.S.One, sympy.S.NegativeOne):
+                bits = max([max(abs(r.p), r.q).bit_length() for r in base.atoms(sympy.Rational)] or [1])
+                if bits * abs(exponent) > Config.MAX_INTEGER_DIGITS * math.log2(10):
+                    raise ValueError(f"Nombre trop grand (maximum {Config.MAX_INTEGER_DIGITS} chiffres)")
+        elif func in (sympy.factorial, sympy.gamma):
+            if args[0].is_Number and abs(args[0]) > Config.MAX_FACTORIAL_ARGUMENT:
+                raise ValueError(f"Factorielle trop grande (maximum {Config.MAX_FACTORIAL_ARGUMENT})")
+        elif func is sympy.binomial:
+            n, k = args
+            if n.is_Number and k.is_Number and min(abs(k), abs(n - k)) > Config.MAX_FACTORIAL_ARGUMENT:
+                raise ValueError(f"Coefficient binomial trop grand (maximum {Config.MAX_FACTORIAL_ARGUMENT})")
+    
+    def rebuild(self, node):
+        """Évalue un arbre construit sans évaluation, nœud par nœud et en vérifiant chacun"""
+        if not node.args:
+            return node
+        args = [self.rebuild(arg) for arg in node.args]
+        self.check_node(node.func, args)
+        return node.func(*args)
+    
+    def numeric(self, expr):
+        """Valeur numérique d'une expression sans variable (evalf dans un ouvrier isolé)"""
+        import sympy
+        return self.pool.run(sympy.N, expr)
+    
+    def compile(self, expression):
+        """Parse et compile une expression (arbre sympy + fonction numpy), avec cache"""
+        is_valid, result = self.validate(expression)
+        if not is_valid:
+            raise ValueError(result)
+        
+        normalized = result
+        entry = self.cache.get(normalized)
+        if entry:
+            self.stats['compiled_cache_hits'] += 1
+            return entry
+        
+        try:
+            import sympy
+            from sympy.parsing.sympy_parser import (
+                eval_expr, stringify_expr, standard_transformations, implicit_multiplication_application
+            )
+        except ImportError:
+            logger.error("❌ Module sympy non installé: pip install sympy numpy")
+            raise RuntimeError("Module sympy manquant. Installez-le avec: pip install sympy numpy")
+        
+        transformations = standard_transformations + (implicit_multiplication_application,)
+        namespace = self.get_namespace()
+        
+        def parse(text):
+            code = stringify_expr(text, {}, namespace, transformations)
+            self.check_tree(code, namespace)
+            with sympy.evaluate(False):
+                tree = eval_expr(code, {}, namespace)
+            if not isinstance(tree, sympy.Basic):
+                raise ValueError("le résultat n'est pas une expression mathématique")
+            return self.rebuild(tree)
+        
+        try:
+            if '=' in normalized:
+                lhs, rhs = normalized.split('=')
+                parsed = sympy.Eq(parse(lhs), parse(rhs))
+            else:
+                parsed = parse(normalized)
+        except Exception as e:
+            raise ValueError(f"Expression invalide: {e}")
+        numeric_expr = parsed.lhs - parsed.rhs if isinstance(parsed, sympy.Eq) else parsed
+        
+        symbols = sorted(parsed.free_symbols, key=lambda s: s.name)
+        
+        # Les constantes sont évaluées par sympy, seules les fonctions sont compilées
+        func = None
+        if symbols:
+            try:
+                func = sympy.lambdify(symbols, numeric_expr, modules='numpy')
+            except Exception as e:
+                logger.warning(f"⚠️ Compilation numpy impossible pour '{normalized}': {e}")
+        
+        entry = {
+            'normalized': normalized,
+            'expr': parsed,
+            'symbols': symbols,
+            'variables': [s.name for s in symbols],
+            'is_equation': isinstance(parsed, sympy.Eq),
+            'func': func,
+            'symbolic': {}
+        }
+        
+        self.cache.set(normalized, entry)
+        self.stats['compilations'] += 1
+        return entry
+    
+    def evaluate_numeric(self, entry, variables):
+        """Évalue la fonction compilée (vectorisée si des listes de valeurs sont fournies)"""
+        import numpy as np
+        
+        missing = [name for name in entry['variables'] if name not in variables]
+        if missing or entry['func'] is None:
+            return None
+        
+        args = [np.asarray(variables[name], dtype=float) for name in entry['variables']]
+        if any(arg.size > Config.MAX_EVAL_POINTS for arg in args):
+            raise ValueError(f"Maximum {Config.MAX_EVAL_POINTS} points par variable")
+        
+        with np.errstate(all='ignore'):
+            values = np.asarray(entry['func'](*args), dtype=complex)
+        
+        if args:
+            values = np.broadcast_to(values, np.broadcast(*args).shape)
+        
+        if np.all(np.abs(values.imag) < 1e-12):
+            values = values.real
+        else:
+            values = np.where(np.abs(values.imag) < 1e-12, values.real, np.nan)
+        
+        values = np.where(np.isfinite(values), values, np.nan)
+        
+        if values.ndim == 0:
+            value = float(values)
+            return value if np.isfinite(value) else None
+        return [float(v) if np.isfinite(v) else None for v in values.ravel()]
+    
+    def evaluate_symbolic(self, entry, operation, variable=None):
+        """Applique une opération symbolique (résultat mémorisé dans l'entrée compilée)"""
+        import sympy
+        
+        expr = entry['expr']
+        symbols = entry['symbols']
+        
+        if variable:
+            target = next((s for s in symbols if s.name == variable), sympy.Symbol(variable))
+        else:
+            target = symbols[0] if symbols else sympy.Symbol('x')
+        
+        memo_key = f"{operation}:{target.name}"
+        if memo_key in entry['symbolic']:
+            return entry['symbolic'][memo_key]
+        
+        if entry['is_equation'] and operation != 'solve':
+            raise ValueError(f"L'opération '{operation}' ne s'applique pas à une équation")
+        
+        if operation in self.BOUNDED_OPERATIONS:
+            self.check_size(expr)
+        
+        if operation == 'solve':
+            result = self.pool.run(sympy.solve, expr, target)
+        elif operation == 'simplify':
+            result = self.pool.run(sympy.simplify, expr)
+        elif operation == 'expand':
+            result = self.pool.run(sympy.expand, expr)
+        elif operation == 'factor':
+            result = self.pool.run(sympy.factor, expr)
+        elif operation == 'derivative':
+            result = self.pool.run(sympy.diff, expr, target)
+        elif operation == 'integral':
+            result = self.pool.run(sympy.integrate, expr, target)
+        else:
+            result = expr
+        
+        entry['symbolic'][memo_key] = result
+        return result
+    
+    def calculate(self, expression, operation='evaluate', variables=None, variable=None):
+        """Calcule une expression: résultat symbolique, LaTeX et valeur numérique"""
+        import sympy
+        
+        entry = self.compile(expression)
+        self.stats['evaluations'] += 1
+        
+        if operation not in self.OPERATIONS:
+            raise ValueError(f"Opération inconnue: {operation}")
+        
+        result = self.evaluate_symbolic(entry, operation, variable)
+        
+        output = {
+            'success': True,
+            'expression': entry['normalized'],
+            'operation': operation,
+            'variables': entry['variables'],
+            'result': str(result),
+            'latex': sympy.latex(result)
+        }
+        
+        if operation == 'solve':
+            output['solutions'] = [str(s) for s in result]
+        elif operation == 'evaluate':
+            if entry['variables']:
+                output['numeric'] = self.evaluate_numeric(entry, variables or {})
+            else:
+                approximation = self.numeric(result)
+                try:
+                    value = complex(approximation)
+                except (TypeError, ValueError):
+                    value = complex('nan')
+                if not (math.isfinite(value.real) and math.isfinite(value.imag)):
+                    output['numeric'] = None
+                elif abs(value.imag) < 1e-12:
+                    output['numeric'] = value.real
+                else:
+                    output['numeric'] = str(approximation)
+        
+        return output
+    
+    def calculate_batch(self, items, variables=None):
+        """Traite un lot d'expressions (les expressions déjà compilées sautent le parsing)"""
+        results = []
+        for item in items:
+            if isinstance(item, str):
+                item = {'expression': item}
+            if not isinstance(item, dict):
+                results.append({'success': False, 'error': 'Élément de lot invalide'})
+                continue
+            
+            item_variables = dict(variables or {})
+            item_variables.update(item.get('variables') or {})
+            
+            try:
+                results.append(self.calculate(
+                    item.get('expression', ''),
+                    item.get('operation', 'evaluate'),
+                    item_variables,
+                    item.get('variable')
+                ))
+            except (ValueError, TypeError, AttributeError, NotImplementedError) as e:
+                self.stats['errors'] += 1
+                results.append({'success': False, 'expression': item.get('expression'), 'error': str(e)})
+        
+        return results
+    
+    def size(self):
+        return self.cache.size()
+
+# Tracé de fonctions (numpy + matplotlib)
+class FunctionPlotter:
+    """Échantillonnage vectorisé adaptatif et rendu matplotlib (Agg) avec cache"""
+    
+    FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+    
+    def __init__(self, engine, max_size=64):
+        self.engine = engine
+        self.cache = LRUCache(max_size=max_size)
+        self.stats = {
+            'renders': 0,
+            'render_cache_hits': 0,
+            'not_modified': 0,
+            'samples': 0
+        }
+    
+    def compile_function(self, expression):
+        """Compile une expression à une variable au plus"""
+        entry = self.engine.compile(expression)
+        
+        if entry['is_equation']:
+            raise ValueError("Impossible de tracer une équation, donnez une expression en x")
+        
+        if len(entry['variables']) > 1:
+            raise ValueError(f"Le tracé accepte une seule variable (trouvées: {', '.join(entry['variables'])})")
+        
+        return entry
+    
+    def evaluate(self, entry, x):
+        """Évalue la fonction sur un tableau numpy en un seul passage"""
+        import numpy as np
+        
+        with np.errstate(all='ignore'):
+            if entry['func'] is None:
+                value = complex(self.engine.numeric(entry['expr']))
+                y = np.full(x.shape, value.real if abs(value.imag) < 1e-12 else np.nan)
+            else:
+                y = np.asarray(entry['func'](x), dtype=complex)
+                y = np.broadcast_to(y, x.shape)
+                y = np.where(np.abs(y.imag) < 1e-12, y.real, np.nan)
+        
+        return np.where(np.isfinite(y), y, np.nan).astype(float)
+    
+    def jump_threshold(self, y):
+        """Seuil de saut au-delà duquel un intervalle est suspect (asymptote, discontinuité)"""
+        import numpy as np
+        
+        finite = y[np.isfinite(y)]
+        if finite.size < 2:
+            return np.inf
+        
+        low, high = np.percentile(finite, [5, 95])
+        return max((high - low) * 0.5, 1e-9)
+    
+    def suspicious_intervals(self, y, threshold):
+        """Intervalles à raffiner: saut important ou passage fini/non défini"""
+        import numpy as np
+        
+        finite = np.isfinite(y)
+        with np.errstate(invalid='ignore'):
+            jumps = np.abs(np.diff(y)) > threshold
+        edges = finite[:-1] != finite[1:]
+        return jumps | edges
+    
+    def validate_params(self, data):
+        """Valide les paramètres de tracé (query string ou JSON)"""
+        expression = str(data.get('expression', '') or '').strip()
+        if not expression:
+            raise ValueError('Le paramètre "expression" est requis')
+        
+        try:
+            xmin = float(data.get('xmin', -10))
+            xmax = float(data.get('xmax', 10))
+            width = int(data.get('width', 800))
+            height = int(data.get('height', 500))
+        except (TypeError, ValueError):
+            raise ValueError("Paramètres numériques invalides (xmin, xmax, width, height)")
+        
+        if not (math.isfinite(xmin) and math.isfinite(xmax)) or xmin >= xmax:
+            raise ValueError("Le domaine doit vérifier xmin < xmax")
+        
+        if max(abs(xmin), abs(xmax)) > Config.PLOT_MAX_DOMAIN:
+            raise ValueError(f"Le domaine est limité à ±{Config.PLOT_MAX_DOMAIN:g}")
+        
+        if not all(Config.PLOT_MIN_SIZE <= v <= Config.PLOT_MAX_SIZE for v in (width, height)):
+            raise ValueError(f"La taille doit être comprise entre {Config.PLOT_MIN_SIZE} et {Config.PLOT_MAX_SIZE} pixels")
+        
+        fmt = str(data.get('format', 'png')).lower()
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Format non supporté: {fmt} (png ou svg)")
+        
+        return expression, xmin, xmax, width, height, fmt
+    
+    def sample(self, expression, xmin, xmax, points=None):
+        """Échantillonne la fonction, raffine près des discontinuités et coupe les asymptotes"""
+        import numpy as np
+        
+        entry = self.compile_function(expression)
+        points = points or Config.PLOT_BASE_POINTS
+        
+        x = np.linspace(xmin, xmax, points)
+        y = self.evaluate(entry, x)
+        threshold = self.jump_threshold(y)
+        
+        # Raffinement adaptatif: 3 points supplémentaires par intervalle suspect
+        for _ in range(Config.PLOT_REFINE_PASSES):
+            mask = self.suspicious_intervals(y, threshold)
+            if not mask.any() or x.size >= Config.PLOT_MAX_POINTS:
+                break
+            
+            left, right = x[:-1][mask], x[1:][mask]
+            extra_x = np.concatenate([left + (right - left) * t for t in (0.25, 0.5, 0.75)])
+            extra_x = extra_x[:Config.PLOT_MAX_POINTS - x.size]
+            
+            x = np.concatenate([x, extra_x])
+            y = np.concatenate([y, self.evaluate(entry, extra_x)])
+            order = np.argsort(x, kind='mergesort')
+            x, y = x[order], y[order]
+        
+        # Un saut qui ne diminue pas au point milieu est une discontinuité: on coupe le tracé
+        candidates = np.flatnonzero(self.suspicious_intervals(y, threshold) & np.isfinite(y[:-1]) & np.isfinite(y[1:]))
+        if candidates.size:
+            y_left, y_right = y[candidates], y[candidates + 1]
+            y_mid = self.evaluate(entry, (x[candidates] + x[candidates + 1]) / 2)
+            jump = np.abs(y_right - y_left)
+            with np.errstate(invalid='ignore'):
+                spread = np.maximum(np.abs(y_mid - y_left), np.abs(y_mid - y_right))
+                is_break = ~np.isfinite(y_mid) | (spread > 0.75 * jump)
+            breaks = candidates[is_break]
+        else:
+            breaks = candidates
+        
+        if breaks.size:
+            x = np.insert(x, breaks + 1, (x[breaks] + x[breaks + 1]) / 2)
+            y = np.insert(y, breaks + 1, np.nan)
         
-        self.cache[key] = value
-        self.access_order.append(key)
+        self.stats['samples'] += 1
+        return x, y
+    
+    def lttb(self, x, y, budget):
+        """Largest-Triangle-Three-Buckets sur une série sans valeurs manquantes"""
+        import numpy as np
+        
+        n = x.size
+        if budget >= n:
+            return x, y
+        if budget < 3:
+            keep = [0, n - 1][:max(budget, 1)]
+            return x[keep], y[keep]
+        
+        edges = np.linspace(1, n - 1, budget - 1).astype(int)
+        selected = np.empty(budget, dtype=int)
+        selected[0], selected[-1] = 0, n - 1
+        previous = 0
+        
+        for i in range(budget - 2):
+            start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+            next_start, next_end = end, max(edges[i + 2] if i + 2 < edges.size else n, end + 1)
+            
+            # Sommet moyen du seau suivant
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+            
+            area = np.abs(
+                (x[previous] - avg_x) * (y[start:end] - y[previous])
+                - (x[previous] - x[start:end]) * (avg_y - y[previous])
+            )
+            previous = start + int(np.argmax(area))
+            selected[i + 1] = previous
+        
+        return x[selected], y[selected]
+    
+    def downsample(self, x, y, budget):
+        """Réduit la série à `budget` points par LTTB, segment par segment (coupures NaN conservées)"""
+        import numpy as np
+        
+        finite = np.isfinite(y)
+        if x.size <= budget:
+            return x, y
+        
+        # Découpage en segments continus
+        boundaries = np.flatnonzero(np.diff(finite.astype(int)) != 0) + 1
+        segments = [
+            (x[a:b], y[a:b])
+            for a, b in zip(np.concatenate([[0], boundaries]), np.concatenate([boundaries, [x.size]]))
+            if finite[a]
+        ]
+        if not segments:
+            return x[:0], y[:0]
+        
+        # Chaque segment coûte au moins 2 points plus une coupure: on garde les plus longs qui tiennent
+        max_segments = max(1, (budget + 1) // 3)
+        if len(segments) > max_segments:
+            longest = sorted(range(len(segments)), key=lambda i: segments[i][0].size, reverse=True)
+            segments = [segments[i] for i in sorted(longest[:max_segments])]
+        
+        available = budget - (len(segments) - 1)
+        spare = available - 2 * len(segments)
+        total = sum(seg_x.size for seg_x, _ in segments)
+        
+        out_x, out_y = [], []
+        for index, (seg_x, seg_y) in enumerate(segments):
+            if index:
+                out_x.append([(out_x[-1][-1] + seg_x[0]) / 2])
+                out_y.append([np.nan])
+            share = 2 + spare * seg_x.size // total
+            reduced_x, reduced_y = self.lttb(seg_x, seg_y, share)
+            out_x.append(reduced_x)
+            out_y.append(reduced_y)
+        
+        return np.concatenate(out_x), np.concatenate(out_y)
+    
+    def data(self, expression, xmin, xmax, budget):
+        """Données de tracé compactes (float32 base64) pour un rendu côté client"""
+        entry = self.compile_function(expression)
+        cache_key = ('data', entry['normalized'], xmin, xmax, budget)
+        
+        cached = self.cache.get(cache_key)
+        if cached:
+            self.stats['render_cache_hits'] += 1
+            return cached
+        
+        import base64
+        import numpy as np
+        
+        x, y = self.sample(expression, xmin, xmax)
+        sampled = x.size
+        x, y = self.downsample(x, y, budget)
+        
+        base = self.evaluate(entry, np.linspace(xmin, xmax, Config.PLOT_BASE_POINTS))
+        finite = base[np.isfinite(base)]
+        y_range = [float(v) for v in np.percentile(finite, [3, 97])] if finite.size else None
+        
+        payload = {
+            'success': True,
+            'expression': entry['normalized'],
+            'xmin': xmin,
+            'xmax': xmax,
+            'points': int(x.size),
+            'sampled_points': int(sampled),
+            'y_range': y_range,
+            'dtype': 'float32',
+            'byte_order': 'little',
+            'encoding': 'base64',
+            'x': base64.b64encode(x.astype('<f4').tobytes()).decode('ascii'),
+            'y': base64.b64encode(y.astype('<f4').tobytes()).decode('ascii')
+        }
+        
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        result = {
+            'content': body,
+            'mimetype': 'application/json',
+            'etag': hashlib.md5(body).hexdigest()
+        }
+        
+        self.cache.set(cache_key, result)
+        return result
+    
+    def render(self, expression, xmin, xmax, width, height, fmt='png'):
+        """Rend le graphe (cache par expression, domaine, taille et format)"""
+        entry = self.compile_function(expression)
+        cache_key = (entry['normalized'], xmin, xmax, width, height, fmt)
+        
+        cached = self.cache.get(cache_key)
+        if cached:
+            self.stats['render_cache_hits'] += 1
+            return cached
+        
+        import io
+        import numpy as np
+        try:
+            import matplotlib
+            matplotlib.use('Agg')
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+        except ImportError:
+            logger.error("❌ Module matplotlib non installé: pip install matplotlib")
+            raise RuntimeError("Module matplotlib manquant. Installez-le avec: pip install matplotlib")
+        
+        x, y = self.sample(expression, xmin, xmax)
+        
+        dpi = 100
+        figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot(1, 1, 1)
+        axes.plot(x, y, color='#667eea', linewidth=2)
+        axes.axhline(0, color='#8b8d97', linewidth=0.8)
+        if xmin < 0 < xmax:
+            axes.axvline(0, color='#8b8d97', linewidth=0.8)
+        axes.set_xlim(xmin, xmax)
+        axes.grid(True, alpha=0.3)
+        axes.set_title(f"y = {entry['normalized']}", fontsize=10)
+        
+        # Vue robuste sur la grille uniforme: les asymptotes n'écrasent pas le reste de la courbe
+        base = self.evaluate(entry, np.linspace(xmin, xmax, Config.PLOT_BASE_POINTS))
+        finite = base[np.isfinite(base)]
+        if finite.size:
+            low, high = np.percentile(finite, [3, 97])
+            margin = (high - low) * 0.15 or 1.0
+            axes.set_ylim(low - margin, high + margin)
+        
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format=fmt, bbox_inches='tight')
+        content = buffer.getvalue()
+        
+        rendered = {
+            'content': content,
+            'mimetype': self.FORMATS[fmt],
+            'etag': hashlib.md5(content).hexdigest()
+        }
+        
+        self.cache.set(cache_key, rendered)
+        self.stats['renders'] += 1
+        return rendered
     
     def size(self):
-        return len(self.cache)
+        return self.cache.size()
+
+# Bibliothèque de concepts précompilée (fichier binaire mappé en mémoire)
+class ConceptLibrary:
+    """Store binaire versionné d'explications pré-générées, lu via mmap
+    
+    Format (little-endian):
+        en-tête  : magic (8o), version (H), réservé (H), nombre d'entrées (I),
+                   date de build (Q), empreinte du prompt (32o hex)
+        index    : entrées triées par clé (16o md5, offset Q, longueur I)
+        données  : résultats JSON encodés en UTF-8
+    
+    L'index est parcouru par recherche dichotomique directement dans la
+    projection mémoire: seul l'enregistrement trouvé est copié et décodé.
+    Toutes les instances gunicorn partagent les mêmes pages via le cache système.
+    """
+    
+    MAGIC = b'MATHLIB\x00'
+    HEADER = struct.Struct('<8sHHIQ32s')
+    RECORD = struct.Struct('<16sQI')
+    
+    def __init__(self, path, handle, buffer, count, built_at, fingerprint):
+        self.path = path
+        self.handle = handle
+        self.buffer = buffer
+        self.count = count
+        self.built_at = built_at
+        self.fingerprint = fingerprint
+        self.hits = 0
+    
+    @classmethod
+    def load(cls, path, fingerprint):
+        """Ouvre et valide le store; retourne None s'il est absent, invalide ou périmé"""
+        if not path or not os.path.exists(path):
+            return None
+        
+        handle = buffer = library = None
+        try:
+            handle = open(path, 'rb')
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            
+            if len(buffer) < cls.HEADER.size:
+                logger.warning(f"⚠️ Bibliothèque de concepts tronquée: {path}")
+                return None
+            
+            magic, version, _, count, built_at, stored_fingerprint = cls.HEADER.unpack_from(buffer, 0)
+            
+            if magic != cls.MAGIC or version != Config.LIBRARY_FORMAT_VERSION:
+                logger.warning(f"⚠️ Format de bibliothèque non supporté (version {version}): {path}")
+                return None
+            
+            if cls.HEADER.size + count * cls.RECORD.size > len(buffer):
+                logger.warning(f"⚠️ Bibliothèque de concepts corrompue ({count} entrées annoncées): {path}")
+                return None
+            
+            if stored_fingerprint.decode('ascii') != fingerprint:
+                logger.warning("⚠️ Bibliothèque de concepts périmée (prompt ou modèle modifié) - ignorée")
+                return None
+            
+            logger.info(f"📚 Bibliothèque de concepts chargée: {count} entrées ({len(buffer) // 1024} Ko, mmap)")
+            library = cls(path, handle, buffer, count, built_at, fingerprint)
+            return library
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Bibliothèque de concepts illisible ({path}): {e}")
+            return None
+        finally:
+            # Le fichier et le mmap ne restent ouverts que si la bibliothèque est retenue
+            if library is None:
+                if buffer is not None:
+                    buffer.close()
+                if handle is not None:
+                    handle.close()
+    
+    @classmethod
+    def write(cls, path, entries, fingerprint):
+        """Écrit le store de façon atomique (les workers en cours gardent l'ancien fichier)"""
+        items = sorted((bytes.fromhex(key), json.dumps(value, ensure_ascii=False).encode('utf-8'))
+                       for key, value in entries.items())
+        
+        data_offset = cls.HEADER.size + cls.RECORD.size * len(items)
+        index = bytearray()
+        offset = data_offset
+        for key, payload in items:
+            index += cls.RECORD.pack(key, offset, len(payload))
+            offset += len(payload)
+        
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, Config.LIBRARY_FORMAT_VERSION, 0, len(items),
+                                    int(time.time()), fingerprint.encode('ascii')))
+            f.write(index)
+            for _, payload in items:
+                f.write(payload)
+        os.replace(tmp_path, path)
+        return offset
+    
+    def find(self, cache_key):
+        """Recherche dichotomique dans l'index mappé: (offset, longueur) ou None"""
+        target = bytes.fromhex(cache_key)
+        low, high = 0, self.count - 1
+        
+        while low <= high:
+            middle = (low + high) // 2
+            key, offset, length = self.RECORD.unpack_from(self.buffer, self.HEADER.size + middle * self.RECORD.size)
+            if key == target:
+                return offset, length
+            if key < target:
+                low = middle + 1
+            else:
+                high = middle - 1
+        
+        return None
+    
+    def contains(self, cache_key):
+        return self.find(cache_key) is not None
+    
+    def get(self, cache_key):
+        """Décode uniquement l'enregistrement trouvé"""
+        location = self.find(cache_key)
+        if location is None:
+            return None
+        
+        offset, length = location
+        self.hits += 1
+        return json.loads(self.buffer[offset:offset + length])
+    
+    def info(self):
+        return {
+            'path': self.path,
+            'entries': self.count,
+            'size_bytes': len(self.buffer),
+            'built_at': datetime.fromtimestamp(self.built_at).isoformat(),
+            'hits': self.hits
+        }
+
+# Préchargement des concepts liés
+class ConceptPrefetcher:
+    """Génère en arrière-plan les CONCEPTS LIÉS des réponses fraîches
+    
+    File à faible priorité, traitée uniquement quand des clés sont inoccupées
+    et sans rate limit récent, dans la limite d'un budget horaire.
+    """
+    
+    def __init__(self, explorer):
+        self.explorer = explorer
+        self.enabled = Config.PREFETCH_ENABLED
+        self.queue = []
+        self.queued_keys = set()
+        self.prefetched_keys = {}
+        self.recent_runs = deque()
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.stats = {
+            'queued': 0,
+            'prefetched': 0,
+            'prefetch_hits': 0,
+            'skipped_budget': 0,
+            'rewarmed': 0,
+            'dropped': 0,
+            'errors': 0
+        }
+    
+    def extract_related(self, entry):
+        """Liste des concepts liés à partir de la section CONCEPTS LIÉS"""
+        section = entry.get('sections', {}).get('concepts_lies')
+        if not section:
+            return []
+        
+        concepts = []
+        for item in re.findall(r'<li>(.*?)</li>', section['html'], re.S):
+            strong = re.search(r'<strong>(.*?)</strong>', item, re.S)
+            text = strong.group(1) if strong else re.split(r'\s[:–—-]\s|:|\(', item)[0]
+            name = html_unescape(re.sub(r'<[^>]+>', '', text)).strip(' .,;:')
+            if Config.MIN_CONCEPT_LENGTH <= len(name) <= 60 and name not in concepts:
+                concepts.append(name)
+        
+        return concepts[:Config.PREFETCH_MAX_RELATED]
+    
+    def enqueue_related(self, entry, language, detail_level):
+        """Met en file les concepts liés d'une réponse fraîche"""
+        if not self.enabled:
+            return
+        
+        for rank, concept in enumerate(self.extract_related(entry)):
+            cache_key = self.explorer.get_cache_key(concept, language, detail_level)
+            if self.explorer.is_cached(cache_key):
+                continue
+            
+            with self.lock:
+                if cache_key in self.queued_keys or cache_key in self.prefetched_keys:
+                    continue
+                if len(self.queue) >= Config.PREFETCH_QUEUE_SIZE:
+                    self.stats['dropped'] += 1
+                    continue
+                
+                self.sequence += 1
+                heapq.heappush(self.queue, (self.priority(cache_key, rank), self.sequence, concept, language, detail_level, cache_key))
+                self.queued_keys.add(cache_key)
+                self.stats['queued'] += 1
+        
+        self.start()
+        self.wakeup.set()
+    
+    def enqueue_hot(self):
+        """Remet en file les entrées populaires évincées du cache"""
+        for cache_key, label, count in self.explorer.popularity.most_common(Config.PREFETCH_QUEUE_SIZE):
+            if count < Config.POPULARITY_HOT_THRESHOLD:
+                break
+            if self.explorer.is_cached(cache_key):
+                continue
+            
+            with self.lock:
+                if cache_key in self.queued_keys or len(self.queue) >= Config.PREFETCH_QUEUE_SIZE:
+                    continue
+                
+                self.sequence += 1
+                heapq.heappush(self.queue, (self.priority(cache_key, 0), self.sequence, label['concept'],
+                                            label['language'], label['detail_level'], cache_key))
+                self.queued_keys.add(cache_key)
+                self.stats['rewarmed'] += 1
+    
+    def priority(self, cache_key, rank):
+        """Priorité dans la file (plus petit = plus tôt): rang pondéré par la popularité"""
+        return rank / (1 + self.explorer.popularity.estimate(cache_key))
+    
+    def has_spare_capacity(self):
+        """Au moins une clé libre et pas de rate limit récent"""
+        recently_limited = time.time() - self.explorer.last_rate_limit < Config.PREFETCH_RATE_LIMIT_COOLDOWN
+        return not recently_limited and self.explorer.inflight_calls < len(self.explorer.api_keys) - 1
+    
+    def within_budget(self):
+        """Budget horaire de préchargements"""
+        now = time.time()
+        while self.recent_runs and now - self.recent_runs[0] > 3600:
+            self.recent_runs.popleft()
+        return len(self.recent_runs) < Config.PREFETCH_MAX_PER_HOUR
+    
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.run, name='mathia-prefetch', daemon=True)
+            self.thread.start()
+    
+    def run(self):
+        while True:
+            self.wakeup.wait(timeout=Config.PREFETCH_IDLE_DELAY)
+            self.wakeup.clear()
+            
+            if not self.queue and self.has_spare_capacity() and self.within_budget():
+                self.enqueue_hot()
+            
+            while self.queue and self.has_spare_capacity():
+                if not self.within_budget():
+                    self.stats['skipped_budget'] += 1
+                    break
+                
+                with self.lock:
+                    _, _, concept, language, detail_level, cache_key = heapq.heappop(self.queue)
+                    self.queued_keys.discard(cache_key)
+                
+                if self.explorer.is_cached(cache_key):
+                    continue
+                
+                self.recent_runs.append(time.time())
+                result = self.explorer.process_concept(concept, language, detail_level, prefetch=True)
+                
+                if result.get('success'):
+                    with self.lock:
+                        self.prefetched_keys[cache_key] = time.time()
+                        while len(self.prefetched_keys) > Config.CACHE_MAX_SIZE:
+                            self.prefetched_keys.pop(next(iter(self.prefetched_keys)))
+                    self.stats['prefetched'] += 1
+                    logger.info(f"🔮 Préchargé: '{concept}' ({language}, {detail_level})")
+                else:
+                    self.stats['errors'] += 1
+    
+    def record_hit(self, cache_key):
+        """Compte un hit utilisateur sur une entrée préchargée (une seule fois)"""
+        with self.lock:
+            if self.prefetched_keys.pop(cache_key, None) is not None:
+                self.stats['prefetch_hits'] += 1
+    
+    def get_stats(self):
+        stats = self.stats.copy()
+        stats['enabled'] = self.enabled
+        stats['queue_size'] = len(self.queue)
+        stats['hit_ratio'] = round(stats['prefetch_hits'] / stats['prefetched'], 3) if stats['prefetched'] else 0
+        stats['budget_used_last_hour'] = len(self.recent_runs)
+        stats['budget_per_hour'] = Config.PREFETCH_MAX_PER_HOUR
+        return stats
 
 class MathiaExplorer:
     """Explorateur mathématique avec IA Mistral (Production)"""
     
+    # Sections demandées par build_prompt (identifiant, titres reconnus sans accents)
+    SECTIONS = [
+        ('definition', ['DEFINITION', 'DEFINICION']),
+        ('explication', ['EXPLICATION DETAILLEE', 'DETAILED EXPLANATION', 'EXPLICACION DETALLADA',
+                         'EXPLICATION', 'EXPLANATION', 'EXPLICACION']),
+        ('exemples', ['EXEMPLES CONCRETS', 'CONCRETE EXAMPLES', 'EJEMPLOS CONCRETOS',
+                      'EXEMPLES', 'EXAMPLES', 'EJEMPLOS']),
+        ('concepts_lies', ['CONCEPTS LIES', 'CONCEPTS CONNEXES', 'RELATED CONCEPTS', 'CONCEPTOS RELACIONADOS']),
+        ('importance', ['IMPORTANCE', 'IMPORTANCIA']),
+        ('conseil', ["CONSEIL D'APPRENTISSAGE", 'LEARNING TIP', 'STUDY TIP', 'CONSEJO DE APRENDIZAJE',
+                     'CONSEIL', 'CONSEJO', 'TIP'])
+    ]
+    SECTION_IDS = [section_id for section_id, _ in SECTIONS]
+    
+    # Version courte servie depuis une version détaillée
+    SHORT_SECTIONS = ['definition', 'explication', 'exemples', 'concepts_lies', 'conseil']
+    SHORT_TRIMMED_SECTIONS = ['explication', 'exemples']
+    
+    # Sections complétées lors du passage à un niveau plus détaillé
+    UPGRADE_SECTIONS = ['explication', 'exemples', 'importance']
+    
+    # Champs propres à une réponse, jamais conservés dans une entrée de cache ou de bibliothèque
+    VOLATILE_KEYS = ('from_cache', 'from_library', 'processing_time', 'cache_size', 'explanation',
+                     'available_sections', 'usage')
+    
     def __init__(self):
         self.api_keys = Config.API_KEYS
-        self.current_key_index = 0
-        self.cache = LRUCache(max_size=Config.CACHE_MAX_SIZE)
-        
-        # Statistiques par clé
-        self.key_stats = {i: {'used': 0, 'errors': 0, 'rate_limits': 0} 
-                          for i in range(len(self.api_keys))}
+        self.cache = CompressedCache(make_cache(Config.CACHE_POLICY, Config.CACHE_MAX_SIZE),
+                                     CacheCodec(self.get_codec_seed()))
+        self.responses = ResponseCache(max_size=Config.RESPONSE_CACHE_SIZE, max_age=Config.RESPONSE_MAX_AGE)
+        self.jobs = JobQueue(workers=Config.JOB_WORKERS, max_pending=Config.JOB_MAX_PENDING,
+                             retention=Config.JOB_RETENTION, name='mathia-job')
+        self.calculator = ExpressionEngine(
+            max_size=Config.EXPRESSION_CACHE_SIZE,
+            timeout=Config.SYMBOLIC_TIMEOUT,
+            workers=Config.SYMBOLIC_WORKERS
+        )
+        self.plotter = FunctionPlotter(self.calculator, max_size=Config.PLOT_CACHE_SIZE)
+        self.canonicalizer = ConceptCanonicalizer(LIBRARY_CONCEPTS, CONCEPT_ALIASES)
+        self.library = ConceptLibrary.load(Config.LIBRARY_PATH, self.get_library_fingerprint())
+        self.popularity = PopularityTracker(
+            width=Config.POPULARITY_WIDTH,
+            depth=Config.POPULARITY_DEPTH,
+            top_k=Config.POPULARITY_TOP_K,
+            window=Config.POPULARITY_WINDOW
+        )
+        self.prefetcher = ConceptPrefetcher(self)
+        
+        # Autocomplétion par langue, limitée aux noms canoniques de la bibliothèque (jamais la saisie brute)
+        self.suggestions = {language: PrefixTrie(top_k=Config.SUGGEST_MAX_RESULTS) for language in Config.LIBRARY_LANGUAGES}
+        self.canonical_titles = {}
+        for names in LIBRARY_CONCEPTS:
+            self.canonical_titles[self.canonicalizer.normalize(names[1])] = dict(zip(Config.LIBRARY_LANGUAGES, names))
+            for language, name in zip(Config.LIBRARY_LANGUAGES, names):
+                self.suggestions[language].add(name)
+        
+        # Charge courante (appels LLM en cours, dernier rate limit) et admission
+        self.limiter = ConcurrencyLimiter(max_concurrent=Config.LLM_MAX_CONCURRENT, max_queue=Config.LLM_MAX_QUEUE)
+        self.hedging = HedgePolicy(enabled=Config.HEDGE_ENABLED, percentile=Config.HEDGE_PERCENTILE,
+                                   budget=Config.HEDGE_BUDGET, max_workers=2 * Config.LLM_MAX_CONCURRENT,
+                                   limiter=self.limiter)
+        self.router = ModelRouter(Config.ROUTING_RULES, Config.MISTRAL_MODEL_PRIMARY, Config.MISTRAL_MODEL_FALLBACK,
+                                  small_input_chars=Config.ROUTING_SMALL_INPUT, min_headroom=Config.ROUTING_MIN_HEADROOM)
+        if Config.ROUTING_OVERRIDES:
+            self.router.update_rules(json.loads(Config.ROUTING_OVERRIDES))
+        self.token_usage = UsageMeter(prices=Config.MODEL_PRICES)
+        self.inflight_calls = 0
+        self.inflight_lock = threading.Lock()
+        self.last_rate_limit = 0
+        
+        # Limites de concurrence et statistiques par clé
+        self.key_pool = KeyPool(len(self.api_keys), initial=Config.KEY_INITIAL_LIMIT, minimum=Config.KEY_MIN_LIMIT,
+                                maximum=Config.KEY_MAX_LIMIT, decrease=Config.KEY_DECREASE_FACTOR)
         
         self.stats = {
             'requests': 0,
             'cache_hits': 0,
+            'library_hits': 0,
+            'derived_entries': 0,
+            'section_requests': 0,
+            'upgrades': 0,
+            'admission_rejected': 0,
+            'shed': 0,
+            'degraded': 0,
             'concepts_explored': 0,
             'errors': 0,
             'avg_processing_time': 0,
@@ -135,100 +1448,173 @@ class MathiaExplorer:
         }
         self.processing_times = []
         
+        # Réchauffage du cache depuis l'instantané précédent (sans bloquer le démarrage)
+        self.snapshot = CacheSnapshot(Config.SNAPSHOT_PATH, self.get_library_fingerprint(),
+                                      self.snapshot_entries, self.restore_entry, max_age=Config.SNAPSHOT_MAX_AGE,
+                                      name='mathia-snapshot', log=logger.info)
+        if Config.SNAPSHOT_ENABLED:
+            self.snapshot.install_handlers()
+            self.snapshot.start(Config.SNAPSHOT_LOAD_BUDGET, Config.SNAPSHOT_INTERVAL)
+        
         logger.info("✅ Mathia Explorer initialisé en mode PRODUCTION")
     
-    def get_next_key_index(self):
-        """Rotation intelligente des clés"""
-        index = self.current_key_index % len(self.api_keys)
-        self.current_key_index += 1
-        return index
+    def is_rate_limited(self, error):
+        """429, quota ou capacité dépassée: signal de congestion de la clé"""
+        error_msg = str(error).lower()
+        return "429" in error_msg or "rate" in error_msg or "quota" in error_msg or "capacity" in error_msg
+    
+    def complete_with_key(self, key_index, model, prompt, max_tokens=None, usage=None):
+        """Un appel Mistral sur une clé réservée; son issue ajuste la limite AIMD de la clé
+        
+        usage: compteur de la requête (UsageMeter.start) auquel ajouter les tokens consommés.
+        """
+        from mistralai import Mistral
+        
+        outcome = 'error'
+        start = time.time()
+        try:
+            client = Mistral(api_key=self.api_keys[key_index])
+            response = client.chat.complete(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=Config.MISTRAL_TEMPERATURE,
+                max_tokens=max_tokens or Config.MISTRAL_MAX_TOKENS
+            )
+            outcome = 'success'
+            self.hedging.observe(time.time() - start)
+            self.router.observe(model, time.time() - start)
+            self.token_usage.record(usage, key_index, model, response)
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            if self.is_rate_limited(e):
+                outcome = 'rate_limited'
+            raise
+        finally:
+            self.key_pool.release(key_index, outcome)
     
-    def call_mistral_with_retry(self, prompt):
-        """Appelle Mistral avec rotation automatique des clés"""
+    def call_mistral_with_retry(self, prompt, max_tokens=None, deadline=None, model=None, usage=None, queue=True):
+        """Appelle Mistral sur les clés, réparties selon leur capacité apprise (AIMD)
+        
+        model: choisi en amont par le routeur (modèle principal par défaut).
+        usage: compteur de tokens de la requête (UsageMeter.start).
+        deadline (timestamp) borne l'attente d'une place et les nouvelles
+        tentatives; GatewayOverloaded est levée si elle ne peut être tenue.
+        queue=False (préchargement): place libre immédiate ou GatewayOverloaded.
+        """
         try:
             from mistralai import Mistral
         except ImportError:
             logger.error("❌ Module mistralai non installé: pip install mistralai")
             raise RuntimeError("Module mistralai manquant. Installez-le avec: pip install mistralai")
         
-        last_exception = None
-        keys_tried = []
+        deadline = deadline or time.time() + Config.LLM_DEADLINE
+        model = model or Config.MISTRAL_MODEL_PRIMARY
+        self.limiter.acquire(deadline, queue=queue)
         
-        # Essayer toutes les clés disponibles
-        for attempt in range(len(self.api_keys) * Config.MAX_RETRIES_PER_KEY):
-            key_index = self.get_next_key_index()
-            api_key = self.api_keys[key_index]
-            
-            # Éviter de réessayer immédiatement la même clé
-            if len(keys_tried) > 0 and keys_tried[-1] == key_index:
-                continue
-            
-            keys_tried.append(key_index)
+        # Appels en cours: le préchargement n'utilise que la capacité inoccupée
+        with self.inflight_lock:
+            self.inflight_calls += 1
+        
+        call_start = time.time()
+        duration = None
+        try:
+            last_exception = None
+            keys_tried = []
             
-            try:
-                client = Mistral(api_key=api_key)
-                
-                logger.info(f"🔑 Utilisation clé #{key_index + 1} (tentative {attempt + 1})")
-                self.key_stats[key_index]['used'] += 1
-                self.stats['total_api_calls'] += 1
+            # Essayer toutes les clés disponibles
+            for attempt in range(len(self.api_keys) * Config.MAX_RETRIES_PER_KEY):
+                if time.time() >= deadline:
+                    logger.warning(f"⏱️ Échéance atteinte après {len(keys_tried)} tentatives")
+                    raise GatewayOverloaded('délai dépassé', self.limiter.retry_after())
                 
-                # Tentative avec modèle principal
-                response = client.chat.complete(
-                    model=Config.MISTRAL_MODEL_PRIMARY,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=Config.MISTRAL_TEMPERATURE,
-                    max_tokens=Config.MISTRAL_MAX_TOKENS
-                )
-                
-                logger.info(f"✅ Succès avec clé #{key_index + 1}")
-                return response.choices[0].message.content.strip()
-                
-            except Exception as e:
-                error_msg = str(e).lower()
-                last_exception = e
+                # Clé choisie selon sa capacité libre (jamais deux fois de suite la même si possible)
+                key_index = self.key_pool.acquire(avoid=keys_tried[-1] if keys_tried else None)
+                keys_tried.append(key_index)
                 
-                # Rate limit détecté
-                if "429" in error_msg or "rate" in error_msg or "quota" in error_msg:
-                    logger.warning(f"⚠️ Rate limit clé #{key_index + 1} - Passage à la suivante")
-                    self.key_stats[key_index]['rate_limits'] += 1
+                try:
+                    logger.info(f"🔑 Utilisation clé #{key_index + 1} (tentative {attempt + 1})")
+                    self.stats['total_api_calls'] += 1
                     
-                    # Essayer avec le modèle fallback sur une autre clé
-                    next_key_index = self.get_next_key_index()
-                    try:
-                        logger.info(f"🔄 Fallback: clé #{next_key_index + 1} + modèle {Config.MISTRAL_MODEL_FALLBACK}")
-                        fallback_client = Mistral(api_key=self.api_keys[next_key_index])
-                        
-                        response = fallback_client.chat.complete(
-                            model=Config.MISTRAL_MODEL_FALLBACK,
-                            messages=[{"role": "user", "content": prompt}],
-                            temperature=Config.MISTRAL_TEMPERATURE,
-                            max_tokens=Config.MISTRAL_MAX_TOKENS
-                        )
+                    # Tentative avec le modèle routé (doublon sur une autre clé au-delà du p90)
+                    content = self.hedging.call(
+                        lambda: self.complete_with_key(key_index, model, prompt, max_tokens, usage),
+                        lambda: self.complete_with_key(self.key_pool.acquire(avoid=key_index),
+                                                       Config.HEDGE_MODEL or model, prompt, max_tokens, usage)
+                    )
+                    
+                    logger.info(f"✅ Succès avec clé #{key_index + 1}")
+                    duration = time.time() - call_start
+                    return content
+                    
+                except Exception as e:
+                    last_exception = e
+                    
+                    # Rate limit détecté
+                    if self.is_rate_limited(e):
+                        logger.warning(f"⚠️ Rate limit clé #{key_index + 1} - Passage à la suivante")
+                        self.last_rate_limit = time.time()
                         
-                        logger.info(f"✅ Fallback réussi avec clé #{next_key_index + 1}")
-                        return response.choices[0].message.content.strip()
-                    except Exception as fallback_error:
-                        logger.warning(f"❌ Fallback échoué: {fallback_error}")
-                        continue
-                else:
-                    # Autre erreur
-                    logger.error(f"❌ Erreur clé #{key_index + 1}: {e}")
-                    self.key_stats[key_index]['errors'] += 1
-                
-                # Attendre avant le prochain essai
-                if attempt < len(self.api_keys) * Config.MAX_RETRIES_PER_KEY - 1:
-                    time.sleep(Config.RETRY_DELAY)
-        
-        # Toutes les tentatives ont échoué
-        logger.error(f"💥 ÉCHEC TOTAL après {len(keys_tried)} tentatives")
-        logger.error(f"Clés essayées: {[i+1 for i in keys_tried]}")
-        raise RuntimeError(f"Toutes les clés API ont échoué: {last_exception}")
+                        # Essayer avec le modèle fallback sur une autre clé
+                        next_key_index = self.key_pool.acquire(avoid=key_index)
+                        try:
+                            logger.info(f"🔄 Fallback: clé #{next_key_index + 1} + modèle {Config.MISTRAL_MODEL_FALLBACK}")
+                            content = self.complete_with_key(next_key_index, Config.MISTRAL_MODEL_FALLBACK, prompt,
+                                                             max_tokens, usage)
+                            
+                            logger.info(f"✅ Fallback réussi avec clé #{next_key_index + 1}")
+                            duration = time.time() - call_start
+                            return content
+                        except Exception as fallback_error:
+                            logger.warning(f"❌ Fallback échoué: {fallback_error}")
+                            continue
+                    else:
+                        # Autre erreur
+                        logger.error(f"❌ Erreur clé #{key_index + 1}: {e}")
+                    
+                    # Attendre avant le prochain essai (sans dépasser l'échéance)
+                    if attempt < len(self.api_keys) * Config.MAX_RETRIES_PER_KEY - 1:
+                        time.sleep(max(0, min(Config.RETRY_DELAY, deadline - time.time())))
+            
+            # Toutes les tentatives ont échoué
+            logger.error(f"💥 ÉCHEC TOTAL après {len(keys_tried)} tentatives")
+            logger.error(f"Clés essayées: {[i+1 for i in keys_tried]}")
+            raise RuntimeError(f"Toutes les clés API ont échoué: {last_exception}")
+        finally:
+            with self.inflight_lock:
+                self.inflight_calls -= 1
+            self.limiter.release(duration)
     
     def get_cache_key(self, concept, language, detail_level):
-        """Génère une clé de cache unique"""
-        normalized = f"{concept.lower().strip()}_{language}_{detail_level}"
+        """Génère une clé de cache unique (concept canonique: accents, alias, fautes de frappe)"""
+        normalized = f"{self.canonicalizer.canonicalize(concept)}_{language}_{detail_level}"
         return hashlib.md5(normalized.encode()).hexdigest()
     
+    def get_codec_seed(self):
+        """Squelette d'une entrée, dictionnaire initial de la compression du cache"""
+        sections = {
+            section_id: {'title': aliases[0].title(), 'html': '<p>La <strong></strong> est </p>\n<ul>\n<li><strong></strong> : </li>\n</ul>'}
+            for section_id, aliases in self.SECTIONS
+        }
+        return json.dumps({
+            'success': True,
+            'concept': '',
+            'sections': sections,
+            'detail_level': 'moyen',
+            'language': 'fr',
+            'source': 'mistral_ai',
+            'model': Config.MISTRAL_MODEL_PRIMARY
+        }, ensure_ascii=False, separators=(',', ':'))
+    
+    def get_library_fingerprint(self):
+        """Empreinte des prompts et du modèle: invalide la bibliothèque si l'un change"""
+        prompts = [
+            self.build_prompt('{concept}', language, detail_level)
+            for language in Config.LIBRARY_LANGUAGES
+            for detail_level in Config.LIBRARY_DETAIL_LEVELS
+        ]
+        material = '\n'.join(prompts + [Config.MISTRAL_MODEL_PRIMARY, self.canonicalizer.fingerprint])
+        return hashlib.md5(material.encode()).hexdigest()
+    
     def markdown_to_html(self, text):
         """Convertit le Markdown en HTML"""
         if not text:
@@ -303,6 +1689,65 @@ Réponds maintenant:"""
         
         return prompt
     
+    def build_upgrade_prompt(self, concept, language, detail_level, base_entry):
+        """Prompt d'enrichissement: seul le contenu manquant est demandé"""
+        lang_instruction = self.get_language_instruction(language)
+        
+        word_counts = {
+            'moyen': '150-200 mots supplémentaires',
+            'long': '250-350 mots supplémentaires'
+        }
+        word_count = word_counts.get(detail_level, word_counts['long'])
+        
+        existing = html_unescape(re.sub(r'<[^>]+>', '', self.render_sections(base_entry['sections'])))
+        existing = re.sub(r'\n{3,}', '\n\n', existing).strip()
+        
+        prompt = f"""Tu es Mathia, un expert en mathématiques passionné par la vulgarisation.
+
+**Concept:** "{concept}"
+
+{lang_instruction}
+
+**Explication déjà fournie à l'élève:**
+{existing}
+
+**Instructions:**
+L'élève veut plus de détails. Ne répète RIEN de ce qui précède.
+Fournis uniquement le complément (environ {word_count}), structuré ainsi:
+
+1. **EXPLICATION DÉTAILLÉE** (approfondissement: propriétés, justifications, cas particuliers)
+2. **EXEMPLES CONCRETS** (2-3 nouveaux exemples avec calculs détaillés)
+3. **IMPORTANCE** (applications pratiques non mentionnées)
+
+Utilise le markdown pour la mise en forme (titres ##, gras **, italique *, listes).
+
+Réponds maintenant:"""
+        
+        return prompt
+    
+    def find_upgrade_base(self, concept, language, detail_level):
+        """Version moins détaillée déjà en cache, à enrichir plutôt qu'à régénérer"""
+        shorter_levels = {'long': ['moyen', 'court'], 'moyen': ['court']}.get(detail_level, [])
+        
+        for level in shorter_levels:
+            entry, _ = self.lookup_entry(self.get_cache_key(concept, language, level))
+            if entry and not entry.get('derived_from'):
+                return entry
+        return None
+    
+    def merge_sections(self, base_sections, extra_sections):
+        """Ajoute le complément à la suite des sections existantes"""
+        merged = {}
+        for section_id in self.SECTION_IDS:
+            base = base_sections.get(section_id)
+            extra = extra_sections.get(section_id)
+            
+            if base and extra and section_id in self.UPGRADE_SECTIONS:
+                merged[section_id] = {'title': base['title'], 'html': base['html'] + '\n' + extra['html']}
+            elif base or extra:
+                merged[section_id] = base or extra
+        return merged
+    
     def validate_concept(self, concept):
         """Valide le concept d'entrée"""
         if not concept or not isinstance(concept, str):
@@ -321,46 +1766,353 @@ Réponds maintenant:"""
         
         return True, concept
     
-    def process_concept(self, concept, language='fr', detail_level='moyen'):
-        """Traite un concept mathématique"""
-        logger.info(f"🔍 Nouvelle requête: '{concept}' (langue={language}, détail={detail_level})")
-        self.stats['requests'] += 1
-        start_time = time.time()
-        
-        # Validation
-        is_valid, result = self.validate_concept(concept)
-        if not is_valid:
-            self.stats['errors'] += 1
-            logger.error(f"❌ Validation échouée: {result}")
-            return {'success': False, 'error': result}
-        
-        concept = result
+    def fold_text(self, text):
+        """Majuscules sans accents (comparaison des titres de section)"""
+        decomposed = unicodedata.normalize('NFKD', text.replace('’', "'"))
+        return ''.join(c for c in decomposed if not unicodedata.combining(c)).upper().strip()
+    
+    def match_section_heading(self, line):
+        """Reconnaît un titre de section (## Titre, **Titre**, 1. **Titre** : ...)"""
+        stripped = line.strip()
+        if not stripped or len(stripped) > 120:
+            return None
+        
+        inline = re.match(r'^(?:\d+\s*[.)]\s*)?\*\*(?P<head>[^*]+)\*\*\s*:?\s*(?P<rest>.*)$', stripped)
+        if stripped.startswith('#'):
+            head = re.sub(r'^#+\s*(?:\d+\s*[.)]\s*)?', '', stripped)
+            head, rest = re.sub(r'[*_`]', '', head).strip().rstrip(':').strip(), ''
+        elif inline:
+            head, rest = inline.group('head').strip().rstrip(':').strip(), inline.group('rest')
+        else:
+            return None
         
-        # Vérifier le cache
-        cache_key = self.get_cache_key(concept, language, detail_level)
-        cached_result = self.cache.get(cache_key)
+        head = re.sub(r'^[^\w]+', '', head)
+        head = re.sub(r'^\d+\s*[.)]\s*', '', head)
+        folded = self.fold_text(head)
         
-        if cached_result:
-            logger.info("💾 Cache HIT - Réponse instantanée")
+        for section_id, aliases in self.SECTIONS:
+            for alias in aliases:
+                if folded.startswith(alias) and (len(folded) == len(alias) or not folded[len(alias)].isalnum()):
+                    return section_id, head, rest
+        return None
+    
+    def parse_sections(self, text):
+        """Découpe la réponse Markdown en sections structurées (titre + HTML)"""
+        sections = {}
+        preamble = []
+        current = None
+        
+        for line in text.splitlines():
+            heading = self.match_section_heading(line)
+            if heading:
+                section_id, title, rest = heading
+                current = sections.setdefault(section_id, {'title': title, 'lines': []})
+                if rest:
+                    current['lines'].extend([rest, ''])
+            elif current is not None:
+                current['lines'].append(line)
+            elif not line.lstrip().startswith('#'):
+                preamble.append(line)
+        
+        if not sections:
+            # Réponse non structurée: tout le contenu dans une seule section
+            return {'explication': {'title': '', 'html': self.markdown_to_html(text)}}
+        
+        if any(line.strip() for line in preamble):
+            first = next(iter(sections.values()))
+            first['lines'] = preamble + [''] + first['lines']
+        
+        return {
+            section_id: {
+                'title': sections[section_id]['title'],
+                'html': self.markdown_to_html('\n'.join(sections[section_id]['lines']).strip())
+            }
+            for section_id, _ in self.SECTIONS if section_id in sections
+        }
+    
+    def render_sections(self, sections, section_ids=None):
+        """Assemble le HTML d'une sélection de sections"""
+        parts = []
+        for section_id, section in sections.items():
+            if section_ids is not None and section_id not in section_ids:
+                continue
+            if section['title']:
+                parts.append(f"<h2>{html_escape(section['title'])}</h2>")
+            parts.append(section['html'])
+        return '\n'.join(parts)
+    
+    def first_block(self, html):
+        """Premier bloc HTML (paragraphe, liste...) d'une section"""
+        match = re.match(r'\s*(<(p|ul|ol|table|blockquote|div)\b.*?</\2>)', html, re.S)
+        return match.group(1) if match else html
+    
+    def derive_short_entry(self, entry):
+        """Construit une entrée 'court' à partir des sections d'une entrée plus détaillée"""
+        sections = {}
+        for section_id in self.SHORT_SECTIONS:
+            if section_id not in entry['sections']:
+                continue
+            section = dict(entry['sections'][section_id])
+            if section_id in self.SHORT_TRIMMED_SECTIONS:
+                section['html'] = self.first_block(section['html'])
+            sections[section_id] = section
+        
+        derived = {key: value for key, value in entry.items() if key not in ('from_cache', 'from_library', 'processing_time')}
+        derived['sections'] = sections
+        derived['detail_level'] = 'court'
+        derived['derived_from'] = entry['detail_level']
+        return derived
+    
+    def present(self, entry, start_time, from_cache):
+        """Réponse API à partir d'une entrée de cache (HTML complet assemblé à la demande)"""
+        result = {key: value for key, value in entry.items() if key not in self.VOLATILE_KEYS}
+        result['explanation'] = self.render_sections(entry['sections'])
+        result['available_sections'] = list(entry['sections'].keys())
+        result['from_cache'] = from_cache
+        result['processing_time'] = round(time.time() - start_time, 2)
+        return result
+    
+    def select_sections(self, result, section_ids):
+        """Restreint une réponse aux sections demandées (le reste est chargé à la demande)"""
+        selected = dict(result)
+        selected.pop('explanation', None)
+        selected['sections'] = {
+            section_id: section for section_id, section in result['sections'].items()
+            if section_id in section_ids
+        }
+        selected['pending_sections'] = [
+            section_id for section_id in result['available_sections'] if section_id not in section_ids
+        ]
+        return selected
+    
+    def lookup_entry(self, cache_key):
+        """Cherche une entrée dans la bibliothèque puis dans le cache LRU"""
+        if self.library:
+            entry = self.library.get(cache_key)
+            if entry:
+                return entry, 'library'
+        
+        entry = self.cache.get(cache_key)
+        if entry:
+            return entry, 'cache'
+        
+        return None, None
+    
+    def response_key(self, concept, language, detail_level, section_ids=None):
+        """Clé de la réponse pré-sérialisée (None si le concept est invalide)"""
+        is_valid, concept = self.validate_concept(concept)
+        if not is_valid:
+            return None
+        cache_key = self.get_cache_key(concept, language, detail_level)
+        return f"{cache_key}|{','.join(section_ids)}" if section_ids is not None else cache_key
+    
+    def record_suggestion(self, concept, language):
+        """Renforce le nom canonique (bibliothèque) d'un concept servi; les autres saisies ne sont pas indexées"""
+        titles = self.canonical_titles.get(self.canonicalizer.canonicalize(concept))
+        if titles:
+            self.suggestions[language].add(titles[language])
+    
+    def touch_entry(self, response_key, concept, language, detail_level):
+        """Comptabilise un hit servi depuis une réponse pré-sérialisée
+        
+        Retourne False si l'entrée d'origine n'est plus disponible (la réponse
+        pré-sérialisée doit alors être régénérée).
+        """
+        cache_key = response_key.split('|')[0]
+        if self.library and self.library.contains(cache_key):
+            self.stats['library_hits'] += 1
+        elif self.cache.backend.get(cache_key) is not None:
             self.stats['cache_hits'] += 1
-            cached_result['from_cache'] = True
-            cached_result['processing_time'] = round(time.time() - start_time, 2)
-            return cached_result
+            self.prefetcher.record_hit(cache_key)
+        else:
+            return False
+        
+        self.stats['requests'] += 1
+        self.popularity.record(cache_key, {'concept': concept.strip(), 'language': language, 'detail_level': detail_level})
+        return True
+    
+    def is_cached(self, cache_key):
+        """Entrée disponible sans appel LLM (ne modifie pas l'ordre LRU)"""
+        return self.cache.peek(cache_key) or bool(self.library and self.library.contains(cache_key))
+    
+    def snapshot_entries(self):
+        """Entrées à sauvegarder: les plus populaires, puis les plus récentes du cache"""
+        counts = {key: (label, count) for key, label, count in self.popularity.most_common(Config.POPULARITY_TOP_K)}
+        cached = self.cache.items()
+        ordered = sorted(cached, key=lambda item: -counts.get(item[0], (None, 0))[1])
+        
+        items = []
+        for cache_key, entry in ordered[:Config.SNAPSHOT_MAX_ENTRIES]:
+            label, count = counts.get(cache_key, (None, 0))
+            items.append({'key': cache_key, 'label': label, 'count': count, 'entry': entry})
+        return items
+    
+    def restore_entry(self, item):
+        """Remet une entrée de l'instantané en cache (sans écraser une entrée plus récente)"""
+        cache_key = item.get('key')
+        entry = item.get('entry')
+        if not cache_key or not isinstance(entry, dict) or 'sections' not in entry:
+            return False
+        if self.is_cached(cache_key):
+            return False
+        
+        if item.get('label') and item.get('count'):
+            self.popularity.record(cache_key, item['label'], weight=item['count'])
+        return self.store_entry(cache_key, entry)
+    
+    def store_entry(self, cache_key, entry, paid=False):
+        """Met en cache sauf si l'entrée évincée est plus populaire que la nouvelle
+        
+        Une réponse Mistral demandée par un utilisateur (paid=True) est toujours admise: la
+        refuser obligerait get_sections à la repayer. Le filtre de popularité ne s'applique
+        qu'aux entrées dérivées, restaurées ou préchargées. Avec TinyLFU, victim() est None:
+        le cache applique sa propre admission (la nouvelle entrée entre d'abord dans la fenêtre).
+        """
+        victim = None if paid else self.cache.victim()
+        if victim and victim != cache_key and not self.cache.peek(cache_key):
+            if self.popularity.estimate(cache_key) < self.popularity.estimate(victim):
+                self.stats['admission_rejected'] += 1
+                logger.info("🚪 Admission refusée: l'entrée évincée est plus populaire")
+                return False
+        
+        self.cache.set(cache_key, entry)
+        return True
+    
+    def find_fallback_entry(self, concept, language, detail_level):
+        """Niveau de détail le plus proche déjà disponible (réponse dégradée sous surcharge)"""
+        for level in {'court': ('moyen', 'long'), 'moyen': ('long', 'court'), 'long': ('moyen', 'court')}[detail_level]:
+            entry, _ = self.lookup_entry(self.get_cache_key(concept, language, level))
+            if entry:
+                return entry
+        return None
+    
+    def get_sections(self, concept, language, detail_level, section_ids):
+        """Sections restantes d'une explication déjà affichée (lues dans le cache, sans appel LLM)"""
+        is_valid, result = self.validate_concept(concept)
+        if not is_valid:
+            return {'success': False, 'error': result}
+        
+        entry, _ = self.lookup_entry(self.get_cache_key(result, language, detail_level))
+        if not entry:
+            # Entrée évincée entre-temps: traitement complet
+            entry = self.process_concept(result, language, detail_level)
+            if not entry.get('success'):
+                return entry
+        
+        self.stats['section_requests'] += 1
+        return {
+            'success': True,
+            'concept': entry['concept'],
+            'sections': {
+                section_id: section for section_id, section in entry['sections'].items()
+                if section_id in section_ids
+            }
+        }
+    
+    def process_concept(self, concept, language='fr', detail_level='moyen', prefetch=False):
+        """Traite un concept mathématique (prefetch=True: génération d'arrière-plan)"""
+        logger.info(f"🔍 Nouvelle requête: '{concept}' (langue={language}, détail={detail_level})")
+        if not prefetch:
+            self.stats['requests'] += 1
+        start_time = time.time()
+        
+        # Validation
+        is_valid, result = self.validate_concept(concept)
+        if not is_valid:
+            self.stats['errors'] += 1
+            logger.error(f"❌ Validation échouée: {result}")
+            return {'success': False, 'error': result}
+        
+        concept = result
+        
+        cache_key = self.get_cache_key(concept, language, detail_level)
+        if not prefetch:
+            self.popularity.record(cache_key, {'concept': concept, 'language': language, 'detail_level': detail_level})
+        
+        # Bibliothèque précompilée (mmap, partagée entre workers) puis cache LRU
+        entry, origin = self.lookup_entry(cache_key)
+        
+        if entry and not prefetch:
+            self.record_suggestion(concept, language)
+        
+        if entry and origin == 'library':
+            logger.info("📚 Bibliothèque HIT - Réponse instantanée")
+            self.stats['library_hits'] += 1
+            result = self.present(entry, start_time, from_cache=True)
+            result['from_library'] = True
+            return result
+        
+        if entry:
+            logger.info("💾 Cache HIT - Réponse instantanée")
+            if not prefetch:
+                self.stats['cache_hits'] += 1
+                self.prefetcher.record_hit(cache_key)
+            return self.present(entry, start_time, from_cache=True)
+        
+        # Version courte dérivée des sections d'une version plus détaillée, sans appel LLM
+        if detail_level == 'court':
+            for source_level in ('long', 'moyen'):
+                source, _ = self.lookup_entry(self.get_cache_key(concept, language, source_level))
+                if source:
+                    logger.info(f"✂️ Version courte dérivée de '{source_level}'")
+                    self.stats['derived_entries'] += 1
+                    derived = self.derive_short_entry(source)
+                    self.store_entry(cache_key, derived)
+                    return self.present(derived, start_time, from_cache=True)
         
         logger.info("🔄 Cache MISS - Appel API Mistral")
         
+        # Le préchargement ne fait jamais la queue (queue=False): il n'utilise qu'une place libre,
+        # mais garde une vraie échéance pour ses nouvelles tentatives
+        deadline = start_time + Config.LLM_DEADLINE
+        
         try:
-            # Construire le prompt
-            prompt = self.build_prompt(concept, language, detail_level)
-            
-            # Appeler Mistral avec rotation des clés
-            ai_response = self.call_mistral_with_retry(prompt)
+            sections = None
+            upgraded_from = None
+            # Le préchargement n'a pas d'utilisateur qui attend: pas de contrainte de délai pour le routage
+            routing_deadline = None if prefetch else deadline
+            usage = self.token_usage.start(endpoint='prefetch' if prefetch else 'explore', language=language,
+                                           mode=detail_level)
             
-            if not ai_response:
-                raise RuntimeError("Réponse vide de l'API Mistral")
+            # Niveau supérieur: on enrichit la version déjà en cache au lieu de tout régénérer
+            base_entry = self.find_upgrade_base(concept, language, detail_level)
+            if base_entry:
+                try:
+                    prompt = self.build_upgrade_prompt(concept, language, detail_level, base_entry)
+                    routing = self.router.choose('upgrade', detail_level, len(prompt), routing_deadline,
+                                                 self.key_pool.headroom())
+                    ai_response = self.call_mistral_with_retry(prompt, max_tokens=Config.MISTRAL_UPGRADE_MAX_TOKENS,
+                                                               deadline=deadline, model=routing['model'], usage=usage,
+                                                               queue=not prefetch)
+                    if not ai_response:
+                        raise RuntimeError("Réponse vide de l'API Mistral")
+                    
+                    sections = self.merge_sections(base_entry['sections'], self.parse_sections(ai_response))
+                    upgraded_from = base_entry['detail_level']
+                    self.stats['upgrades'] += 1
+                    logger.info(f"⬆️ Enrichissement depuis '{upgraded_from}'")
+                except GatewayOverloaded:
+                    raise
+                except Exception as e:
+                    logger.warning(f"⚠️ Enrichissement impossible, génération complète: {e}")
             
-            # Convertir en HTML
-            formatted_response = self.markdown_to_html(ai_response)
+            if sections is None:
+                # Construire le prompt
+                prompt = self.build_prompt(concept, language, detail_level)
+                
+                # Modèle choisi en amont (niveau, taille du prompt, échéance, capacité des clés)
+                routing = self.router.choose('prefetch' if prefetch else 'explore', detail_level, len(prompt),
+                                             routing_deadline, self.key_pool.headroom())
+                
+                # Appeler Mistral avec rotation des clés
+                ai_response = self.call_mistral_with_retry(prompt, deadline=deadline, model=routing['model'],
+                                                           usage=usage, queue=not prefetch)
+                
+                if not ai_response:
+                    raise RuntimeError("Réponse vide de l'API Mistral")
+                
+                # Découper en sections et convertir en HTML
+                sections = self.parse_sections(ai_response)
             
             # Temps de traitement
             processing_time = round(time.time() - start_time, 2)
@@ -371,26 +2123,51 @@ Réponds maintenant:"""
                     sum(self.processing_times) / len(self.processing_times), 2
                 )
             
-            result = {
+            entry = {
                 'success': True,
                 'concept': concept.title(),
-                'explanation': formatted_response,
-                'processing_time': processing_time,
+                'sections': sections,
                 'detail_level': detail_level,
                 'language': language,
                 'source': 'mistral_ai',
-                'model': Config.MISTRAL_MODEL_PRIMARY,
-                'from_cache': False,
-                'cache_size': self.cache.size()
+                'model': routing['model'],
+                'routing': {'route': routing['route'], 'tier': routing['tier'], 'reason': routing['reason']}
             }
+            if upgraded_from:
+                entry['upgraded_from'] = upgraded_from
             
-            # Mettre en cache
-            self.cache.set(cache_key, result.copy())
+            # Mettre en cache (par sections); le préchargement reste soumis au filtre de popularité
+            self.store_entry(cache_key, entry, paid=not prefetch)
             self.stats['concepts_explored'] += 1
             
+            result = self.present(entry, start_time, from_cache=False)
+            result['cache_size'] = self.cache.size()
+            result['usage'] = self.token_usage.summary(usage)
+            
+            # Les concepts liés seront probablement demandés ensuite
+            if not prefetch:
+                self.record_suggestion(concept, language)
+                self.prefetcher.enqueue_related(entry, language, detail_level)
+            
             logger.info(f"✅ Traitement réussi en {processing_time}s")
             return result
             
+        except GatewayOverloaded as e:
+            # Délestage: autre niveau de détail déjà en cache, sinon 503 + Retry-After
+            fallback = None if prefetch else self.find_fallback_entry(concept, language, detail_level)
+            if fallback:
+                logger.warning(f"🪫 Surcharge: niveau '{fallback['detail_level']}' servi à la place de '{detail_level}'")
+                self.stats['degraded'] += 1
+                result = self.present(fallback, start_time, from_cache=True)
+                result['degraded'] = True
+                result['requested_detail_level'] = detail_level
+                return result
+            
+            logger.warning(f"🪫 Requête délestée: {e}")
+            if not prefetch:
+                self.stats['shed'] += 1
+            return {'success': False, 'error': str(e), 'retry_after': e.retry_after}
+            
         except Exception as e:
             logger.error(f"❌ Erreur traitement: {str(e)}")
             logger.error(traceback.format_exc())
@@ -405,22 +2182,109 @@ Réponds maintenant:"""
         stats = self.stats.copy()
         stats['cache_size'] = self.cache.size()
         stats['cache_max_size'] = Config.CACHE_MAX_SIZE
+        stats['cache_policy'] = Config.CACHE_POLICY
+        if isinstance(self.cache.backend, TinyLFUCache):
+            stats['cache_admission'] = self.cache.backend.stats.copy()
+        stats['cache_compression'] = self.cache.get_stats()
         stats['api_keys_count'] = len(self.api_keys)
-        stats['key_stats'] = self.key_stats
+        stats['key_stats'] = self.key_pool.get_stats()
+        stats['hedging'] = self.hedging.get_stats()
+        stats['routing'] = self.router.get_stats()
+        stats['token_usage'] = self.token_usage.get_stats()
+        stats['library'] = self.library.info() if self.library else None
+        stats['prefetch'] = self.prefetcher.get_stats()
+        stats['canonicalizer'] = self.canonicalizer.get_stats()
+        stats['popularity'] = self.popularity.get_stats()
+        stats['snapshot'] = self.snapshot.get_stats()
+        stats['responses'] = dict(self.responses.stats, size=self.responses.size())
+        stats['jobs'] = self.jobs.get_stats()
+        stats['admission'] = self.limiter.get_stats()
+        stats['suggestions'] = {language: trie.size() for language, trie in self.suggestions.items()}
+        stats['calculator'] = dict(self.calculator.stats, cache_size=self.calculator.size(),
+                                   pool=self.calculator.pool.get_stats())
+        stats['plotter'] = dict(self.plotter.stats, cache_size=self.plotter.size())
         return stats
 
 # Instance globale
 mathia = MathiaExplorer()
 
+# Interface: fichiers de static/ hachés et précompressés une fois au démarrage
+assets = StaticAssets(Config.STATIC_DIR, page_max_age=Config.PAGE_MAX_AGE, asset_max_age=Config.ASSET_MAX_AGE)
+logger.info(f"🎨 Interface: {len(assets.hashed)} fichiers hachés en {assets.stats['build_ms']} ms")
+
+def explore_params(data):
+    """Paramètres d'exploration validés: ((concept, langue, détail, sections), None) ou (None, erreur)"""
+    if not data:
+        return None, 'Corps de requête JSON requis'
+    
+    concept = data.get('concept', '').strip()
+    language = data.get('language', 'fr')
+    detail_level = data.get('detail_level', 'moyen')
+    
+    logger.info(f"📝 Paramètres: concept='{concept}', langue={language}, détail={detail_level}")
+    
+    if language not in ['fr', 'en', 'es']:
+        language = 'fr'
+    
+    if detail_level not in ['court', 'moyen', 'long']:
+        detail_level = 'moyen'
+    
+    if not concept:
+        return None, 'Le paramètre "concept" est requis'
+    
+    # Sections demandées pour le premier affichage (toutes par défaut)
+    sections = data.get('sections')
+    if sections is not None and (not isinstance(sections, list) or
+                                 any(s not in MathiaExplorer.SECTION_IDS for s in sections)):
+        return None, f'Le paramètre "sections" doit être une liste parmi: {", ".join(MathiaExplorer.SECTION_IDS)}'
+    
+    return (concept, language, detail_level, sections), None
+
+def explore_concept(concept, language, detail_level, sections):
+    """Explication complète, réduite aux sections demandées"""
+    return explore_view(mathia.process_concept(concept, language, detail_level), sections)
+
+def explore_view(result, sections):
+    """Réponse d'exploration vue par un client: sections demandées, ou texte complet sans découpage"""
+    if not result.get('success'):
+        return result
+    
+    if sections is not None:
+        return mathia.select_sections(result, sections)
+    result = dict(result)
+    result.pop('sections', None)
+    return result
+
+def job_sections():
+    """Sections demandées à la soumission, reprises de l'URL de suivi (?sections=a,b)"""
+    sections = request.args.get('sections')
+    if sections is None:
+        return None
+    return [s for s in sections.split(',') if s in MathiaExplorer.SECTION_IDS]
+
+def overloaded_response(result):
+    """503 avec Retry-After pour une requête délestée"""
+    response = jsonify(result)
+    response.headers['Retry-After'] = str(result['retry_after'])
+    return response, 503
+
 # Routes
 @app.route('/')
 def index():
-    """Interface principale"""
-    return render_template_string(MATHIA_TEMPLATE)
+    """Interface principale (page précompressée, revalidée par ETag)"""
+    return assets.respond(assets.page)
+
+@app.route('/static/<path:filename>')
+def static_asset(filename):
+    """CSS/JS de l'interface (nom haché: cache navigateur et CDN d'un an)"""
+    response = assets.respond(filename)
+    if response is None:
+        return jsonify({'success': False, 'error': 'Fichier introuvable'}), 404
+    return response
 
-@app.route('/api/explore', methods=['POST', 'OPTIONS'])
+@app.route('/api/explore', methods=['GET', 'POST', 'OPTIONS'])
 def explore():
-    """API d'exploration de concepts"""
+    """API d'exploration de concepts (GET: réponse réutilisable par le navigateur)"""
     
     logger.info(f"📨 Requête {request.method} depuis {request.remote_addr}")
     
@@ -429,12 +2293,209 @@ def explore():
         return '', 204
     
     try:
-        # Validation Content-Type
+        if request.method == 'GET':
+            data = request.args.to_dict()
+            if 'sections' in data:
+                data['sections'] = [s for s in data['sections'].split(',') if s]
+        else:
+            # Validation Content-Type
+            if not request.is_json:
+                logger.error(f"❌ Content-Type invalide: {request.content_type}")
+                return jsonify({
+                    'success': False,
+                    'error': f'Content-Type doit être application/json'
+                }), 400
+            
+            data = request.get_json()
+        
+        params, error = explore_params(data)
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        concept, language, detail_level, sections = params
+        
+        # Réponse déjà sérialisée (sauf si le client demande une revalidation complète)
+        response_key = mathia.response_key(concept, language, detail_level, sections)
+        refresh = request.cache_control.no_cache or request.cache_control.no_store
+        if response_key and not refresh:
+            encoded = mathia.responses.get(response_key)
+            if encoded is not None:
+                if mathia.touch_entry(response_key, concept, language, detail_level):
+                    logger.info("⚡ Réponse pré-sérialisée")
+                    return mathia.responses.respond(encoded)
+                mathia.responses.discard(response_key)
+        
+        # Traitement
+        result = explore_concept(concept, language, detail_level, sections)
+        
+        if not result.get('success'):
+            logger.error(f"❌ Échec: {result.get('error')}")
+            if result.get('retry_after'):
+                return overloaded_response(result)
+            return jsonify(result), 400
+        
+        logger.info(f"✅ Succès en {result.get('processing_time')}s")
+        
+        # Réponse dégradée (surcharge): ni pré-sérialisée ni réutilisable par le navigateur
+        if result.get('degraded'):
+            return jsonify(result), 200
+        
+        encoded = mathia.responses.encode(result)
+        if response_key and result.get('from_cache'):
+            mathia.responses.store(response_key, encoded)
+        return mathia.responses.respond(encoded)
+        
+    except Exception as e:
+        logger.error(f"💥 Erreur serveur: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({
+            'success': False,
+            'error': f'Erreur interne: {str(e)}'
+        }), 500
+
+@app.route('/api/jobs/explore', methods=['POST', 'OPTIONS'])
+def submit_explore_job():
+    """Exploration asynchrone: 202 avec l'identifiant de la tâche, résultat via polling ou SSE"""
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    try:
+        if not request.is_json:
+            return jsonify({'success': False, 'error': 'Content-Type doit être application/json'}), 400
+        
+        params, error = explore_params(request.get_json())
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        concept, language, detail_level, sections = params
+        
+        is_valid, message = mathia.validate_concept(concept)
+        if not is_valid:
+            return jsonify({'success': False, 'error': message}), 400
+        
+        # Une tâche par explication (clé du cache): chaque client en lit ses propres sections
+        job, deduplicated = mathia.jobs.submit(
+            mathia.response_key(concept, language, detail_level),
+            lambda: mathia.process_concept(concept, language, detail_level)
+        )
+        if job is None:
+            response = jsonify({'success': False, 'error': 'Trop de tâches en attente, réessayez plus tard'})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+        
+        logger.info(f"🧵 Tâche {job['id'][:8]} ({'dédupliquée' if deduplicated else 'créée'}) pour '{concept}'")
+        job_url = f"{request.script_root}/api/jobs/{job['id']}"
+        query = f"?sections={','.join(sections)}" if sections is not None else ''
+        poll_url = f"{job_url}{query}"
+        response = jsonify(dict(mathia.jobs.describe(job, lambda result: explore_view(result, sections)),
+                                success=True, deduplicated=deduplicated,
+                                poll_url=poll_url, events_url=f"{job_url}/events{query}"))
+        response.headers['Location'] = poll_url
+        return response, 202
+        
+    except Exception as e:
+        logger.error(f"💥 Erreur soumission: {str(e)}")
+        return jsonify({'success': False, 'error': f'Erreur interne: {str(e)}'}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """État d'une tâche (polling), avec le résultat une fois terminée"""
+    job = mathia.jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Tâche inconnue ou expirée'}), 404
+    sections = job_sections()
+    return jsonify(dict(mathia.jobs.describe(job, lambda result: explore_view(result, sections)), success=True)), 200
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Flux SSE des changements d'état d'une tâche (se termine avec le résultat)"""
+    job = mathia.jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Tâche inconnue ou expirée'}), 404
+    
+    sections = job_sections()
+    response = Response(mathia.jobs.events(job, heartbeat=Config.JOB_HEARTBEAT,
+                                           view=lambda result: explore_view(result, sections)),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/explore/sections', methods=['POST', 'OPTIONS'])
+def explore_sections():
+    """API de chargement différé des sections d'une explication"""
+    
+    # CORS preflight
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    try:
+        params, error = explore_params(request.get_json(silent=True))
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        
+        concept, language, detail_level, sections = params
+        sections = sections or MathiaExplorer.SECTION_IDS
+        
+        result = mathia.get_sections(concept, language, detail_level, sections)
+        
+        if not result.get('success'):
+            if result.get('retry_after'):
+                return overloaded_response(result)
+            return jsonify(result), 400
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        logger.error(f"💥 Erreur sections: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({
+            'success': False,
+            'error': f'Erreur interne: {str(e)}'
+        }), 500
+
+@app.route('/api/suggest', methods=['GET'])
+def suggest():
+    """API d'autocomplétion des concepts (trie en mémoire)"""
+    query = request.args.get('q', '')[:Config.SUGGEST_MAX_QUERY_LENGTH]
+    language = request.args.get('language', 'fr')
+    
+    if language not in mathia.suggestions:
+        language = 'fr'
+    
+    try:
+        limit = max(1, min(int(request.args.get('limit', Config.SUGGEST_MAX_RESULTS)), Config.SUGGEST_MAX_RESULTS))
+    except ValueError:
+        limit = Config.SUGGEST_MAX_RESULTS
+    
+    if len(query.strip()) < 1:
+        return jsonify({'success': True, 'query': query, 'suggestions': []}), 200
+    
+    suggestions = mathia.suggestions[language].search(query, limit)
+    if not suggestions:
+        # Aucun préfixe connu: concept proche par trigrammes (faute de frappe)
+        titles = mathia.canonical_titles.get(mathia.canonicalizer.suggest(query))
+        suggestions = [titles[language]] if titles else []
+    
+    return jsonify({
+        'success': True,
+        'query': query,
+        'suggestions': suggestions
+    }), 200
+
+@app.route('/api/calculate', methods=['POST', 'OPTIONS'])
+def calculate():
+    """API de calcul numérique et symbolique (unitaire ou par lot)"""
+    
+    # CORS preflight
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    start_time = time.time()
+    
+    try:
         if not request.is_json:
-            logger.error(f"❌ Content-Type invalide: {request.content_type}")
             return jsonify({
                 'success': False,
-                'error': f'Content-Type doit être application/json'
+                'error': 'Content-Type doit être application/json'
             }), 400
         
         data = request.get_json()
@@ -445,38 +2506,131 @@ def explore():
                 'error': 'Corps de requête JSON requis'
             }), 400
         
-        # Extraction des paramètres
-        concept = data.get('concept', '').strip()
-        language = data.get('language', 'fr')
-        detail_level = data.get('detail_level', 'moyen')
+        variables = data.get('variables') or {}
+        if not isinstance(variables, dict):
+            return jsonify({'success': False, 'error': 'Le paramètre "variables" doit être un objet'}), 400
+        
+        # Mode lot
+        if 'expressions' in data:
+            items = data.get('expressions')
+            if not isinstance(items, list) or not items:
+                return jsonify({'success': False, 'error': 'Le paramètre "expressions" doit être une liste non vide'}), 400
+            if len(items) > Config.MAX_BATCH_SIZE:
+                return jsonify({'success': False, 'error': f'Maximum {Config.MAX_BATCH_SIZE} expressions par lot'}), 400
+            
+            results = mathia.calculator.calculate_batch(items, variables)
+            return jsonify({
+                'success': True,
+                'results': results,
+                'count': len(results),
+                'processing_time': round(time.time() - start_time, 4)
+            }), 200
+        
+        # Mode unitaire
+        expression = data.get('expression', '')
+        if not expression or not str(expression).strip():
+            return jsonify({
+                'success': False,
+                'error': 'Le paramètre "expression" est requis'
+            }), 400
         
-        logger.info(f"📝 Paramètres: concept='{concept}', langue={language}, détail={detail_level}")
+        try:
+            result = mathia.calculator.calculate(
+                expression,
+                data.get('operation', 'evaluate'),
+                variables,
+                data.get('variable')
+            )
+        except (ValueError, TypeError, AttributeError, NotImplementedError) as e:
+            mathia.calculator.stats['errors'] += 1
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        result['processing_time'] = round(time.time() - start_time, 4)
+        return jsonify(result), 200
         
-        # Validation
-        if language not in ['fr', 'en', 'es']:
-            language = 'fr'
+    except Exception as e:
+        logger.error(f"💥 Erreur calcul: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({
+            'success': False,
+            'error': f'Erreur interne: {str(e)}'
+        }), 500
+
+@app.route('/api/plot', methods=['GET', 'POST', 'OPTIONS'])
+def plot():
+    """API de tracé de fonctions (PNG/SVG) avec cache et ETag"""
+    
+    # CORS preflight
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+        else:
+            data = request.args
         
-        if detail_level not in ['court', 'moyen', 'long']:
-            detail_level = 'moyen'
+        try:
+            params = mathia.plotter.validate_params(data)
+            rendered = mathia.plotter.render(*params)
+        except (ValueError, TypeError, AttributeError, NotImplementedError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        if not concept:
-            return jsonify({
-                'success': False,
-                'error': 'Le paramètre "concept" est requis'
-            }), 400
+        headers = {
+            'ETag': f'"{rendered["etag"]}"',
+            'Cache-Control': f'public, max-age={Config.PLOT_CACHE_MAX_AGE}'
+        }
         
-        # Traitement
-        result = mathia.process_concept(concept, language, detail_level)
+        if request.if_none_match.contains_weak(rendered['etag']):
+            mathia.plotter.stats['not_modified'] += 1
+            return Response(status=304, headers=headers)
         
-        if not result.get('success'):
-            logger.error(f"❌ Échec: {result.get('error')}")
-            return jsonify(result), 400
+        return Response(rendered['content'], mimetype=rendered['mimetype'], headers=headers)
         
-        logger.info(f"✅ Succès en {result.get('processing_time')}s")
-        return jsonify(result), 200
+    except Exception as e:
+        logger.error(f"💥 Erreur tracé: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({
+            'success': False,
+            'error': f'Erreur interne: {str(e)}'
+        }), 500
+
+@app.route('/api/plot/data', methods=['GET', 'POST', 'OPTIONS'])
+def plot_data():
+    """API de données de tracé (x/y float32 en base64, réduits par LTTB)"""
+    
+    # CORS preflight
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+        else:
+            data = request.args
+        
+        try:
+            expression, xmin, xmax, _, _, _ = mathia.plotter.validate_params(data)
+            budget = int(data.get('points', Config.PLOT_DATA_DEFAULT_POINTS))
+            if not 3 <= budget <= Config.PLOT_MAX_POINTS:
+                raise ValueError(f"Le nombre de points doit être compris entre 3 et {Config.PLOT_MAX_POINTS}")
+            result = mathia.plotter.data(expression, xmin, xmax, budget)
+        except (ValueError, TypeError, AttributeError, NotImplementedError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        headers = {
+            'ETag': f'"{result["etag"]}"',
+            'Cache-Control': f'public, max-age={Config.PLOT_CACHE_MAX_AGE}'
+        }
+        
+        if request.if_none_match.contains_weak(result['etag']):
+            mathia.plotter.stats['not_modified'] += 1
+            return Response(status=304, headers=headers)
+        
+        return Response(result['content'], mimetype=result['mimetype'], headers=headers)
         
     except Exception as e:
-        logger.error(f"💥 Erreur serveur: {str(e)}")
+        logger.error(f"💥 Erreur données de tracé: {str(e)}")
         logger.error(traceback.format_exc())
         return jsonify({
             'success': False,
@@ -488,11 +2642,50 @@ def get_stats():
     """Récupère les statistiques détaillées"""
     try:
         stats = mathia.get_detailed_stats()
+        stats['assets'] = assets.get_stats()
         return jsonify(stats), 200
     except Exception as e:
         logger.error(f"Erreur stats: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/stats/top', methods=['GET'])
+def get_top_queries():
+    """Concepts les plus demandés sur la période récente"""
+    try:
+        limit = min(int(request.args.get('limit', 20)), Config.POPULARITY_TOP_K)
+    except ValueError:
+        limit = 20
+    
+    try:
+        top = [dict(label, count=count) for _, label, count in mathia.popularity.most_common(limit)]
+        return jsonify({
+            'success': True,
+            'top': top,
+            'popularity': mathia.popularity.get_stats()
+        }), 200
+    except Exception as e:
+        logger.error(f"Erreur top: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/stats/usage', methods=['GET'])
+def get_token_usage():
+    """Tokens consommés sur une fenêtre (5m, 1h, 24h), par clé, modèle, endpoint, langue et niveau"""
+    windows = dict(UsageMeter.WINDOWS)
+    window = request.args.get('window', '1h')
+    if window not in windows:
+        return jsonify({'success': False, 'error': f"Fenêtre inconnue (valeurs: {', '.join(windows)})"}), 400
+    
+    try:
+        return jsonify({
+            'success': True,
+            'window': window,
+            'usage': mathia.token_usage.window(windows[window]),
+            'missing_usage': mathia.token_usage.missing
+        }), 200
+    except Exception as e:
+        logger.error(f"Erreur usage: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
@@ -502,1086 +2695,97 @@ def health():
         'version': '5.1 PRODUCTION',
         'api_keys_configured': len(Config.API_KEYS),
         'cache_size': mathia.cache.size(),
+        'cache_warmup': mathia.snapshot.stats['status'],
         'total_requests': mathia.stats['requests']
     }), 200
 
-# Template HTML (identique à avant)
-MATHIA_TEMPLATE = '''<!DOCTYPE html>
-<html lang="fr">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Mathia - Explorateur Mathématique IA</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        
-        :root {
-            --gradient-start: #e63946;
-            --gradient-end: #f77f00;
-        }
-        
-        body {
-            --bg-primary: linear-gradient(135deg, #e63946 0%, #f77f00 100%);
-            --bg-secondary: rgba(255, 255, 255, 0.25);
-            --bg-tertiary: rgba(255, 255, 255, 0.3);
-            --text-primary: #ffffff;
-            --text-secondary: rgba(255, 255, 255, 0.95);
-            --text-tertiary: rgba(255, 255, 255, 0.9);
-            --border-color: rgba(255, 255, 255, 0.3);
-            --border-color-strong: rgba(255, 255, 255, 0.4);
-            --shadow: rgba(0, 0, 0, 0.1);
-            --shadow-strong: rgba(0, 0, 0, 0.15);
-            --input-bg: rgba(255, 255, 255, 0.3);
-            --input-border: rgba(255, 255, 255, 0.4);
-            --input-focus-bg: rgba(255, 255, 255, 0.4);
-            --input-focus-border: rgba(255, 255, 255, 0.6);
-            --input-focus-shadow: rgba(255, 255, 255, 0.2);
-            --button-bg: rgba(255, 255, 255, 0.25);
-            --button-active: rgba(255, 255, 255, 0.5);
-            --button-primary: rgba(255, 255, 255, 0.4);
-            --placeholder-color: rgba(255, 255, 255, 0.8);
-        }
-        
-        body[data-theme="dark"] {
-            --bg-primary: #0d1b2a;
-            --bg-secondary: #1b263b;
-            --bg-tertiary: #415a77;
-            --text-primary: #e0e1dd;
-            --text-secondary: #cbd5e1;
-            --text-tertiary: #94a3b8;
-            --border-color: #415a77;
-            --border-color-strong: #4a5f7f;
-            --shadow: rgba(0, 0, 0, 0.3);
-            --shadow-strong: rgba(0, 0, 0, 0.4);
-            --input-bg: #0d1b2a;
-            --input-border: #415a77;
-            --input-focus-bg: #1b263b;
-            --input-focus-border: #e63946;
-            --input-focus-shadow: rgba(230, 57, 70, 0.2);
-            --button-bg: #1b263b;
-            --button-active: #e63946;
-            --button-primary: #e63946;
-            --placeholder-color: #94a3b8;
-        }
-        
-        body {
-            font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            min-height: 100vh;
-            display: flex;
-            flex-direction: column;
-            transition: all 0.3s ease;
-        }
-        
-        .top-header {
-            position: fixed;
-            top: 0;
-            left: 0;
-            right: 0;
-            z-index: 1000;
-            background: var(--bg-secondary);
-            backdrop-filter: blur(20px);
-            border-bottom: 1px solid var(--border-color);
-            padding: 15px 30px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .logo {
-            font-size: 1.2rem;
-            font-weight: 700;
-            color: var(--text-primary);
-            text-decoration: none;
-        }
-        
-        .header-controls {
-            display: flex;
-            gap: 15px;
-            align-items: center;
-        }
-        
-        .language-selector, .theme-toggle {
-            background: var(--button-bg);
-            border: 1px solid var(--border-color);
-            border-radius: 15px;
-            padding: 10px 15px;
-            cursor: pointer;
-            font-size: 0.9rem;
-            color: var(--text-primary);
-            transition: all 0.2s ease;
-        }
-        
-        .theme-toggle {
-            padding: 12px;
-            font-size: 1.2rem;
-        }
-        
-        .container {
-            flex: 1;
-            padding: 100px 30px 30px;
-            max-width: 1200px;
-            margin: 0 auto;
-            width: 100%;
-            display: flex;
-            flex-direction: column;
-            gap: 30px;
-        }
-        
-        .title-section {
-            text-align: center;
-            margin-bottom: 20px;
-        }
-        
-        .title {
-            font-size: 2.8rem;
-            font-weight: 700;
-            margin-bottom: 10px;
-            color: var(--text-primary);
-        }
-        
-        .subtitle {
-            color: var(--text-secondary);
-            font-size: 1.15rem;
-        }
-        
-        .stats {
-            display: flex;
-            justify-content: center;
-            gap: 20px;
-            margin-bottom: 30px;
-            flex-wrap: wrap;
-        }
-        
-        .stat-item {
-            background: var(--bg-secondary);
-            backdrop-filter: blur(20px);
-            border: 1px solid var(--border-color);
-            padding: 10px 20px;
-            border-radius: 15px;
-            font-size: 0.9rem;
-            color: var(--text-secondary);
-        }
-        
-        .form-section {
-            background: var(--bg-secondary);
-            backdrop-filter: blur(20px);
-            border: 1px solid var(--border-color);
-            border-radius: 25px;
-            padding: 30px;
-        }
-        
-        .form-group {
-            margin-bottom: 25px;
-        }
-        
-        .label {
-            display: block;
-            color: var(--text-primary);
-            font-weight: 600;
-            margin-bottom: 12px;
-            font-size: 1rem;
-        }
-        
-        .input {
-            width: 100%;
-            padding: 18px 24px;
-            background: var(--input-bg);
-            border: 1px solid var(--input-border);
-            border-radius: 20px;
-            font-size: 1rem;
-            color: var(--text-primary);
-            outline: none;
-            transition: all 0.3s ease;
-        }
-        
-        .input:focus {
-            background: var(--input-focus-bg);
-            border-color: var(--input-focus-border);
-            box-shadow: 0 0 0 3px var(--input-focus-shadow);
-        }
-        
-        .input::placeholder {
-            color: var(--placeholder-color);
-        }
-        
-        .suggestions {
-            margin-top: 15px;
-        }
-        
-        .suggestion-chips {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 8px;
-            margin-top: 10px;
-        }
-        
-        .chip {
-            background: var(--button-bg);
-            border: 1px solid var(--border-color);
-            border-radius: 20px;
-            padding: 8px 16px;
-            font-size: 0.8rem;
-            color: var(--text-secondary);
-            cursor: pointer;
-            transition: all 0.2s ease;
-        }
-        
-        .chip:hover {
-            transform: translateY(-2px);
-            background: var(--button-active);
-        }
-        
-        .detail-selector {
-            display: flex;
-            gap: 15px;
-            flex-wrap: wrap;
-        }
-        
-        .detail-btn {
-            background: var(--button-bg);
-            border: 1px solid var(--border-color);
-            border-radius: 15px;
-            padding: 12px 20px;
-            font-size: 0.9rem;
-            color: var(--text-tertiary);
-            cursor: pointer;
-            transition: all 0.2s ease;
-            flex: 1;
-            min-width: 150px;
-        }
-        
-        .detail-btn:hover {
-            transform: translateY(-2px);
-        }
-        
-        .detail-btn.active {
-            background: var(--button-active);
-            color: var(--text-primary);
-            border-color: var(--border-color-strong);
-            font-weight: 600;
-        }
-        
-        .controls {
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            flex-wrap: wrap;
-            gap: 15px;
-        }
-        
-        .btn {
-            background: var(--button-bg);
-            border: 1px solid var(--border-color);
-            border-radius: 20px;
-            padding: 18px 36px;
-            font-size: 1.1rem;
-            font-weight: 600;
-            color: var(--text-primary);
-            cursor: pointer;
-            transition: all 0.2s ease;
-        }
-        
-        .btn:hover {
-            transform: translateY(-2px);
-        }
-        
-        .btn-primary {
-            background: var(--button-primary);
-            color: #ffffff;
-            border-color: var(--border-color-strong);
-        }
-        
-        .btn:disabled {
-            opacity: 0.6;
-            cursor: not-allowed;
-            transform: none;
-        }
-        
-        .status {
-            background: var(--bg-secondary);
-            backdrop-filter: blur(20px);
-            border: 1px solid var(--border-color);
-            border-radius: 20px;
-            padding: 25px;
-            display: none;
-        }
-        
-        .status.active {
-            display: block;
-            animation: slideDown 0.3s ease;
-        }
-        
-        .status-text {
-            color: var(--text-primary);
-            font-weight: 500;
-            margin-bottom: 15px;
-            display: flex;
-            align-items: center;
-        }
-        
-        .progress-bar {
-            width: 100%;
-            height: 8px;
-            background: var(--input-bg);
-            border-radius: 10px;
-            overflow: hidden;
-        }
-        
-        .progress-fill {
-            height: 100%;
-            border-radius: 10px;
-            width: 0%;
-            transition: width 0.3s ease;
-            background: linear-gradient(90deg, var(--gradient-start), var(--gradient-end));
-        }
-        
-        .result {
-            background: var(--bg-secondary);
-            backdrop-filter: blur(20px);
-            border: 1px solid var(--border-color);
-            border-radius: 25px;
-            padding: 30px;
-            display: none;
-        }
-        
-        .result.active {
-            display: block;
-            animation: slideUp 0.5s ease;
-        }
-        
-        .result-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 15px;
-        }
-        
-        .result-title {
-            color: var(--text-primary);
-            font-size: 1.3rem;
-            font-weight: 600;
-            padding-bottom: 15px;
-            border-bottom: 2px solid var(--border-color);
-            flex: 1;
-            margin-right: 20px;
-        }
-        
-        .copy-btn {
-            background: var(--button-bg);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            padding: 10px;
-            cursor: pointer;
-            font-size: 1rem;
-            color: var(--text-primary);
-            transition: all 0.2s ease;
-        }
-        
-        .copy-btn:hover {
-            transform: scale(1.1);
-        }
-        
-        .result-meta {
-            color: var(--text-secondary);
-            font-size: 0.9rem;
-            margin-bottom: 20px;
-        }
-        
-        .result-content {
-            color: var(--text-primary);
-            line-height: 1.7;
-            font-size: 1rem;
-        }
-        
-        .result-content p {
-            margin-bottom: 15px;
-        }
-        
-        .result-content strong {
-            color: var(--text-primary);
-            font-weight: 600;
-        }
-        
-        .result-content h2, .result-content h3 {
-            margin-top: 20px;
-            margin-bottom: 10px;
-        }
-        
-        .cache-badge {
-            display: inline-block;
-            background: rgba(74, 222, 128, 0.2);
-            border: 1px solid rgba(74, 222, 128, 0.4);
-            color: #4ade80;
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-size: 0.85rem;
-            font-weight: 600;
-            margin-left: 10px;
-        }
-        
-        .loading {
-            display: inline-block;
-            width: 20px;
-            height: 20px;
-            margin-right: 10px;
-            border: 3px solid var(--border-color);
-            border-radius: 50%;
-            border-top-color: var(--text-primary);
-            animation: spin 1s ease-in-out infinite;
-        }
-        
-        .notification {
-            position: fixed;
-            top: 90px;
-            right: 20px;
-            padding: 15px 25px;
-            border-radius: 15px;
-            color: white;
-            font-weight: 500;
-            z-index: 1000;
-            transform: translateX(400px);
-            transition: all 0.3s ease;
-            backdrop-filter: blur(20px);
-            box-shadow: 0 4px 20px rgba(0, 0, 0, 0.2);
-        }
-        
-        .notification.show {
-            transform: translateX(0);
-        }
-        
-        .notification.error {
-            background: rgba(214, 40, 40, 0.95);
-        }
-        
-        .notification.success {
-            background: rgba(34, 197, 94, 0.95);
-        }
-        
-        .notification.info {
-            background: rgba(247, 127, 0, 0.95);
-        }
-        
-        @keyframes spin {
-            to { transform: rotate(360deg); }
-        }
-        
-        @keyframes slideUp {
-            from {
-                opacity: 0;
-                transform: translateY(20px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-        
-        @keyframes slideDown {
-            from {
-                opacity: 0;
-                transform: translateY(-10px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-        
-        @media (max-width: 768px) {
-            .top-header {
-                padding: 15px 20px;
-                flex-direction: column;
-                gap: 15px;
-            }
-            
-            .container {
-                padding: 140px 20px 20px;
-            }
-            
-            .title {
-                font-size: 2rem;
-            }
-        }
-    </style>
-</head>
-<body>
-    <div class="top-header">
-        <a href="#" class="logo" onclick="return false;">🔢 Mathia Explorer</a>
-        
-        <div class="header-controls">
-            <select class="language-selector" id="languageSelector" onchange="changeLanguage()">
-                <option value="fr">🇫🇷 Français</option>
-                <option value="en">🇺🇸 English</option>
-                <option value="es">🇪🇸 Español</option>
-            </select>
-            
-            <button class="theme-toggle" id="themeToggle" onclick="toggleTheme()">🌙</button>
-        </div>
-    </div>
-
-    <div class="container">
-        <div class="title-section">
-            <h1 class="title" data-text-key="title">🔢 Mathia</h1>
-            <p class="subtitle" data-text-key="subtitle">Explorateur de concepts mathématiques avec IA</p>
-        </div>
-
-        <div class="stats" id="stats">
-            <div class="stat-item">📊 <span id="totalRequests">0</span> <span data-text-key="requests">requêtes</span></div>
-            <div class="stat-item">💾 <span id="cacheHits">0</span> <span data-text-key="cached">en cache</span></div>
-            <div class="stat-item">🎯 <span id="conceptsExplored">0</span> <span data-text-key="concepts">concepts</span></div>
-        </div>
-
-        <div class="form-section">
-            <form id="explorerForm" onsubmit="handleFormSubmit(event)">
-                <div class="form-group">
-                    <label class="label" for="concept">🔍 <span data-text-key="search_concept">Concept à explorer</span></label>
-                    <input type="text" id="concept" class="input" 
-                           data-placeholder-key="search_placeholder" required>
-                    
-                    <div class="suggestions">
-                        <span style="color: var(--text-secondary); font-size: 0.9rem;">💡 <span data-text-key="popular_suggestions">Suggestions populaires:</span></span>
-                        <div class="suggestion-chips" id="suggestionChips"></div>
-                    </div>
-                </div>
-
-                <div class="form-group">
-                    <label class="label">📏 <span data-text-key="detail_level">Niveau de détail</span></label>
-                    <div class="detail-selector">
-                        <button type="button" class="detail-btn" onclick="selectDetail('court', this)">
-                            📝 <span data-text-key="short">Court</span><br><small><span data-text-key="short_desc">150-200 mots</span></small>
-                        </button>
-                        <button type="button" class="detail-btn active" onclick="selectDetail('moyen', this)">
-                            📄 <span data-text-key="medium">Moyen</span><br><small><span data-text-key="medium_desc">300-400 mots</span></small>
-                        </button>
-                        <button type="button" class="detail-btn" onclick="selectDetail('long', this)">
-                            📚 <span data-text-key="long">Détaillé</span><br><small><span data-text-key="long_desc">500-600 mots</span></small>
-                        </button>
-                    </div>
-                </div>
-
-                <div class="controls">
-                    <button type="submit" class="btn btn-primary" id="exploreBtn">
-                        ✨ <span data-text-key="explore">Explorer le concept</span>
-                    </button>
-                    <button type="button" class="btn" onclick="clearAll()">
-                        🗑️ <span data-text-key="clear">Effacer</span>
-                    </button>
-                </div>
-            </form>
-        </div>
-
-        <div id="status" class="status">
-            <div class="status-text">
-                <span class="loading"></span>
-                <span id="statusText" data-text-key="processing">Analyse en cours...</span>
-            </div>
-            <div class="progress-bar">
-                <div id="progressFill" class="progress-fill"></div>
-            </div>
-        </div>
-
-        <div id="result" class="result">
-            <div class="result-header">
-                <div class="result-title" id="resultTitle">📖 <span data-text-key="generated_explanation">Explication générée</span></div>
-                <button class="copy-btn" id="copyBtn" onclick="copyResult()" title="Copier">
-                    📋
-                </button>
-            </div>
-            <div class="result-meta" id="resultMeta"></div>
-            <div class="result-content" id="resultContent"></div>
-        </div>
-    </div>
-
-    <script>
-        let isProcessing = false;
-        let currentDetail = 'moyen';
-        let currentLanguage = 'fr';
-        let currentTheme = 'light';
-        
-        const translations = {
-            fr: {
-                title: "🔢 Mathia",
-                subtitle: "Explorateur de concepts mathématiques avec IA",
-                search_concept: "Concept à explorer",
-                search_placeholder: "Fonction, dérivée, probabilité, matrice...",
-                popular_suggestions: "Suggestions populaires:",
-                detail_level: "Niveau de détail",
-                short: "Court",
-                medium: "Moyen",
-                long: "Détaillé",
-                short_desc: "150-200 mots",
-                medium_desc: "300-400 mots", 
-                long_desc: "500-600 mots",
-                explore: "Explorer le concept",
-                clear: "Effacer",
-                processing: "Analyse en cours...",
-                generated_explanation: "Explication générée",
-                requests: "requêtes",
-                cached: "en cache",
-                concepts: "concepts",
-                analyzing: "Analyse...",
-                generating: "Génération IA...",
-                completed: "Terminé !",
-                copied: "Copié !",
-                copy_error: "Échec de la copie",
-                processing_concept: "Exploration en cours...",
-                already_processing: "Une exploration est déjà en cours...",
-                invalid_concept: "Veuillez entrer un concept valide (minimum 2 caractères)",
-                explanation_generated: "Explication générée par Mistral AI !",
-                processing_error: "Erreur d'exploration",
-                from_cache: "Depuis le cache"
-            },
-            en: {
-                title: "🔢 Mathia",
-                subtitle: "Mathematical concepts explorer with AI",
-                search_concept: "Concept to explore",
-                search_placeholder: "Function, derivative, probability, matrix...",
-                popular_suggestions: "Popular suggestions:",
-                detail_level: "Detail level",
-                short: "Short",
-                medium: "Medium",
-                long: "Detailed",
-                short_desc: "150-200 words",
-                medium_desc: "300-400 words",
-                long_desc: "500-600 words",
-                explore: "Explore concept",
-                clear: "Clear",
-                processing: "Analyzing...",
-                generated_explanation: "Generated explanation",
-                requests: "requests",
-                cached: "cached",
-                concepts: "concepts",
-                analyzing: "Analyzing...",
-                generating: "AI generating...",
-                completed: "Completed!",
-                copied: "Copied!",
-                copy_error: "Copy failed",
-                processing_concept: "Exploration in progress...",
-                already_processing: "An exploration is already running...",
-                invalid_concept: "Please enter a valid concept (minimum 2 characters)",
-                explanation_generated: "Explanation generated by Mistral AI!",
-                processing_error: "Exploration error",
-                from_cache: "From cache"
-            },
-            es: {
-                title: "🔢 Mathia",
-                subtitle: "Explorador de conceptos matemáticos con IA",
-                search_concept: "Concepto a explorar",
-                search_placeholder: "Función, derivada, probabilidad, matriz...",
-                popular_suggestions: "Sugerencias populares:",
-                detail_level: "Nivel de detalle",
-                short: "Corto",
-                medium: "Medio",
-                long: "Detallado",
-                short_desc: "150-200 palabras",
-                medium_desc: "300-400 palabras",
-                long_desc: "500-600 palabras",
-                explore: "Explorar concepto",
-                clear: "Limpiar",
-                processing: "Analizando...",
-                generated_explanation: "Explicación generada",
-                requests: "solicitudes",
-                cached: "en caché", 
-                concepts: "conceptos",
-                analyzing: "Analizando...",
-                generating: "Generando IA...",
-                completed: "¡Completado!",
-                copied: "¡Copiado!",
-                copy_error: "Error al copiar",
-                processing_concept: "Exploración en curso...",
-                already_processing: "Ya hay una exploración en ejecución...",
-                invalid_concept: "Por favor ingrese un concepto válido (mínimo 2 caracteres)",
-                explanation_generated: "¡Explicación generada por Mistral AI!",
-                processing_error: "Error de exploración",
-                from_cache: "Desde caché"
-            }
-        };
-
-        const popularConcepts = {
-            fr: ["Fonction", "Dérivée", "Intégrale", "Matrice", "Probabilité", "Limite", "Vecteur", "Équation"],
-            en: ["Function", "Derivative", "Integral", "Matrix", "Probability", "Limit", "Vector", "Equation"],
-            es: ["Función", "Derivada", "Integral", "Matriz", "Probabilidad", "Límite", "Vector", "Ecuación"]
-        };
-
-        document.addEventListener('DOMContentLoaded', function() {
-            initializeApp();
-        });
-
-        function initializeApp() {
-            console.log('🚀 Mathia Explorer v5.1 - PRODUCTION (Fixed)');
-            loadTheme();
-            loadLanguage();
-            initializeSuggestions();
-            loadStats();
-            updateTranslations();
-            
-            const conceptInput = document.getElementById('concept');
-            if (conceptInput) conceptInput.focus();
-        }
-
-        function loadTheme() {
-            const savedTheme = localStorage.getItem('mathia_theme') || 'light';
-            currentTheme = savedTheme;
-            if (currentTheme === 'dark') {
-                document.body.setAttribute('data-theme', 'dark');
-            }
-            updateThemeToggle();
-        }
-
-        function loadLanguage() {
-            const savedLanguage = localStorage.getItem('mathia_language') || 'fr';
-            currentLanguage = savedLanguage;
-            const selector = document.getElementById('languageSelector');
-            if (selector) selector.value = currentLanguage;
-            updateTranslations();
-        }
-
-        function toggleTheme() {
-            currentTheme = currentTheme === 'light' ? 'dark' : 'light';
-            
-            if (currentTheme === 'dark') {
-                document.body.setAttribute('data-theme', 'dark');
-            } else {
-                document.body.removeAttribute('data-theme');
-            }
-            
-            localStorage.setItem('mathia_theme', currentTheme);
-            updateThemeToggle();
-        }
-
-        function updateThemeToggle() {
-            const toggle = document.getElementById('themeToggle');
-            if (toggle) {
-                toggle.textContent = currentTheme === 'light' ? '🌙' : '☀️';
-            }
-        }
-
-        function changeLanguage() {
-            const selector = document.getElementById('languageSelector');
-            if (selector) {
-                currentLanguage = selector.value;
-                localStorage.setItem('mathia_language', currentLanguage);
-            }
-            updateTranslations();
-            initializeSuggestions();
-        }
-
-        function updateTranslations() {
-            const elements = document.querySelectorAll('[data-text-key]');
-            elements.forEach(element => {
-                const key = element.getAttribute('data-text-key');
-                if (translations[currentLanguage] && translations[currentLanguage][key]) {
-                    element.textContent = translations[currentLanguage][key];
-                }
-            });
-
-            const conceptInput = document.getElementById('concept');
-            if (conceptInput && translations[currentLanguage].search_placeholder) {
-                conceptInput.placeholder = translations[currentLanguage].search_placeholder;
-            }
-        }
-
-        function selectDetail(detail, element) {
-            document.querySelectorAll('.detail-btn').forEach(btn => btn.classList.remove('active'));
-            element.classList.add('active');
-            currentDetail = detail;
-        }
-
-        function copyResult() {
-            const content = document.getElementById('resultContent');
-            const copyBtn = document.getElementById('copyBtn');
-            
-            if (!content || !content.textContent) {
-                showNotification(translations[currentLanguage].copy_error, 'error');
-                return;
-            }
-
-            const textContent = content.textContent || content.innerText;
-            
-            navigator.clipboard.writeText(textContent).then(function() {
-                copyBtn.textContent = '✅';
-                showNotification(translations[currentLanguage].copied, 'success');
-                
-                setTimeout(() => {
-                    copyBtn.textContent = '📋';
-                }, 2000);
-            }).catch(function() {
-                showNotification(translations[currentLanguage].copy_error, 'error');
-            });
-        }
-
-        function handleFormSubmit(event) {
-            event.preventDefault();
-            console.log('📝 Formulaire soumis');
-            
-            if (isProcessing) {
-                showNotification(translations[currentLanguage].already_processing, 'info');
-                return false;
-            }
-
-            const conceptInput = document.getElementById('concept');
-            const concept = conceptInput ? conceptInput.value.trim() : '';
-            
-            console.log('🔍 Concept:', concept);
-            
-            if (!concept || concept.length < 2) {
-                showNotification(translations[currentLanguage].invalid_concept, 'error');
-                if (conceptInput) conceptInput.focus();
-                return false;
-            }
-
-            processConcept(concept, currentLanguage, currentDetail);
-            return false;
-        }
-
-        function initializeSuggestions() {
-            const container = document.getElementById('suggestionChips');
-            if (!container) return;
-            
-            container.innerHTML = '';
-            const concepts = popularConcepts[currentLanguage] || popularConcepts.fr;
-            
-            concepts.forEach(concept => {
-                const chip = document.createElement('button');
-                chip.className = 'chip';
-                chip.textContent = concept;
-                chip.type = 'button';
-                chip.onclick = function() {
-                    const conceptInput = document.getElementById('concept');
-                    if (conceptInput) {
-                        conceptInput.value = concept;
-                        conceptInput.focus();
-                    }
-                };
-                container.appendChild(chip);
-            });
-        }
-
-        async function loadStats() {
-            try {
-                const response = await fetch('/api/stats');
-                if (response.ok) {
-                    const stats = await response.json();
-                    console.log('📊 Stats chargées:', stats);
-                    updateStatsDisplay(stats);
-                }
-            } catch (error) {
-                console.log('⚠️ Erreur chargement stats:', error);
-            }
-        }
-
-        function updateStatsDisplay(stats) {
-            const elements = {
-                totalRequests: document.getElementById('totalRequests'),
-                cacheHits: document.getElementById('cacheHits'),
-                conceptsExplored: document.getElementById('conceptsExplored')
-            };
-
-            if (elements.totalRequests) elements.totalRequests.textContent = stats.requests || 0;
-            if (elements.cacheHits) elements.cacheHits.textContent = stats.cache_hits || 0;
-            if (elements.conceptsExplored) elements.conceptsExplored.textContent = stats.concepts_explored || 0;
-        }
-
-        async function processConcept(concept, language, detailLevel) {
-            console.log('🚀 Traitement du concept:', concept);
-            isProcessing = true;
-            const exploreBtn = document.getElementById('exploreBtn');
-            const exploreText = exploreBtn ? exploreBtn.querySelector('[data-text-key="explore"]') : null;
-            
-            if (exploreBtn) {
-                exploreBtn.disabled = true;
-                if (exploreText) exploreText.textContent = translations[currentLanguage].processing_concept;
-            }
-            
-            showStatus(translations[currentLanguage].analyzing);
-            hideResult();
-
-            try {
-                const requestData = {
-                    concept: concept,
-                    language: language,
-                    detail_level: detailLevel
-                };
-                
-                console.log('📤 Envoi requête à Mistral AI:', requestData);
-                
-                updateProgress(20);
-                updateStatus(translations[currentLanguage].analyzing);
-                
-                const response = await fetch('/api/explore', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                        'Accept': 'application/json'
-                    },
-                    body: JSON.stringify(requestData)
-                });
-
-                console.log('📥 Réponse status:', response.status);
-
-                updateProgress(60);
-                updateStatus(translations[currentLanguage].generating);
-
-                if (!response.ok) {
-                    let errorMessage = `HTTP ${response.status}`;
-                    
-                    try {
-                        const errorData = await response.json();
-                        console.error('❌ Erreur API:', errorData);
-                        errorMessage = errorData.error || errorMessage;
-                    } catch (e) {
-                        const errorText = await response.text();
-                        console.error('❌ Erreur texte:', errorText);
-                        errorMessage = errorText.substring(0, 200);
-                    }
-                    
-                    throw new Error(errorMessage);
-                }
-
-                const data = await response.json();
-                console.log('✅ Données reçues de Mistral:', data);
-
-                if (!data.success) {
-                    throw new Error(data.error || 'Erreur inconnue');
-                }
-
-                updateProgress(100);
-                updateStatus(translations[currentLanguage].completed);
-                await sleep(500);
-
-                showResult(data);
-                hideStatus();
+@app.cli.command('build-library')
+@click.option('--concepts', 'concepts_file', type=click.Path(exists=True, dir_okay=False),
+              help="Fichier de concepts: une ligne par concept, 'fr | en | es' ou un nom unique")
+@click.option('--output', default=None, help="Chemin du store binaire (défaut: MATHIA_LIBRARY_PATH)")
+@click.option('--languages', default=','.join(Config.LIBRARY_LANGUAGES), help="Langues à générer")
+@click.option('--levels', default=','.join(Config.LIBRARY_DETAIL_LEVELS), help="Niveaux de détail à générer")
+def build_library(concepts_file, output, languages, levels):
+    """Pré-génère les concepts populaires dans la bibliothèque binaire"""
+    output = output or Config.LIBRARY_PATH
+    languages = [lang.strip() for lang in languages.split(',') if lang.strip() in Config.LIBRARY_LANGUAGES]
+    levels = [level.strip() for level in levels.split(',') if level.strip() in Config.LIBRARY_DETAIL_LEVELS]
+    
+    concepts = LIBRARY_CONCEPTS
+    if concepts_file:
+        with open(concepts_file, encoding='utf-8') as f:
+            lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        concepts = []
+        for line in lines:
+            names = [name.strip() for name in line.split('|')]
+            concepts.append(tuple(names) if len(names) == 3 else (names[0],) * 3)
+    
+    mathia.prefetcher.enabled = False
+    entries = {}
+    failures = 0
+    total = len(concepts) * len(languages) * len(levels)
+    click.echo(f"📚 Génération de {total} explications → {output}")
+    
+    for names in concepts:
+        for language in languages:
+            concept = names[Config.LIBRARY_LANGUAGES.index(language)]
+            for detail_level in levels:
+                result = mathia.process_concept(concept, language, detail_level)
+                if not result.get('success') or result.get('degraded'):
+                    failures += 1
+                    click.echo(f"   ❌ {concept} ({language}, {detail_level}): {result.get('error')}")
+                    continue
                 
-                setTimeout(loadStats, 500);
-                showNotification(translations[currentLanguage].explanation_generated, 'success');
-
-            } catch (error) {
-                console.error('💥 Erreur complète:', error);
-                showNotification(error.message || translations[currentLanguage].processing_error, 'error');
-                hideStatus();
-            } finally {
-                isProcessing = false;
-                if (exploreBtn && exploreText) {
-                    exploreBtn.disabled = false;
-                    exploreText.textContent = translations[currentLanguage].explore;
-                }
-            }
-        }
-
-        function updateProgress(percent) {
-            const progressFill = document.getElementById('progressFill');
-            if (progressFill) progressFill.style.width = percent + '%';
-        }
-
-        function updateStatus(message) {
-            const statusText = document.getElementById('statusText');
-            if (statusText) statusText.textContent = message;
-        }
-
-        function showStatus(message) {
-            updateStatus(message);
-            const statusDiv = document.getElementById('status');
-            if (statusDiv) statusDiv.classList.add('active');
-            updateProgress(0);
-        }
-
-        function hideStatus() {
-            const statusDiv = document.getElementById('status');
-            if (statusDiv) statusDiv.classList.remove('active');
-            setTimeout(() => updateProgress(0), 300);
-        }
-
-        function showResult(data) {
-            const elements = {
-                title: document.getElementById('resultTitle'),
-                content: document.getElementById('resultContent'),
-                meta: document.getElementById('resultMeta'),
-                result: document.getElementById('result')
-            };
-            
-            if (elements.title) {
-                elements.title.innerHTML = '📖 <span data-text-key="generated_explanation">' + 
-                    translations[currentLanguage].generated_explanation + '</span>';
-            }
-            
-            if (elements.content) elements.content.innerHTML = data.explanation;
-            
-            let metaText = `🤖 Mistral AI (${data.model || 'mistral-large'}) • ${data.processing_time}s • ${data.detail_level}`;
-            
-            if (data.from_cache) {
-                metaText += ` • <span class="cache-badge">💾 ${translations[currentLanguage].from_cache}</span>`;
-            }
-            
-            if (elements.meta) elements.meta.innerHTML = metaText;
-
-            if (elements.result) elements.result.classList.add('active');
-        }
-
-        function hideResult() {
-            const resultDiv = document.getElementById('result');
-            if (resultDiv) resultDiv.classList.remove('active');
-        }
-
-        function clearAll() {
-            const conceptInput = document.getElementById('concept');
-            if (conceptInput) {
-                conceptInput.value = '';
-                conceptInput.focus();
-            }
-            hideStatus();
-            hideResult();
-            isProcessing = false;
-            
-            const exploreBtn = document.getElementById('exploreBtn');
-            const exploreText = exploreBtn ? exploreBtn.querySelector('[data-text-key="explore"]') : null;
-            if (exploreBtn) {
-                exploreBtn.disabled = false;
-                if (exploreText) exploreText.textContent = translations[currentLanguage].explore;
-            }
-        }
-
-        function showNotification(message, type = 'info') {
-            document.querySelectorAll('.notification').forEach(n => n.remove());
-            
-            const notification = document.createElement('div');
-            notification.className = `notification ${type}`;
-            notification.textContent = message;
-            
-            document.body.appendChild(notification);
-            setTimeout(() => notification.classList.add('show'), 100);
-            setTimeout(() => {
-                notification.classList.remove('show');
-                setTimeout(() => notification.remove(), 300);
-            }, 3000);
-        }
-
-        function sleep(ms) {
-            return new Promise(resolve => setTimeout(resolve, ms));
-        }
-
-        document.addEventListener('keydown', function(e) {
-            if (e.key === 'Enter' && !e.ctrlKey && !e.metaKey) {
-                const target = e.target;
-                if (target && target.id === 'concept' && !isProcessing && target.value.trim()) {
-                    e.preventDefault();
-                    handleFormSubmit(e);
-                }
-            }
-        });
-
-        console.log('🔗 Test de connexion API Mistral...');
-        fetch('/health')
-            .then(r => r.json())
-            .then(data => {
-                console.log('✅ Health check:', data);
-                console.log(`✅ ${data.api_keys_configured} clé(s) API configurée(s)`);
-            })
-            .catch(e => console.error('❌ Health check échoué:', e));
-    </script>
-</body>
-</html>'''
+                for volatile in MathiaExplorer.VOLATILE_KEYS:
+                    result.pop(volatile, None)
+                entries[mathia.get_cache_key(concept, language, detail_level)] = result
+                click.echo(f"   ✅ {concept} ({language}, {detail_level})")
+    
+    size = ConceptLibrary.write(output, entries, mathia.get_library_fingerprint())
+    click.echo(f"✅ Bibliothèque écrite: {len(entries)} entrées, {size // 1024} Ko, {failures} échec(s)")
+
+@app.cli.command('bench-cache')
+@click.option('--trace', 'trace_file', type=click.Path(exists=True), help="Trace enregistrée (une clé par ligne)")
+@click.option('--requests', 'request_count', default=50000, show_default=True, help="Requêtes synthétiques")
+@click.option('--keys', 'key_count', default=5000, show_default=True, help="Clés distinctes (Zipf)")
+@click.option('--alpha', default=0.9, show_default=True, help="Exposant de la loi de Zipf")
+@click.option('--scan', 'scan_ratio', default=0.3, show_default=True, help="Part de requêtes uniques (balayages)")
+@click.option('--sizes', default='50,100,500', show_default=True, help="Tailles de cache comparées")
+def bench_cache(trace_file, request_count, key_count, alpha, scan_ratio, sizes):
+    """Compare les taux de hit LRU et W-TinyLFU sur une charge Zipf avec balayages"""
+    import random
+    
+    if trace_file:
+        with open(trace_file, encoding='utf-8') as f:
+            trace = [line.strip() for line in f if line.strip()]
+        click.echo(f"📼 Trace: {len(trace)} requêtes, {len(set(trace))} clés distinctes")
+    else:
+        rng = random.Random(42)
+        weights = [1 / (rank ** alpha) for rank in range(1, key_count + 1)]
+        popular = rng.choices(range(key_count), weights=weights, k=request_count)
+        trace = []
+        scan_id = 0
+        for key in popular:
+            if rng.random() < scan_ratio:
+                # Rafale de thèmes vus une seule fois (bots, traitements par lot)
+                for _ in range(rng.randint(1, 20)):
+                    scan_id += 1
+                    trace.append(f"scan-{scan_id}")
+            trace.append(f"key-{key}")
+        click.echo(f"🎲 Zipf(α={alpha}) sur {key_count} clés + balayages: {len(trace)} requêtes")
+    
+    for size in [int(value) for value in sizes.split(',') if value.strip()]:
+        ratios = {}
+        for policy in ('lru', 'tinylfu'):
+            cache = make_cache(policy, size)
+            hits = 0
+            for key in trace:
+                if cache.get(key) is not None:
+                    hits += 1
+                else:
+                    cache.set(key, True)
+            ratios[policy] = hits / len(trace)
+        click.echo(f"   taille {size:>5}: LRU {ratios['lru']:.1%} | W-TinyLFU {ratios['tinylfu']:.1%}")
 
 if __name__ == '__main__':
     print("=" * 70)
@@ -1607,16 +2811,30 @@ if __name__ == '__main__':
         print("   ✅ Fallback automatique sur modèle alternatif")
         print("   ✅ Cache LRU haute performance")
         print("   ✅ Statistiques détaillées par clé")
+        print("   ✅ Calcul sympy/numpy avec cache d'expressions compilées")
+        print("   ✅ Tracés vectorisés adaptatifs (matplotlib Agg)")
         print("   ✅ Support multilingue (FR/EN/ES)")
         print("   ✅ Thème clair/sombre")
         print("   ✅ Clés API codées en fallback")
         
         print("\n📍 Routes:")
         print("   • GET  /            → Interface utilisateur")
-        print("   • POST /api/explore → Exploration de concepts (Mistral AI)")
+        print("   • GET  /static/<f>  → CSS/JS hachés et précompressés (gzip/brotli)")
+        print("   • GET|POST /api/explore → Exploration de concepts (Mistral AI, ETag)")
+        print("   • POST /api/explore/sections → Sections d'une explication (chargement différé)")
+        print("   • POST /api/jobs/explore → Exploration asynchrone (polling /api/jobs/<id>, SSE /events)")
+        print("   • GET  /api/suggest → Autocomplétion des concepts")
+        print("   • POST /api/calculate → Calcul numérique et symbolique")
+        print("   • GET  /api/plot    → Tracé de fonctions (PNG/SVG)")
+        print("   • GET  /api/plot/data → Données de tracé compactes (LTTB, float32)")
         print("   • GET  /api/stats   → Statistiques détaillées")
+        print("   • GET  /api/stats/top → Concepts les plus demandés")
         print("   • GET  /health      → Health check")
         
+        print("\n📚 Bibliothèque de concepts:")
+        print("   • flask --app mathia/app.py build-library → Pré-génération des concepts populaires")
+        print(f"   • Store: {Config.LIBRARY_PATH} ({'chargé' if mathia.library else 'absent'})")
+        
         print("\n🔑 Chargement des clés API:")
         if any(os.environ.get(f'MISTRAL_KEY_{i}') for i in range(1, 4)):
             print("   ✅ Clés depuis variables d'environnement")
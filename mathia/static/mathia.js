@@ -0,0 +1,715 @@
+// Préfixe de montage de l'application (hub Fusia: /mathia), vide en autonome
+const API_BASE = window.location.pathname.replace(/\/+$/, '');
+
+let isProcessing = false;
+let currentDetail = 'moyen';
+let currentLanguage = 'fr';
+let currentTheme = 'light';
+
+const translations = {
+    fr: {
+        title: "🔢 Mathia",
+        subtitle: "Explorateur de concepts mathématiques avec IA",
+        search_concept: "Concept à explorer",
+        search_placeholder: "Fonction, dérivée, probabilité, matrice...",
+        popular_suggestions: "Suggestions populaires:",
+        detail_level: "Niveau de détail",
+        short: "Court",
+        medium: "Moyen",
+        long: "Détaillé",
+        short_desc: "150-200 mots",
+        medium_desc: "300-400 mots", 
+        long_desc: "500-600 mots",
+        explore: "Explorer le concept",
+        clear: "Effacer",
+        processing: "Analyse en cours...",
+        generated_explanation: "Explication générée",
+        requests: "requêtes",
+        cached: "en cache",
+        concepts: "concepts",
+        analyzing: "Analyse...",
+        generating: "Génération IA...",
+        completed: "Terminé !",
+        copied: "Copié !",
+        copy_error: "Échec de la copie",
+        processing_concept: "Exploration en cours...",
+        already_processing: "Une exploration est déjà en cours...",
+        invalid_concept: "Veuillez entrer un concept valide (minimum 2 caractères)",
+        explanation_generated: "Explication générée par Mistral AI !",
+        processing_error: "Erreur d'exploration",
+        from_cache: "Depuis le cache",
+        plot_function: "Tracer une fonction",
+        plot: "Tracer",
+        plot_placeholder: "sin(x), x^2 - 3x, 1/x...",
+        plot_error: "Erreur de tracé"
+    },
+    en: {
+        title: "🔢 Mathia",
+        subtitle: "Mathematical concepts explorer with AI",
+        search_concept: "Concept to explore",
+        search_placeholder: "Function, derivative, probability, matrix...",
+        popular_suggestions: "Popular suggestions:",
+        detail_level: "Detail level",
+        short: "Short",
+        medium: "Medium",
+        long: "Detailed",
+        short_desc: "150-200 words",
+        medium_desc: "300-400 words",
+        long_desc: "500-600 words",
+        explore: "Explore concept",
+        clear: "Clear",
+        processing: "Analyzing...",
+        generated_explanation: "Generated explanation",
+        requests: "requests",
+        cached: "cached",
+        concepts: "concepts",
+        analyzing: "Analyzing...",
+        generating: "AI generating...",
+        completed: "Completed!",
+        copied: "Copied!",
+        copy_error: "Copy failed",
+        processing_concept: "Exploration in progress...",
+        already_processing: "An exploration is already running...",
+        invalid_concept: "Please enter a valid concept (minimum 2 characters)",
+        explanation_generated: "Explanation generated by Mistral AI!",
+        processing_error: "Exploration error",
+        from_cache: "From cache",
+        plot_function: "Plot a function",
+        plot: "Plot",
+        plot_placeholder: "sin(x), x^2 - 3x, 1/x...",
+        plot_error: "Plot error"
+    },
+    es: {
+        title: "🔢 Mathia",
+        subtitle: "Explorador de conceptos matemáticos con IA",
+        search_concept: "Concepto a explorar",
+        search_placeholder: "Función, derivada, probabilidad, matriz...",
+        popular_suggestions: "Sugerencias populares:",
+        detail_level: "Nivel de detalle",
+        short: "Corto",
+        medium: "Medio",
+        long: "Detallado",
+        short_desc: "150-200 palabras",
+        medium_desc: "300-400 palabras",
+        long_desc: "500-600 palabras",
+        explore: "Explorar concepto",
+        clear: "Limpiar",
+        processing: "Analizando...",
+        generated_explanation: "Explicación generada",
+        requests: "solicitudes",
+        cached: "en caché", 
+        concepts: "conceptos",
+        analyzing: "Analizando...",
+        generating: "Generando IA...",
+        completed: "¡Completado!",
+        copied: "¡Copiado!",
+        copy_error: "Error al copiar",
+        processing_concept: "Exploración en curso...",
+        already_processing: "Ya hay una exploración en ejecución...",
+        invalid_concept: "Por favor ingrese un concepto válido (mínimo 2 caracteres)",
+        explanation_generated: "¡Explicación generada por Mistral AI!",
+        processing_error: "Error de exploración",
+        from_cache: "Desde caché",
+        plot_function: "Graficar una función",
+        plot: "Graficar",
+        plot_placeholder: "sin(x), x^2 - 3x, 1/x...",
+        plot_error: "Error de gráfico"
+    }
+};
+
+// Sections affichées immédiatement, les autres sont chargées ensuite
+const FIRST_PAINT_SECTIONS = ['definition', 'explication'];
+
+const popularConcepts = {
+    fr: ["Fonction", "Dérivée", "Intégrale", "Matrice", "Probabilité", "Limite", "Vecteur", "Équation"],
+    en: ["Function", "Derivative", "Integral", "Matrix", "Probability", "Limit", "Vector", "Equation"],
+    es: ["Función", "Derivada", "Integral", "Matriz", "Probabilidad", "Límite", "Vector", "Ecuación"]
+};
+
+document.addEventListener('DOMContentLoaded', function() {
+    initializeApp();
+});
+
+function initializeApp() {
+    console.log('🚀 Mathia Explorer v5.1 - PRODUCTION (Fixed)');
+    loadTheme();
+    loadLanguage();
+    initializeSuggestions();
+    setupAutocomplete();
+    loadStats();
+    updateTranslations();
+
+    const conceptInput = document.getElementById('concept');
+    if (conceptInput) conceptInput.focus();
+}
+
+function loadTheme() {
+    const savedTheme = localStorage.getItem('mathia_theme') || 'light';
+    currentTheme = savedTheme;
+    if (currentTheme === 'dark') {
+        document.body.setAttribute('data-theme', 'dark');
+    }
+    updateThemeToggle();
+}
+
+function loadLanguage() {
+    const savedLanguage = localStorage.getItem('mathia_language') || 'fr';
+    currentLanguage = savedLanguage;
+    const selector = document.getElementById('languageSelector');
+    if (selector) selector.value = currentLanguage;
+    updateTranslations();
+}
+
+function toggleTheme() {
+    currentTheme = currentTheme === 'light' ? 'dark' : 'light';
+
+    if (currentTheme === 'dark') {
+        document.body.setAttribute('data-theme', 'dark');
+    } else {
+        document.body.removeAttribute('data-theme');
+    }
+
+    localStorage.setItem('mathia_theme', currentTheme);
+    updateThemeToggle();
+}
+
+function updateThemeToggle() {
+    const toggle = document.getElementById('themeToggle');
+    if (toggle) {
+        toggle.textContent = currentTheme === 'light' ? '🌙' : '☀️';
+    }
+}
+
+function changeLanguage() {
+    const selector = document.getElementById('languageSelector');
+    if (selector) {
+        currentLanguage = selector.value;
+        localStorage.setItem('mathia_language', currentLanguage);
+    }
+    updateTranslations();
+    initializeSuggestions();
+}
+
+function updateTranslations() {
+    const elements = document.querySelectorAll('[data-text-key]');
+    elements.forEach(element => {
+        const key = element.getAttribute('data-text-key');
+        if (translations[currentLanguage] && translations[currentLanguage][key]) {
+            element.textContent = translations[currentLanguage][key];
+        }
+    });
+
+    const conceptInput = document.getElementById('concept');
+    if (conceptInput && translations[currentLanguage].search_placeholder) {
+        conceptInput.placeholder = translations[currentLanguage].search_placeholder;
+    }
+
+    const graphInput = document.getElementById('graphExpression');
+    if (graphInput && translations[currentLanguage].plot_placeholder) {
+        graphInput.placeholder = translations[currentLanguage].plot_placeholder;
+    }
+}
+
+function selectDetail(detail, element) {
+    document.querySelectorAll('.detail-btn').forEach(btn => btn.classList.remove('active'));
+    element.classList.add('active');
+    currentDetail = detail;
+}
+
+function copyResult() {
+    const content = document.getElementById('resultContent');
+    const copyBtn = document.getElementById('copyBtn');
+
+    if (!content || !content.textContent) {
+        showNotification(translations[currentLanguage].copy_error, 'error');
+        return;
+    }
+
+    const textContent = content.textContent || content.innerText;
+
+    navigator.clipboard.writeText(textContent).then(function() {
+        copyBtn.textContent = '✅';
+        showNotification(translations[currentLanguage].copied, 'success');
+
+        setTimeout(() => {
+            copyBtn.textContent = '📋';
+        }, 2000);
+    }).catch(function() {
+        showNotification(translations[currentLanguage].copy_error, 'error');
+    });
+}
+
+function handleFormSubmit(event) {
+    event.preventDefault();
+    console.log('📝 Formulaire soumis');
+    hideSuggestions();
+
+    if (isProcessing) {
+        showNotification(translations[currentLanguage].already_processing, 'info');
+        return false;
+    }
+
+    const conceptInput = document.getElementById('concept');
+    const concept = conceptInput ? conceptInput.value.trim() : '';
+
+    console.log('🔍 Concept:', concept);
+
+    if (!concept || concept.length < 2) {
+        showNotification(translations[currentLanguage].invalid_concept, 'error');
+        if (conceptInput) conceptInput.focus();
+        return false;
+    }
+
+    processConcept(concept, currentLanguage, currentDetail);
+    return false;
+}
+
+// Autocomplétion: requêtes espacées (debounce) et réponses obsolètes annulées
+const SUGGEST_DELAY = 200;
+let suggestTimer = null;
+let suggestController = null;
+let suggestIndex = -1;
+
+function setupAutocomplete() {
+    const input = document.getElementById('concept');
+    if (!input) return;
+
+    input.addEventListener('input', function() {
+        clearTimeout(suggestTimer);
+        suggestTimer = setTimeout(() => fetchSuggestions(input.value), SUGGEST_DELAY);
+    });
+    input.addEventListener('keydown', handleAutocompleteKey);
+    input.addEventListener('blur', () => setTimeout(hideSuggestions, 150));
+}
+
+async function fetchSuggestions(query) {
+    if (suggestController) suggestController.abort();
+    if (query.trim().length < 2) {
+        hideSuggestions();
+        return;
+    }
+
+    suggestController = new AbortController();
+    try {
+        const params = new URLSearchParams({ q: query, language: currentLanguage });
+        const response = await fetch(API_BASE + '/api/suggest?' + params.toString(), { signal: suggestController.signal });
+        const data = await response.json();
+        renderSuggestions(data.suggestions || []);
+    } catch (error) {
+        if (error.name !== 'AbortError') console.log('⚠️ Erreur autocomplétion:', error);
+    }
+}
+
+function renderSuggestions(items) {
+    const list = document.getElementById('autocompleteList');
+    if (!list) return;
+
+    suggestIndex = -1;
+    list.innerHTML = '';
+    items.forEach(item => {
+        const option = document.createElement('div');
+        option.className = 'autocomplete-item';
+        option.textContent = item;
+        option.onmousedown = function(e) {
+            e.preventDefault();
+            selectSuggestion(item);
+        };
+        list.appendChild(option);
+    });
+    list.classList.toggle('active', items.length > 0);
+}
+
+function selectSuggestion(item) {
+    const input = document.getElementById('concept');
+    if (input) {
+        input.value = item;
+        input.focus();
+    }
+    hideSuggestions();
+}
+
+function hideSuggestions() {
+    clearTimeout(suggestTimer);
+    if (suggestController) suggestController.abort();
+    const list = document.getElementById('autocompleteList');
+    if (list) list.classList.remove('active');
+    suggestIndex = -1;
+}
+
+function handleAutocompleteKey(e) {
+    const list = document.getElementById('autocompleteList');
+    const items = list ? list.querySelectorAll('.autocomplete-item') : [];
+    if (!list || !list.classList.contains('active') || items.length === 0) return;
+
+    if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+        e.preventDefault();
+        const step = e.key === 'ArrowDown' ? 1 : -1;
+        suggestIndex = (suggestIndex + step + items.length) % items.length;
+        items.forEach((item, i) => item.classList.toggle('selected', i === suggestIndex));
+    } else if (e.key === 'Enter' && suggestIndex >= 0) {
+        e.preventDefault();
+        e.stopPropagation();
+        selectSuggestion(items[suggestIndex].textContent);
+    } else if (e.key === 'Escape') {
+        hideSuggestions();
+    }
+}
+
+function initializeSuggestions() {
+    const container = document.getElementById('suggestionChips');
+    if (!container) return;
+
+    container.innerHTML = '';
+    const concepts = popularConcepts[currentLanguage] || popularConcepts.fr;
+
+    concepts.forEach(concept => {
+        const chip = document.createElement('button');
+        chip.className = 'chip';
+        chip.textContent = concept;
+        chip.type = 'button';
+        chip.onclick = function() {
+            const conceptInput = document.getElementById('concept');
+            if (conceptInput) {
+                conceptInput.value = concept;
+                conceptInput.focus();
+            }
+        };
+        container.appendChild(chip);
+    });
+}
+
+async function loadStats() {
+    try {
+        const response = await fetch(API_BASE + '/api/stats');
+        if (response.ok) {
+            const stats = await response.json();
+            console.log('📊 Stats chargées:', stats);
+            updateStatsDisplay(stats);
+        }
+    } catch (error) {
+        console.log('⚠️ Erreur chargement stats:', error);
+    }
+}
+
+function updateStatsDisplay(stats) {
+    const elements = {
+        totalRequests: document.getElementById('totalRequests'),
+        cacheHits: document.getElementById('cacheHits'),
+        conceptsExplored: document.getElementById('conceptsExplored')
+    };
+
+    if (elements.totalRequests) elements.totalRequests.textContent = stats.requests || 0;
+    if (elements.cacheHits) elements.cacheHits.textContent = stats.cache_hits || 0;
+    if (elements.conceptsExplored) elements.conceptsExplored.textContent = stats.concepts_explored || 0;
+}
+
+async function processConcept(concept, language, detailLevel) {
+    console.log('🚀 Traitement du concept:', concept);
+    isProcessing = true;
+    const exploreBtn = document.getElementById('exploreBtn');
+    const exploreText = exploreBtn ? exploreBtn.querySelector('[data-text-key="explore"]') : null;
+
+    if (exploreBtn) {
+        exploreBtn.disabled = true;
+        if (exploreText) exploreText.textContent = translations[currentLanguage].processing_concept;
+    }
+
+    showStatus(translations[currentLanguage].analyzing);
+    hideResult();
+
+    try {
+        const requestData = {
+            concept: concept,
+            language: language,
+            detail_level: detailLevel,
+            sections: FIRST_PAINT_SECTIONS.join(',')
+        };
+
+        console.log('📤 Envoi requête à Mistral AI:', requestData);
+
+        updateProgress(20);
+        updateStatus(translations[currentLanguage].analyzing);
+
+        // GET: les vues répétées sont servies par le cache HTTP (ETag / 304)
+        const response = await fetch(API_BASE + '/api/explore?' + new URLSearchParams(requestData).toString(), {
+            headers: { 'Accept': 'application/json' }
+        });
+
+        console.log('📥 Réponse status:', response.status);
+
+        updateProgress(60);
+        updateStatus(translations[currentLanguage].generating);
+
+        if (!response.ok) {
+            let errorMessage = `HTTP ${response.status}`;
+
+            try {
+                const errorData = await response.json();
+                console.error('❌ Erreur API:', errorData);
+                errorMessage = errorData.error || errorMessage;
+            } catch (e) {
+                const errorText = await response.text();
+                console.error('❌ Erreur texte:', errorText);
+                errorMessage = errorText.substring(0, 200);
+            }
+
+            throw new Error(errorMessage);
+        }
+
+        const data = await response.json();
+        console.log('✅ Données reçues de Mistral:', data);
+
+        if (!data.success) {
+            throw new Error(data.error || 'Erreur inconnue');
+        }
+
+        updateProgress(100);
+        updateStatus(translations[currentLanguage].completed);
+        await sleep(500);
+
+        showResult(data);
+        hideStatus();
+        loadPendingSections(concept, language, detailLevel, data.pending_sections);
+
+        setTimeout(loadStats, 500);
+        showNotification(translations[currentLanguage].explanation_generated, 'success');
+
+    } catch (error) {
+        console.error('💥 Erreur complète:', error);
+        showNotification(error.message || translations[currentLanguage].processing_error, 'error');
+        hideStatus();
+    } finally {
+        isProcessing = false;
+        if (exploreBtn && exploreText) {
+            exploreBtn.disabled = false;
+            exploreText.textContent = translations[currentLanguage].explore;
+        }
+    }
+}
+
+function updateProgress(percent) {
+    const progressFill = document.getElementById('progressFill');
+    if (progressFill) progressFill.style.width = percent + '%';
+}
+
+function updateStatus(message) {
+    const statusText = document.getElementById('statusText');
+    if (statusText) statusText.textContent = message;
+}
+
+function showStatus(message) {
+    updateStatus(message);
+    const statusDiv = document.getElementById('status');
+    if (statusDiv) statusDiv.classList.add('active');
+    updateProgress(0);
+}
+
+function hideStatus() {
+    const statusDiv = document.getElementById('status');
+    if (statusDiv) statusDiv.classList.remove('active');
+    setTimeout(() => updateProgress(0), 300);
+}
+
+function showResult(data) {
+    const elements = {
+        title: document.getElementById('resultTitle'),
+        content: document.getElementById('resultContent'),
+        meta: document.getElementById('resultMeta'),
+        result: document.getElementById('result')
+    };
+
+    if (elements.title) {
+        elements.title.innerHTML = '📖 <span data-text-key="generated_explanation">' + 
+            translations[currentLanguage].generated_explanation + '</span>';
+    }
+
+    if (elements.content) {
+        elements.content.innerHTML = data.explanation !== undefined ? data.explanation : renderSections(data.sections);
+    }
+
+    let metaText = `🤖 Mistral AI (${data.model || 'mistral-large'}) • ${data.processing_time}s • ${data.detail_level}`;
+
+    if (data.from_cache) {
+        metaText += ` • <span class="cache-badge">💾 ${translations[currentLanguage].from_cache}</span>`;
+    }
+
+    if (elements.meta) elements.meta.innerHTML = metaText;
+
+    if (elements.result) elements.result.classList.add('active');
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+function renderSections(sections) {
+    return Object.values(sections || {}).map(section =>
+        (section.title ? '<h2>' + escapeHtml(section.title) + '</h2>\n' : '') + section.html
+    ).join('\n');
+}
+
+async function loadPendingSections(concept, language, detailLevel, pending) {
+    if (!pending || pending.length === 0) return;
+
+    const content = document.getElementById('resultContent');
+    const placeholder = document.createElement('div');
+    placeholder.className = 'pending-sections';
+    placeholder.innerHTML = '<span class="loading"></span>';
+    content.appendChild(placeholder);
+
+    try {
+        const response = await fetch(API_BASE + '/api/explore/sections', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+            body: JSON.stringify({ concept: concept, language: language, detail_level: detailLevel, sections: pending })
+        });
+        const data = await response.json();
+        if (!response.ok || !data.success) throw new Error(data.error || 'HTTP ' + response.status);
+        placeholder.outerHTML = renderSections(data.sections);
+    } catch (error) {
+        console.error('❌ Erreur chargement sections:', error);
+        placeholder.remove();
+    }
+}
+
+function hideResult() {
+    const resultDiv = document.getElementById('result');
+    if (resultDiv) resultDiv.classList.remove('active');
+}
+
+function clearAll() {
+    const conceptInput = document.getElementById('concept');
+    if (conceptInput) {
+        conceptInput.value = '';
+        conceptInput.focus();
+    }
+    hideStatus();
+    hideResult();
+    isProcessing = false;
+
+    const exploreBtn = document.getElementById('exploreBtn');
+    const exploreText = exploreBtn ? exploreBtn.querySelector('[data-text-key="explore"]') : null;
+    if (exploreBtn) {
+        exploreBtn.disabled = false;
+        if (exploreText) exploreText.textContent = translations[currentLanguage].explore;
+    }
+}
+
+function showNotification(message, type = 'info') {
+    document.querySelectorAll('.notification').forEach(n => n.remove());
+
+    const notification = document.createElement('div');
+    notification.className = `notification ${type}`;
+    notification.textContent = message;
+
+    document.body.appendChild(notification);
+    setTimeout(() => notification.classList.add('show'), 100);
+    setTimeout(() => {
+        notification.classList.remove('show');
+        setTimeout(() => notification.remove(), 300);
+    }, 3000);
+}
+
+function decodeFloat32(base64) {
+    const binary = atob(base64);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    return new Float32Array(bytes.buffer);
+}
+
+async function handleGraphSubmit(event) {
+    event.preventDefault();
+
+    const expression = document.getElementById('graphExpression').value.trim();
+    if (!expression) return false;
+
+    const canvas = document.getElementById('graphCanvas');
+    const width = canvas.clientWidth || 800;
+    const params = new URLSearchParams({
+        expression: expression,
+        xmin: document.getElementById('graphXmin').value || -10,
+        xmax: document.getElementById('graphXmax').value || 10,
+        points: Math.min(2000, Math.max(100, Math.round(width)))
+    });
+
+    try {
+        const response = await fetch(API_BASE + '/api/plot/data?' + params.toString());
+        const data = await response.json();
+        if (!response.ok || !data.success) {
+            throw new Error(data.error || translations[currentLanguage].plot_error);
+        }
+        drawGraph(canvas, decodeFloat32(data.x), decodeFloat32(data.y), data);
+    } catch (error) {
+        console.error('❌ Erreur tracé:', error);
+        showNotification(error.message || translations[currentLanguage].plot_error, 'error');
+    }
+    return false;
+}
+
+function drawGraph(canvas, xs, ys, data) {
+    canvas.classList.add('active');
+    const ratio = window.devicePixelRatio || 1;
+    const width = canvas.clientWidth;
+    const height = canvas.clientHeight;
+    canvas.width = width * ratio;
+    canvas.height = height * ratio;
+
+    const ctx = canvas.getContext('2d');
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+    ctx.clearRect(0, 0, width, height);
+
+    const styles = getComputedStyle(document.body);
+    let [ymin, ymax] = data.y_range || [-1, 1];
+    const margin = (ymax - ymin) * 0.15 || 1;
+    ymin -= margin;
+    ymax += margin;
+
+    const px = x => (x - data.xmin) / (data.xmax - data.xmin) * width;
+    const py = y => height - (y - ymin) / (ymax - ymin) * height;
+
+    // Axes
+    ctx.strokeStyle = styles.getPropertyValue('--border-color-strong') || '#94a3b8';
+    ctx.lineWidth = 1;
+    ctx.beginPath();
+    if (data.xmin < 0 && data.xmax > 0) { ctx.moveTo(px(0), 0); ctx.lineTo(px(0), height); }
+    if (ymin < 0 && ymax > 0) { ctx.moveTo(0, py(0)); ctx.lineTo(width, py(0)); }
+    ctx.stroke();
+
+    // Courbe (coupée sur les NaN: asymptotes et discontinuités)
+    ctx.strokeStyle = styles.getPropertyValue('--text-primary') || '#ffffff';
+    ctx.lineWidth = 2;
+    ctx.beginPath();
+    let drawing = false;
+    for (let i = 0; i < xs.length; i++) {
+        if (!Number.isFinite(ys[i])) { drawing = false; continue; }
+        const cy = Math.max(-height, Math.min(2 * height, py(ys[i])));
+        if (drawing) ctx.lineTo(px(xs[i]), cy); else ctx.moveTo(px(xs[i]), cy);
+        drawing = true;
+    }
+    ctx.stroke();
+}
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Enter' && !e.ctrlKey && !e.metaKey) {
+        const target = e.target;
+        if (target && target.id === 'concept' && !isProcessing && target.value.trim()) {
+            e.preventDefault();
+            handleFormSubmit(e);
+        }
+    }
+});
+
+console.log('🔗 Test de connexion API Mistral...');
+fetch(API_BASE + '/health')
+    .then(r => r.json())
+    .then(data => {
+        console.log('✅ Health check:', data);
+        console.log(`✅ ${data.api_keys_configured} clé(s) API configurée(s)`);
+    })
+    .catch(e => console.error('❌ Health check échoué:', e));
@@ -0,0 +1,30 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+@pytest.fixture(scope='session')
+def mathia_module(tmp_path_factory):
+    """Charge mathia/app.py hors ligne (clé factice, ni bibliothèque, ni préchargement, ni snapshot)"""
+    os.environ.setdefault('MISTRAL_KEY_1', 'cle-de-test-factice')
+    os.environ['MATHIA_LIBRARY_PATH'] = str(tmp_path_factory.mktemp('mathia') / 'absente.bin')
+    os.environ['MATHIA_PREFETCH'] = '0'
+    os.environ['MATHIA_SNAPSHOT'] = '0'
+    spec = importlib.util.spec_from_file_location('mathia_app', os.path.join(REPO_DIR, 'mathia', 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def hub_module():
+    """Importe le hub sans le thread de préchauffage des sous-applications"""
+    os.environ['FUSIA_WARMUP'] = '0'
+    import app
+    return app
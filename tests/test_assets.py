@@ -0,0 +1,31 @@
+import pytest
+from flask import Flask
+
+from fusia_common import StaticAssets
+
+
+@pytest.fixture
+def assets(tmp_path):
+    (tmp_path / 'index.html').write_text('<script src="static/app.js"></script>', encoding='utf-8')
+    (tmp_path / 'app.js').write_text('console.log("fusia");\n' * 200, encoding='utf-8')
+    return StaticAssets(str(tmp_path))
+
+
+@pytest.mark.parametrize('accept, encoding', [('gzip', 'gzip'), ('gzip;q=0', None), ('', None)])
+def test_each_encoding_has_its_own_etag(assets, accept, encoding):
+    app = Flask(__name__)
+    with app.test_request_context('/', headers={'Accept-Encoding': accept}):
+        response = assets.respond('app.js')
+    assert response.headers.get('Content-Encoding') == encoding
+    etags = {response.headers['ETag']}
+
+    for other in ('gzip', ''):
+        with app.test_request_context('/', headers={'Accept-Encoding': other}):
+            etags.add(assets.respond('app.js').headers['ETag'])
+    assert len(etags) == 2
+
+    for other in etags - {response.headers['ETag']}:
+        with app.test_request_context('/', headers={'Accept-Encoding': accept, 'If-None-Match': other}):
+            assert assets.respond('app.js').status_code == 200
+    with app.test_request_context('/', headers={'Accept-Encoding': accept, 'If-None-Match': response.headers['ETag']}):
+        assert assets.respond('app.js').status_code == 304
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+from flask import Flask
+
+from fusia_common import LRUCache, ResponseCache, TinyLFUCache
+
+
+def fill_then_scan(cache):
+    for i in range(100):
+        cache.set(f'populaire-{i}', i)
+    for _ in range(5):
+        for i in range(100):
+            cache.get(f'populaire-{i}')
+
+    for i in range(1000):
+        cache.get(f'balayage-{i}')  # miss compté par le sketch
+        cache.set(f'balayage-{i}', i)
+    return sum(bool(cache.peek(f'populaire-{i}')) for i in range(100))
+
+
+def test_window_is_one_percent_with_a_floor():
+    assert TinyLFUCache(max_size=100).window_size == 4
+    assert TinyLFUCache(max_size=1000).window_size == 10
+
+
+def test_scan_does_not_evict_popular_entries():
+    random.seed(0)
+    cache = TinyLFUCache(max_size=100)
+    assert fill_then_scan(cache) >= 75
+    assert cache.stats['rejected'] > cache.stats['admitted']
+    assert fill_then_scan(LRUCache(max_size=100)) == 0
+
+
+def test_ties_do_not_block_new_entries():
+    random.seed(0)
+    cache = TinyLFUCache(max_size=100)
+    for i in range(300):
+        cache.set(f'unique-{i}', i)  # aucune lecture: fréquences toutes à égalité
+
+    assert cache.size() == 100
+    assert cache.stats['admitted'] > 0
+    assert cache.stats['rejected'] > 0
+
+
+@pytest.mark.parametrize('accept, encoding, suffix', [
+    ('gzip, deflate', 'gzip', '-gz'),
+    ('gzip;q=0, deflate', None, ''),
+    ('', None, ''),
+])
+def test_response_cache_etag_depends_on_encoding(accept, encoding, suffix):
+    cache = ResponseCache()
+    entry = cache.encode({'answer': 42})
+    app = Flask(__name__)
+
+    with app.test_request_context('/', headers={'Accept-Encoding': accept}):
+        response = cache.respond(entry)
+    assert response.headers.get('Content-Encoding') == encoding
+    assert response.headers['ETag'] == f'"{entry["etag"]}{suffix}"'
+
+    other = f'"{entry["etag"]}"' if suffix else f'"{entry["etag"]}-gz"'
+    with app.test_request_context('/', headers={'Accept-Encoding': accept, 'If-None-Match': other}):
+        assert cache.respond(entry).status_code == 200
+    with app.test_request_context('/', headers={'Accept-Encoding': accept, 'If-None-Match': response.headers['ETag']}):
+        assert cache.respond(entry).status_code == 304
@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.fixture
+def canonicalizer(mathia_module):
+    return mathia_module.ConceptCanonicalizer(mathia_module.LIBRARY_CONCEPTS, mathia_module.CONCEPT_ALIASES)
+
+
+@pytest.mark.parametrize('concept, canonical', [
+    ('Suites géométriques', 'Suite géométrique'),
+    ('geometric sequences', 'Suite géométrique'),
+    ('Progresiones geométricas', 'Suite géométrique'),
+    ('NOMBRES COMPLEXES', 'Nombres complexes'),
+])
+def test_accents_case_and_plurals_share_the_key(canonicalizer, concept, canonical):
+    assert canonicalizer.canonicalize(concept) == canonicalizer.canonicalize(canonical)
+
+
+def test_close_but_distinct_concepts_keep_their_own_key(canonicalizer):
+    complex_numbers = canonicalizer.canonicalize('Nombres complexes')
+    assert canonicalizer.canonicalize('Nombres complexes conjugués') != complex_numbers
+    # Faute de frappe: proposée en suggestion, jamais fusionnée dans la clé
+    assert canonicalizer.canonicalize('Nombres complexs') != complex_numbers
+    assert canonicalizer.suggest('Nombres complexs') == complex_numbers
+
+
+def test_suggest_endpoint_falls_back_to_the_closest_concept(mathia_module):
+    client = mathia_module.app.test_client()
+    response = client.get('/api/suggest', query_string={'q': 'Nombres complexs', 'language': 'fr'})
+    assert response.get_json()['suggestions'] == ['Nombres complexes']
@@ -0,0 +1,38 @@
+import gc
+import warnings
+
+
+def test_rejected_library_closes_its_file(mathia_module, tmp_path):
+    library = mathia_module.ConceptLibrary
+    path = str(tmp_path / 'library.bin')
+    library.write(path, {'0' * 32: {'success': True}}, 'a' * 32)
+    (tmp_path / 'truncated.bin').write_bytes(b'MATHLIB')
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', ResourceWarning)
+        assert library.load(path, 'b' * 32) is None
+        assert library.load(str(tmp_path / 'truncated.bin'), 'a' * 32) is None
+        gc.collect()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+    loaded = library.load(path, 'a' * 32)
+    assert loaded is not None and loaded.count == 1
+
+
+def test_header_count_beyond_the_file_is_rejected(mathia_module, tmp_path):
+    library = mathia_module.ConceptLibrary
+    path = tmp_path / 'library.bin'
+    library.write(str(path), {'0' * 32: {'success': True}}, 'a' * 32)
+
+    # Nombre d'entrées corrompu: l'index annoncé dépasse le fichier
+    data = bytearray(path.read_bytes())
+    header = list(library.HEADER.unpack_from(data, 0))
+    header[3] = 10 ** 6
+    library.HEADER.pack_into(data, 0, *header)
+    path.write_bytes(bytes(data))
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', ResourceWarning)
+        assert library.load(str(path), 'a' * 32) is None
+        gc.collect()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
@@ -0,0 +1,40 @@
+import pytest
+
+from fusia_common import LRUCache
+
+
+def make_entry(concept):
+    return {'success': True, 'concept': concept, 'sections': {}, 'detail_level': 'moyen', 'language': 'fr'}
+
+
+def test_paid_entries_skip_popularity_admission(mathia_module, monkeypatch):
+    mathia = mathia_module.mathia
+    monkeypatch.setattr(mathia, 'cache', LRUCache(max_size=1))
+    mathia.cache.set('populaire', make_entry('Populaire'))
+    mathia.popularity.record('populaire', {'concept': 'populaire'}, weight=50)
+
+    # Une entrée dérivée ou préchargée ne chasse pas une entrée plus populaire
+    assert mathia.store_entry('rare', make_entry('Rare')) is False
+    assert mathia.cache.peek('populaire')
+
+    # Une réponse Mistral payée par un utilisateur est toujours conservée
+    assert mathia.store_entry('rare', make_entry('Rare'), paid=True) is True
+    assert mathia.cache.peek('rare')
+
+
+def test_presented_entries_never_carry_build_time_usage(mathia_module):
+    mathia = mathia_module.mathia
+    entry = dict(make_entry('Intégrale'), usage={'total_tokens': 1234}, processing_time=9.9)
+
+    result = mathia.present(entry, 0, from_cache=True)
+    assert 'usage' not in result
+    assert result['from_cache'] is True and result['processing_time'] != 9.9
+    assert entry['usage'] == {'total_tokens': 1234}
+
+
+@pytest.mark.parametrize('sections', ['definition', {'definition': True}, ['definition', 'inconnue'], [['definition']]])
+def test_sections_endpoint_rejects_malformed_sections(mathia_module, sections):
+    client = mathia_module.app.test_client()
+    response = client.post('/api/explore/sections', json={'concept': 'Intégrale', 'sections': sections})
+    assert response.status_code == 400
+    assert 'sections' in response.get_json()['error']
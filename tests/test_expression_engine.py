@@ -0,0 +1,87 @@
+import os
+import time
+
+import pytest
+
+
+def encode(code):
+    """Réécrit du code Python avec chr() pour passer la liste de caractères autorisés"""
+    return '+'.join(f'chr({ord(c)})' for c in code)
+
+
+@pytest.fixture(scope='module')
+def engine(mathia_module):
+    """Un seul moteur (et donc un seul ouvrier sympy) pour les tests du module"""
+    engine = mathia_module.ExpressionEngine()
+    yield engine
+    engine.pool.close()
+
+
+PAYLOAD = f"Integer(eval({encode('__import__(' + repr('os') + ').getpid()')}))"
+
+
+def test_builtins_are_not_reachable(mathia_module):
+    engine = mathia_module.ExpressionEngine()
+    assert engine.validate(PAYLOAD)[0]
+    with pytest.raises(ValueError):
+        engine.calculate(PAYLOAD)
+
+
+def test_payload_is_a_client_error(mathia_module):
+    client = mathia_module.app.test_client()
+    response = client.post('/api/calculate', json={'expression': PAYLOAD})
+    assert response.status_code == 400
+    assert str(os.getpid()) not in response.get_data(as_text=True)
+
+    response = client.post('/api/calculate', json={'expression': '1,2'})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('expression, operation, expected', [
+    ('2x+3', 'evaluate', '2*x + 3'),
+    ('sqrt(16)', 'evaluate', '4'),
+    ('abs(x)', 'evaluate', 'Abs(x)'),
+    ('x^2-4=0', 'solve', '[-2, 2]'),
+    ('ln(x)', 'derivative', '1/x'),
+])
+def test_regular_expressions_still_work(engine, expression, operation, expected):
+    assert engine.calculate(expression, operation)['result'] == expected
+
+
+def test_symbolic_size_is_capped(engine):
+    with pytest.raises(ValueError):
+        engine.calculate('(x+1)^1000', 'expand')
+    with pytest.raises(ValueError):
+        engine.calculate('9^99999999')
+
+
+@pytest.mark.parametrize('expression', [
+    '(10**10)**(10**10)',
+    'sqrt(2)**(10**10)',
+    '(x*10**100)**(10**10)',
+    'factorial(100000000)',
+    'gamma(factorial(7))',
+    'binomial(10**9, 5*10**8)',
+])
+def test_huge_integers_are_rejected_before_evaluation(engine, expression):
+    started = time.monotonic()
+    with pytest.raises(ValueError, match='trop grand'):
+        engine.calculate(expression)
+    assert time.monotonic() - started < 1
+
+
+def test_timeout_kills_the_worker_and_frees_the_slot(mathia_module):
+    engine = mathia_module.ExpressionEngine(timeout=0.05, workers=1)
+    engine.pool.timeout = 30  # démarrage de l'ouvrier (import de sympy) hors délai
+    assert engine.calculate('sqrt(16)')['numeric'] == 4.0
+
+    engine.pool.timeout = 0.05
+    for _ in range(2):
+        with pytest.raises(ValueError, match='trop long'):
+            engine.calculate('exp(x)*sin(x)^7*cos(x)^9/(1+x^2)^3', 'integral')
+    stats = engine.pool.get_stats()
+    assert stats['timeouts'] == 2 and stats['killed'] == 2 and stats['busy'] == 0
+
+    engine.pool.timeout = 30
+    assert engine.calculate('x^2-4=0', 'solve')['solutions'] == ['-2', '2']
+    engine.pool.close()
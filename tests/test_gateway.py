@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+
+from fusia_common import ConcurrencyLimiter, GatewayOverloaded, HedgePolicy, KeyPool
+
+
+def test_limiter_rejects_when_the_queue_is_full():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=0)
+    limiter.acquire(time.time() + 5)
+
+    with pytest.raises(GatewayOverloaded) as excinfo:
+        limiter.acquire(time.time() + 5)
+    assert excinfo.value.retry_after >= 1
+    assert limiter.stats['rejected_queue_full'] == 1
+
+
+def test_limiter_rejects_when_the_wait_exceeds_the_deadline():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=4, initial_service_time=10.0)
+    limiter.acquire(time.time() + 30)
+
+    with pytest.raises(GatewayOverloaded):
+        limiter.acquire(time.time() + 1)
+    assert limiter.stats['rejected_deadline'] == 1
+
+
+def test_limiter_admits_a_queued_request_on_release():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, initial_service_time=0.1)
+    limiter.acquire(time.time() + 5)
+    threading.Timer(0.05, limiter.release).start()
+
+    limiter.acquire(time.time() + 5)
+    assert limiter.stats['queued'] == 1
+    assert limiter.in_flight == 1
+
+
+def test_limiter_without_queue_only_takes_a_free_slot():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=4)
+    limiter.acquire(time.time() + 30, queue=False)
+
+    with pytest.raises(GatewayOverloaded):
+        limiter.acquire(time.time() + 30, queue=False)
+    assert limiter.stats['rejected_busy'] == 1
+    assert limiter.waiting == 0
+
+
+def test_explore_is_shed_with_503_and_retry_after(mathia_module, monkeypatch):
+    mathia = mathia_module.mathia
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=0)
+    limiter.acquire(time.time() + 5)
+    monkeypatch.setattr(mathia, 'limiter', limiter)
+
+    response = mathia_module.app.test_client().post('/api/explore', json={'concept': 'Théorème de Rolle'})
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+    assert response.get_json()['success'] is False
+
+
+def test_prefetch_reaches_the_model(mathia_module, monkeypatch):
+    mathia = mathia_module.mathia
+    calls = []
+
+    def complete_with_key(key_index, model, prompt, max_tokens=None, usage=None):
+        calls.append(model)
+        return '## Explication\nUne explication de test.'
+
+    monkeypatch.setattr(mathia, 'limiter', ConcurrencyLimiter(max_concurrent=2, max_queue=0))
+    monkeypatch.setattr(mathia, 'complete_with_key', complete_with_key)
+
+    result = mathia.process_concept('Lemme de Zorn', 'fr', 'moyen', prefetch=True)
+    assert result['success'], result
+    assert len(calls) == 1
+    assert mathia.limiter.in_flight == 0
+
+
+def test_key_limit_grows_only_when_the_key_is_busy():
+    pool = KeyPool(1, initial=4.0)
+    for _ in range(20):
+        pool.release(pool.acquire(), 'success')  # un seul appel à la fois
+    assert pool.keys[0]['limit'] == 4.0
+
+    for _ in range(20):
+        indexes = [pool.acquire() for _ in range(4)]
+        for index in indexes:
+            pool.release(index, 'success')
+    assert pool.keys[0]['limit'] > 5.0
+
+
+def test_key_limit_halves_once_per_window_on_rate_limits():
+    pool = KeyPool(1, initial=8.0, maximum=8.0)
+    indexes = [pool.acquire() for _ in range(4)]
+    for index in indexes:
+        pool.release(index, 'rate_limited')
+
+    assert pool.keys[0]['limit'] == 4.0
+    assert pool.keys[0]['rate_limits'] == 4
+
+    pool.release(pool.acquire(), 'rate_limited')
+    assert pool.keys[0]['limit'] == 2.0
+    pool.release(pool.acquire(), 'rate_limited')
+    assert pool.keys[0]['limit'] == 1.0  # plancher minimum
+    pool.release(pool.acquire(), 'rate_limited')
+    assert pool.keys[0]['limit'] == 1.0
+
+
+def make_hedging(limiter):
+    hedging = HedgePolicy(enabled=True, min_samples=1, burst=1.0, budget=1.0, limiter=limiter)
+    hedging.observe(0.01)
+    return hedging
+
+
+def test_hedge_holds_a_slot_until_the_abandoned_call_returns():
+    limiter = ConcurrencyLimiter(max_concurrent=2, max_queue=0)
+    hedging = make_hedging(limiter)
+    release_primary = threading.Event()
+
+    def slow_primary():
+        release_primary.wait(5)
+        return 'principal'
+
+    assert hedging.call(slow_primary, lambda: 'doublon') == 'doublon'
+    assert hedging.stats['hedge_wins'] == 1 and hedging.stats['abandoned'] == 1
+    assert limiter.in_flight == 1  # le principal abandonné tourne encore
+
+    release_primary.set()
+    deadline = time.time() + 5
+    while limiter.in_flight and time.time() < deadline:
+        time.sleep(0.01)
+    assert limiter.in_flight == 0
+
+
+def test_no_hedge_without_a_free_slot():
+    slot_requested = threading.Event()
+
+    class Limiter(ConcurrencyLimiter):
+        def acquire(self, deadline, queue=True):
+            try:
+                super().acquire(deadline, queue)
+            finally:
+                slot_requested.set()
+
+    limiter = Limiter(max_concurrent=1, max_queue=0)
+    limiter.acquire(time.time() + 5)  # place de l'appelant
+    slot_requested.clear()
+    hedging = make_hedging(limiter)
+
+    def primary():
+        slot_requested.wait(5)  # répond après la tentative de doublon
+        return 'principal'
+
+    assert hedging.call(primary, lambda: 'doublon') == 'principal'
+    assert hedging.stats['slot_denied'] == 1 and hedging.stats['hedged'] == 0
+    assert limiter.in_flight == 1
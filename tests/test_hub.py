@@ -0,0 +1,43 @@
+import builtins
+import sys
+
+
+def test_subapp_load_times_imports_without_patching_import(hub_module, tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / 'fusia_dep_shared.py').write_text('import time\ntime.sleep(0.02)\ndef helper():\n    pass\n')
+    (tmp_path / 'fusia_dep_own.py').write_text('VALUE = 1\n')
+    original_import = builtins.__import__
+    sub_apps = []
+    for name, imports in (('first', 'import fusia_dep_shared'),
+                          ('second', 'import fusia_dep_own\nfrom fusia_dep_shared import helper')):
+        path = tmp_path / f'{name}.py'
+        path.write_text(f'{imports}\nfrom flask import Flask\napp = Flask(__name__)\ninstance = object()\n')
+        sub_apps.append(hub_module.SubApp(name, name.title(), str(path), 'instance', '<p>indisponible</p>'))
+
+    for sub_app in sub_apps:
+        flask_app, instance = sub_app.load()
+        assert flask_app is not None and instance is not None
+    assert builtins.__import__ is original_import
+    assert not any(isinstance(finder, hub_module.ImportTimer) for finder in sys.meta_path)
+
+    first, second = (sub_app.report()['slowest_imports_ms'] for sub_app in sub_apps)
+    assert set(first) == {'fusia_dep_shared'} and first['fusia_dep_shared'] >= 20
+    # Importé par la première, le module compte aussi pour la seconde qui en dépend
+    assert set(second) == {'fusia_dep_shared', 'fusia_dep_own'}
+    assert second['fusia_dep_shared'] == first['fusia_dep_shared']
+
+
+def test_plot_data_revalidates_through_compression(hub_module, mathia_module):
+    from werkzeug.test import Client
+
+    client = Client(hub_module.Compression(mathia_module.app.wsgi_app, min_size=256))
+    url = '/api/plot/data?expression=sin(x)&xmin=-10&xmax=10&points=500'
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+
+    revalidated = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert revalidated.status_code == 304
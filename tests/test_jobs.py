@@ -0,0 +1,51 @@
+import time
+
+from fusia_common import JobQueue
+
+
+def wait_done(queue, job):
+    deadline = time.time() + 5
+    while queue.get(job['id'])['status'] not in ('done', 'failed') and time.time() < deadline:
+        time.sleep(0.01)
+    return queue.get(job['id'])
+
+
+def test_degraded_results_are_not_reused():
+    queue = JobQueue(workers=1)
+    job, _ = queue.submit('cle', lambda: {'success': True, 'degraded': True})
+    assert wait_done(queue, job)['status'] == 'done'
+
+    retry, deduplicated = queue.submit('cle', lambda: {'success': True})
+    assert not deduplicated and retry['id'] != job['id']
+    wait_done(queue, retry)
+
+    again, deduplicated = queue.submit('cle', lambda: {'success': True})
+    assert deduplicated and again['id'] == retry['id']
+
+
+def test_explore_jobs_share_one_call_across_section_subsets(mathia_module, monkeypatch):
+    mathia = mathia_module.mathia
+    section_ids = mathia_module.MathiaExplorer.SECTION_IDS
+    calls = []
+
+    def process_concept(concept, language, detail_level):
+        calls.append(concept)
+        time.sleep(0.05)
+        return {'success': True, 'concept': concept, 'explanation': 'texte',
+                'sections': {section_id: f'<p>{section_id}</p>' for section_id in section_ids},
+                'available_sections': list(section_ids)}
+
+    monkeypatch.setattr(mathia, 'process_concept', process_concept)
+    client = mathia_module.app.test_client()
+    first = client.post('/api/jobs/explore', json={'concept': 'Intégrale', 'sections': section_ids[:1]}).get_json()
+    second = client.post('/api/jobs/explore', json={'concept': 'Intégrale', 'sections': section_ids[1:]}).get_json()
+
+    assert second['deduplicated'] and first['job_id'] == second['job_id']
+    wait_done(mathia.jobs, mathia.jobs.get(first['job_id']))
+    assert calls == ['Intégrale']
+
+    prefix = '/api/jobs/'
+    first_result = client.get(first['poll_url'][first['poll_url'].index(prefix):]).get_json()['result']
+    second_result = client.get(second['poll_url'][second['poll_url'].index(prefix):]).get_json()['result']
+    assert set(first_result['sections']) == set(section_ids[:1])
+    assert set(second_result['sections']) == set(section_ids[1:])
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('budget', [3, 4, 7, 50, 500])
+def test_downsample_never_exceeds_budget(mathia_module, budget):
+    plotter = mathia_module.FunctionPlotter(mathia_module.ExpressionEngine())
+    x = np.linspace(-20, 20, 5000)
+    with np.errstate(all='ignore'):
+        y = np.tan(x)
+    y[np.abs(y) > 50] = np.nan  # une coupure par asymptote
+
+    out_x, out_y = plotter.downsample(x, y, budget)
+    assert 0 < out_x.size <= budget
+    assert out_x.size == out_y.size
+
+
+def test_downsample_many_short_segments(mathia_module):
+    plotter = mathia_module.FunctionPlotter(mathia_module.ExpressionEngine())
+    x = np.arange(1000, dtype=float)
+    y = np.where(np.arange(1000) % 4 == 3, np.nan, x)  # 250 segments de 3 points
+
+    out_x, _ = plotter.downsample(x, y, 100)
+    assert out_x.size <= 100
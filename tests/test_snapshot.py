@@ -0,0 +1,54 @@
+import signal
+import threading
+
+from fusia_common import CacheSnapshot
+from fusia_common import snapshot as snapshot_module
+
+
+def test_sigterm_saves_snapshots_created_off_the_main_thread(tmp_path, monkeypatch):
+    installed, chained = {}, []
+    monkeypatch.setattr(CacheSnapshot, 'registered', [])
+    monkeypatch.setattr(CacheSnapshot, 'sigterm_installed', False)
+    monkeypatch.setattr(snapshot_module.atexit, 'register', lambda func: None)
+    monkeypatch.setattr(snapshot_module.signal, 'getsignal', lambda signum: lambda s, frame: chained.append(s))
+    monkeypatch.setattr(snapshot_module.signal, 'signal', lambda signum, handler: installed.setdefault(signum, handler))
+
+    # Le hub installe le gestionnaire, la sous-application se charge dans un autre thread
+    assert CacheSnapshot.install_sigterm()
+    path = tmp_path / 'snapshot.json.gz'
+    snapshot = CacheSnapshot(str(path), 'f' * 32, lambda: [{'key': 'k', 'entry': {'success': True}}],
+                             lambda item: True, log=lambda message: None)
+    loader = threading.Thread(target=snapshot.install_handlers)
+    loader.start()
+    loader.join()
+
+    installed[signal.SIGTERM](signal.SIGTERM, None)
+    assert path.exists()
+    assert chained == [signal.SIGTERM]
+
+
+def test_sigterm_does_not_deadlock_on_a_lock_held_by_the_main_thread(tmp_path, monkeypatch):
+    installed, chained = {}, []
+    monkeypatch.setattr(CacheSnapshot, 'registered', [])
+    monkeypatch.setattr(CacheSnapshot, 'sigterm_installed', False)
+    monkeypatch.setattr(CacheSnapshot, 'shutdown_timeout', 0.2)
+    monkeypatch.setattr(snapshot_module.atexit, 'register', lambda func: None)
+    monkeypatch.setattr(snapshot_module.signal, 'getsignal', lambda signum: lambda s, frame: chained.append(s))
+    monkeypatch.setattr(snapshot_module.signal, 'signal', lambda signum, handler: installed.setdefault(signum, handler))
+    assert CacheSnapshot.install_sigterm()
+
+    cache_lock = threading.Lock()
+
+    def collect():
+        with cache_lock:
+            return [{'key': 'k', 'entry': {'success': True}}]
+
+    path = tmp_path / 'snapshot.json.gz'
+    snapshot = CacheSnapshot(str(path), 'f' * 32, collect, lambda item: True, log=lambda message: None)
+    snapshot.install_handlers()
+
+    # Signal reçu alors que le thread principal tient le verrou du cache
+    with cache_lock:
+        installed[signal.SIGTERM](signal.SIGTERM, None)
+        assert chained == [signal.SIGTERM]
+        assert not path.exists()
@@ -0,0 +1,25 @@
+from fusia_common import PrefixTrie
+
+
+def test_search_matches_any_word_without_accents():
+    trie = PrefixTrie()
+    trie.add('Théorème de Pythagore')
+    assert trie.search('pyth') == ['Théorème de Pythagore']
+    assert trie.search('theoreme') == ['Théorème de Pythagore']
+
+
+def test_term_cap_keeps_the_strongest_labels():
+    trie = PrefixTrie(max_terms=10)
+    trie.add('Marie Curie', weight=50)
+    for i in range(30):
+        trie.add(f'Terme {i}')
+
+    assert trie.size() <= 10
+    assert trie.stats['evicted'] > 0
+    assert trie.search('marie') == ['Marie Curie']
+
+
+def test_overlong_labels_are_not_indexed():
+    trie = PrefixTrie(max_label_length=20)
+    trie.add('x' * 21)
+    assert trie.size() == 0
@@ -1,4 +1,5 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
+from html import escape as html_escape
 import requests
 import json
 from mistralai import Mistral
@@ -7,8 +8,182 @@ import os
 import re
 import time
 import hashlib
+import sys
+import threading
+import unicodedata
+import zlib
 
-app = Flask(__name__)
+# Classes communes au wiki et à Mathia (fusia_common/, à la racine du dépôt)
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from fusia_common import (CacheCodec, CacheSnapshot, CompressedCache, ConcurrencyLimiter, GatewayOverloaded,
+                          HedgePolicy, JobQueue, KeyPool, ModelRouter, PopularityTracker, PrefixTrie, ResponseCache,
+                          StaticAssets, TinyLFUCache, UsageMeter, make_cache)
+
+app = Flask(__name__, static_folder=None)
+
+class SemanticThemeIndex:
+    """Cache sémantique: retrouve un résumé existant pour un thème reformulé
+    
+    Les thèmes normalisés (sans accents, mots vides ni abréviations) sont
+    plongés hors ligne dans des vecteurs de n-grammes de caractères hachés
+    (numpy), indexés par LSH à hyperplans aléatoires, séparément pour chaque
+    (langue, longueur, mode). Au-delà du seuil de similarité cosinus, et si
+    les nombres du thème sont identiques ("world war 1" ≠ "world war 2"),
+    le résumé existant est réutilisé. Désactivé si numpy est absent.
+    """
+    
+    STOPWORDS = {
+        'the', 'a', 'an', 'of', 'on', 'in', 'to', 'for', 'and', 'what', 'is', 'are', 'was', 'who', 'why',
+        'how', 'did', 'does', 'about', 'le', 'la', 'les', 'de', 'des', 'du', 'un', 'une', 'et', 'en',
+        'sur', 'qui', 'que', 'quoi', 'est', 'el', 'los', 'las', 'del', 'y', 'que', 'es', 'sobre'
+    }
+    ABBREVIATIONS = {
+        'ww1': 'world war 1', 'wwi': 'world war 1', 'ww2': 'world war 2', 'wwii': 'world war 2',
+        'usa': 'united states', 'us': 'united states', 'uk': 'united kingdom', 'ussr': 'soviet union',
+        'ai': 'artificial intelligence', 'ia': 'intelligence artificielle', 'dna': 'adn',
+        'first': '1', 'one': '1', 'premiere': '1', 'premier': '1', 'primera': '1', 'primer': '1',
+        'second': '2', 'two': '2', 'seconde': '2', 'deuxieme': '2', 'segunda': '2'
+    }
+    ROMAN = re.compile(r'^(?=[ivx])x{0,3}(ix|iv|v?i{0,3})$')
+    
+    def __init__(self, dim=1024, tables=6, bits=10, threshold=0.85, max_entries=2000):
+        try:
+            import numpy as np
+        except ImportError:
+            print("⚠️ numpy absent: cache sémantique désactivé")
+            self.np = None
+            return
+        
+        self.np = np
+        self.dim = dim
+        self.threshold = threshold
+        self.max_entries = max_entries
+        rng = np.random.default_rng(1234)
+        self.planes = rng.standard_normal((tables, bits, dim)).astype(np.float32)
+        self.powers = 1 << np.arange(bits)
+        self.partitions = {}
+        self.lock = threading.Lock()
+        self.stats = {'indexed': 0, 'hits': 0, 'misses': 0}
+    
+    @property
+    def enabled(self):
+        return self.np is not None
+    
+    def normalize(self, theme):
+        decomposed = unicodedata.normalize('NFKD', theme.lower())
+        folded = ''.join(c for c in decomposed if not unicodedata.combining(c))
+        words = []
+        for word in re.findall(r'\w+', folded):
+            if word in self.STOPWORDS:
+                continue
+            if self.ROMAN.match(word):
+                word = str(self.roman_to_int(word))
+            words.extend(self.ABBREVIATIONS.get(word, word).split())
+        # Ordre des mots ignoré: "world war 1 causes" == "causes of world war 1"
+        return ' '.join(sorted(words))
+    
+    @staticmethod
+    def roman_to_int(word):
+        values = {'i': 1, 'v': 5, 'x': 10}
+        total = 0
+        for current, following in zip(word, word[1:] + ' '):
+            value = values[current]
+            total += -value if values.get(following, 0) > value else value
+        return total
+    
+    def embed(self, normalized):
+        vector = self.np.zeros(self.dim, dtype=self.np.float32)
+        padded = f" {normalized} "
+        features = [padded[i:i + n] for n in (3, 4) for i in range(len(padded) - n + 1)]
+        features += [f"w:{word}" for word in normalized.split()] * 2
+        
+        for feature in features:
+            h = zlib.crc32(feature.encode('utf-8'))
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        
+        norm = self.np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def signatures(self, vector):
+        bits = (self.planes @ vector) > 0
+        return [int(sig) for sig in bits @ self.powers]
+    
+    def add(self, cache_key, theme, language, length_mode, mode):
+        """Indexe le thème d'un résumé mis en cache"""
+        if not self.enabled:
+            return
+        normalized = self.normalize(theme)
+        if not normalized:
+            return
+        
+        # Un même résumé peut être indexé sous plusieurs thèmes (saisie, titre Wikipedia)
+        entry_id = (cache_key, normalized)
+        vector = self.embed(normalized)
+        with self.lock:
+            partition = self.partitions.setdefault((language, length_mode, mode), {'entries': {}, 'buckets': {}})
+            if entry_id in partition['entries']:
+                return
+            partition['entries'][entry_id] = (vector, set(re.findall(r'\d+', normalized)))
+            for table, sig in enumerate(self.signatures(vector)):
+                partition['buckets'].setdefault((table, sig), set()).add(entry_id)
+            self.stats['indexed'] += 1
+            
+            if len(partition['entries']) > self.max_entries:
+                self.drop(partition, next(iter(partition['entries'])))
+    
+    def drop(self, partition, entry_id):
+        vector, _ = partition['entries'].pop(entry_id)
+        for table, sig in enumerate(self.signatures(vector)):
+            bucket = partition['buckets'].get((table, sig))
+            if bucket:
+                bucket.discard(entry_id)
+        self.stats['indexed'] -= 1
+    
+    def remove(self, cache_key, language, length_mode, mode):
+        """Retire les thèmes d'un résumé (par exemple évincé du cache)"""
+        with self.lock:
+            partition = self.partitions.get((language, length_mode, mode))
+            if partition:
+                for entry_id in [entry_id for entry_id in partition['entries'] if entry_id[0] == cache_key]:
+                    self.drop(partition, entry_id)
+    
+    def lookup(self, theme, language, length_mode, mode):
+        """(clé de cache, similarité) du thème indexé le plus proche, ou None"""
+        if not self.enabled:
+            return None
+        normalized = self.normalize(theme)
+        if not normalized:
+            return None
+        
+        vector = self.embed(normalized)
+        numbers = set(re.findall(r'\d+', normalized))
+        best = None
+        
+        with self.lock:
+            partition = self.partitions.get((language, length_mode, mode))
+            if partition:
+                candidates = set()
+                for table, sig in enumerate(self.signatures(vector)):
+                    candidates |= partition['buckets'].get((table, sig), set())
+                
+                for cache_key, candidate in candidates:
+                    candidate_vector, candidate_numbers = partition['entries'][(cache_key, candidate)]
+                    if candidate_numbers != numbers:
+                        continue
+                    similarity = float(candidate_vector @ vector)
+                    if similarity >= self.threshold and (best is None or similarity > best[1]):
+                        best = (cache_key, round(similarity, 3))
+        
+        self.stats['hits' if best else 'misses'] += 1
+        return best
+    
+    def get_stats(self):
+        if not self.enabled:
+            return {'enabled': False}
+        return dict(self.stats, enabled=True, threshold=self.threshold)
 
 class WikipediaMistralSummarizer:
     def __init__(self):
@@ -22,22 +197,89 @@ class WikipediaMistralSummarizer:
             os.environ.get('MISTRAL_KEY_3', 'cvkQHVcomFFEW47G044x2p4DTyk5BIc7')
         ]
         
-        self.current_key_index = 0
-        
-        # Cache des résumés (en mémoire)
-        self.cache = {}
+        # Limite de concurrence apprise par clé (AIMD sur les 429)
+        self.key_pool = KeyPool(len(self.api_keys), maximum=float(os.environ.get('WIKI_KEY_MAX_LIMIT', 8)))
+        
+        # Admission devant Mistral: au-delà, 503 + Retry-After ou résumé extractif
+        self.limiter = ConcurrencyLimiter(
+            max_concurrent=int(os.environ.get('WIKI_LLM_CONCURRENCY', 4)),
+            max_queue=int(os.environ.get('WIKI_LLM_QUEUE', 8))
+        )
+        self.llm_deadline = int(os.environ.get('WIKI_LLM_DEADLINE', 25))  # secondes, sous le timeout gunicorn
+        # Hedging optionnel: doublon sur une autre clé (éventuellement un modèle plus petit)
+        self.hedging = HedgePolicy(enabled=os.environ.get('WIKI_HEDGING', '0') == '1',
+                                   budget=float(os.environ.get('WIKI_HEDGE_BUDGET', 0.12)),
+                                   max_workers=2 * self.limiter.max_concurrent, limiter=self.limiter)
+        self.hedge_model = os.environ.get('WIKI_HEDGE_MODEL') or None
+        
+        # Routage large/small par route ('summarize', 'direct') et longueur; WIKI_ROUTING_RULES (JSON) s'y ajoute
+        routing_rules = {
+            'summarize': {'court': 'small', 'moyen': 'auto', 'long': 'large'},
+            'direct': {'court': 'small', 'moyen': 'large', 'long': 'large'},
+        }
+        self.router = ModelRouter(routing_rules, "mistral-large-latest", "mistral-small-latest",
+                                  small_input_chars=int(os.environ.get('WIKI_ROUTING_SMALL_INPUT', 3000)))
+        if os.environ.get('WIKI_ROUTING_RULES'):
+            self.router.update_rules(json.loads(os.environ['WIKI_ROUTING_RULES']))
+        
+        # Tokens consommés; tarifs indicatifs en $ par million de tokens (entrée, sortie), WIKI_MODEL_PRICES (JSON)
+        self.token_usage = UsageMeter(prices=json.loads(os.environ.get('WIKI_MODEL_PRICES') or 'null') or {
+            'mistral-large-latest': (2.0, 6.0),
+            'mistral-small-latest': (0.2, 0.6),
+        })
+        
+        # Cache des résumés (en mémoire, borné; politique 'tinylfu' ou 'lru')
+        self.cache_policy = os.environ.get('WIKI_CACHE_POLICY', 'tinylfu')
+        seed = json.dumps({
+            'success': True, 'title': '', 'summary': '<p></p>\n<p><strong></strong></p>', 'url': 'https://en.wikipedia.org/wiki/',
+            'source': 'wikipedia', 'method': 'direct', 'processing_time': 0, 'length_mode': 'moyen', 'language': 'en', 'mode': 'general'
+        }, ensure_ascii=False, separators=(',', ':'))
+        self.cache = CompressedCache(make_cache(self.cache_policy, int(os.environ.get('WIKI_CACHE_SIZE', 500))), CacheCodec(seed))
+        
+        # Réponses pré-sérialisées des hits (ETag, GET conditionnel)
+        self.responses = ResponseCache(max_size=128, max_age=3600)
+        self.jobs = JobQueue(
+            workers=int(os.environ.get('WIKI_JOB_WORKERS', 4)),
+            max_pending=int(os.environ.get('WIKI_JOB_MAX_PENDING', 32)),
+            retention=int(os.environ.get('WIKI_JOB_RETENTION', 600)),
+            name='wiki-job'
+        )
+        
+        # Cache sémantique des thèmes reformulés (optionnel, nécessite numpy)
+        self.semantic = None
+        if os.environ.get('WIKI_SEMANTIC_CACHE', '1') == '1':
+            self.semantic = SemanticThemeIndex(threshold=float(os.environ.get('WIKI_SEMANTIC_THRESHOLD', 0.85)))
+        
+        # Popularité des requêtes (décroissance par heure)
+        self.popularity = PopularityTracker(width=2048, depth=4, top_k=100, window=3600)
+        
+        # Autocomplétion des thèmes (un trie par langue)
+        self.suggestions = {lang: PrefixTrie(top_k=8) for lang in ('en', 'fr', 'es')}
         
         # Statistiques
         self.stats = {
             'requests': 0,
             'cache_hits': 0,
             'wikipedia_success': 0,
-            'mistral_only': 0
+            'mistral_only': 0,
+            'semantic_hits': 0,
+            'shed': 0,
+            'degraded': 0
         }
         
         # Configuration Wikipedia par défaut
+        self.wikipedia_lock = threading.Lock()
         self.current_language = 'en'
         self.setup_wikipedia_language('en')
+        
+        # Réchauffage du cache depuis l'instantané précédent (en arrière-plan)
+        self.snapshot = CacheSnapshot(
+            os.environ.get('WIKI_SNAPSHOT_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wiki_snapshot.json.gz')),
+            self.get_snapshot_fingerprint(), self.snapshot_entries, self.restore_entry, name='wiki-snapshot'
+        )
+        if os.environ.get('WIKI_SNAPSHOT', '1') == '1':
+            self.snapshot.install_handlers()
+            self.snapshot.start(budget=5, interval=int(os.environ.get('WIKI_SNAPSHOT_INTERVAL', 600)))
     
     def setup_wikipedia_language(self, lang_code):
         """Configure Wikipedia pour une langue donnée"""
@@ -55,49 +297,88 @@ class WikipediaMistralSummarizer:
             except:
                 pass
     
-    def get_mistral_client(self):
-        """Obtient un client Mistral avec rotation des clés"""
-        key = self.api_keys[self.current_key_index % len(self.api_keys)]
-        self.current_key_index += 1
-        return Mistral(api_key=key)
+    def is_rate_limited(self, error):
+        """429 ou capacité dépassée: signal de congestion de la clé"""
+        return "429" in str(error) or "capacity exceeded" in str(error)
     
-    def retry_with_different_keys(self, func, *args, **kwargs):
-        """Retry une fonction avec toutes les clés API disponibles"""
-        last_exception = None
-        
-        for attempt in range(len(self.api_keys)):
+    def complete_with_key(self, key_index, model, messages, temperature, max_tokens, usage=None):
+        """Un appel sur une clé déjà réservée (repli sur le modèle small en cas de 429), puis libération"""
+        outcome = 'error'
+        start = time.time()
+        try:
+            client = Mistral(api_key=self.api_keys[key_index])
+            
+            # Essayer d'abord avec le modèle demandé, puis avec le modèle plus petit
             try:
-                print(f"Tentative {attempt + 1} avec clé API")
-                result = func(*args, **kwargs)
-                return result
+                response = client.chat.complete(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+                outcome = 'success'
+                response_model = model
             except Exception as e:
-                print(f"Erreur avec clé {attempt + 1}: {str(e)}")
-                last_exception = e
-                self.current_key_index += 1
-                # Attendre entre les tentatives pour éviter rate limiting
-                if attempt < len(self.api_keys) - 1:
-                    time.sleep(2)
-                continue
-        
-        # Si toutes les clés ont échoué, utiliser un modèle moins cher
-        print("⚠️ Tentative avec modèle alternatif...")
+                if not self.is_rate_limited(e) or model == "mistral-small-latest":
+                    raise
+                outcome = 'rate_limited'
+                print("⚠️ Rate limit atteint, utilisation du modèle small...")
+                response = client.chat.complete(
+                    model="mistral-small-latest",
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+                response_model = "mistral-small-latest"
+            
+            self.hedging.observe(time.time() - start)
+            self.router.observe(response_model, time.time() - start)
+            self.token_usage.record(usage, key_index, response_model, response)
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            if self.is_rate_limited(e):
+                outcome = 'rate_limited'
+            raise
+        finally:
+            self.key_pool.release(key_index, outcome)
+    
+    def call_mistral(self, prompt, temperature, max_tokens=600, deadline=None, model="mistral-large-latest", usage=None):
+        """Passerelle unique vers Mistral: admission, rotation des clés, hedging, repli sur le modèle small"""
+        deadline = deadline or time.time() + self.llm_deadline
+        self.limiter.acquire(deadline)
+        
+        call_start = time.time()
+        duration = None
+        messages = [{"role": "user", "content": prompt}]
+        last_exception = None
+        key_index = None
         try:
-            return self.retry_with_alternative_model(func, *args, **kwargs)
-        except:
+            for attempt in range(len(self.api_keys)):
+                if time.time() >= deadline:
+                    raise GatewayOverloaded('délai dépassé', self.limiter.retry_after())
+                
+                # Clé choisie selon sa capacité libre, différente de la précédente si possible
+                key_index = self.key_pool.acquire(avoid=key_index)
+                try:
+                    print(f"Tentative {attempt + 1} avec clé API #{key_index + 1}")
+                    content = self.hedging.call(
+                        lambda: self.complete_with_key(key_index, model, messages, temperature, max_tokens, usage),
+                        lambda: self.complete_with_key(self.key_pool.acquire(avoid=key_index), self.hedge_model or model,
+                                                       messages, temperature, max_tokens, usage)
+                    )
+                    duration = time.time() - call_start
+                    return content
+                except Exception as e:
+                    print(f"Erreur avec clé {key_index + 1}: {str(e)}")
+                    last_exception = e
+                
+                # Attendre entre les tentatives pour éviter le rate limiting (sans dépasser l'échéance)
+                if attempt < len(self.api_keys) - 1:
+                    time.sleep(max(0, min(2, deadline - time.time())))
+            
             raise Exception(f"Toutes les clés API ont échoué. Service temporairement indisponible. Dernière erreur: {str(last_exception)}")
-    
-    def retry_with_alternative_model(self, func, *args, **kwargs):
-        """Retry avec un modèle Mistral moins cher"""
-        for attempt in range(len(self.api_keys)):
-            try:
-                # Utiliser mistral-small au lieu de mistral-large
-                if hasattr(self, '_use_small_model'):
-                    result = func(*args, **kwargs)
-                    return result
-            except:
-                self.current_key_index += 1
-                continue
-        raise Exception("Tous les modèles ont échoué")
+        finally:
+            self.limiter.release(duration)
     
     def get_cache_key(self, theme, length_mode, language, mode):
         """Génère une clé de cache unique incluant la langue et le mode"""
@@ -232,23 +513,54 @@ class WikipediaMistralSummarizer:
         lang_instructions = instructions.get(language, instructions['en'])
         return lang_instructions.get(mode, lang_instructions['general'])
     
-    def summarize_with_mistral(self, title, content, length_mode='moyen', language='en', mode='general'):
-        """Utilise Mistral AI pour résumer le contenu Wikipedia avec mode spécifique"""
-        def _summarize():
-            client = self.get_mistral_client()
+    def extractive_summary(self, content, length_mode='moyen'):
+        """Résumé sans LLM: premières phrases de l'article, dans la limite de mots du mode"""
+        max_words = {'court': 200, 'moyen': 350, 'long': 500}.get(length_mode, 350)
+        paragraphs = []
+        words = 0
+        for paragraph in content.split('\n'):
+            paragraph = paragraph.strip()
+            if not paragraph or paragraph.startswith('=='):
+                continue
             
-            max_chars = 6000  # Réduit pour Render
-            if len(content) > max_chars:
-                content_truncated = content[:max_chars] + "..."
+            kept = []
+            for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+                count = len(sentence.split())
+                if words and words + count > max_words:
+                    break
+                kept.append(sentence)
+                words += count
             else:
-                content_truncated = content
-            
-            word_count = self.get_word_count_for_length(length_mode)
-            language_instruction = self.get_language_instruction(language)
-            mode_instruction = self.get_mode_instruction(mode, language)
+                paragraphs.append(' '.join(kept))
+                continue
             
-            # Construction du prompt avec instructions spécifiques au mode
-            base_prompt = f"""You are an expert summarizer. Here is the content of a Wikipedia page about "{title}".
+            # Limite atteinte au milieu du paragraphe
+            if kept:
+                paragraphs.append(' '.join(kept))
+            break
+        
+        return '\n'.join(f'<p>{html_escape(paragraph)}</p>' for paragraph in paragraphs)
+    
+    def summarize_with_mistral(self, title, content, length_mode='moyen', language='en', mode='general', deadline=None,
+                               model="mistral-large-latest", usage=None):
+        """Utilise Mistral AI pour résumer le contenu Wikipedia avec mode spécifique"""
+        base_prompt = self.build_summary_prompt(title, content, length_mode, language, mode)
+        return self.call_mistral(base_prompt, temperature=0.2, deadline=deadline, model=model, usage=usage)
+    
+    def build_summary_prompt(self, title, content, length_mode, language, mode):
+        """Prompt de résumé d'une page Wikipedia"""
+        max_chars = 6000  # Réduit pour Render
+        if len(content) > max_chars:
+            content_truncated = content[:max_chars] + "..."
+        else:
+            content_truncated = content
+        
+        word_count = self.get_word_count_for_length(length_mode)
+        language_instruction = self.get_language_instruction(language)
+        mode_instruction = self.get_mode_instruction(mode, language)
+        
+        # Construction du prompt avec instructions spécifiques au mode
+        base_prompt = f"""You are an expert summarizer. Here is the content of a Wikipedia page about "{title}".
 
 Wikipedia Content:
 {content_truncated}
@@ -261,51 +573,28 @@ Instructions: Create a clear, informative and well-structured summary of this Wi
 - Write in plain text, without markdown formatting
 - {language_instruction}"""
 
-            if mode_instruction:
-                base_prompt += f"""
+        if mode_instruction:
+            base_prompt += f"""
 
 Special focus for this summary:
 {mode_instruction}"""
 
-            base_prompt += "\n\nSummary:"
-            
-            # Format correct pour Mistral AI v1.0.0
-            messages = [{"role": "user", "content": base_prompt}]
-            
-            # Essayer d'abord avec le modèle standard, puis avec le modèle plus petit
-            try:
-                response = client.chat.complete(
-                    model="mistral-large-latest",
-                    messages=messages,
-                    temperature=0.2,
-                    max_tokens=600
-                )
-            except Exception as e:
-                if "429" in str(e) or "capacity exceeded" in str(e):
-                    print("⚠️ Rate limit atteint, utilisation du modèle small...")
-                    response = client.chat.complete(
-                        model="mistral-small-latest",
-                        messages=messages,
-                        temperature=0.2,
-                        max_tokens=600
-                    )
-                else:
-                    raise e
-            
-            return response.choices[0].message.content.strip()
-        
-        return self.retry_with_different_keys(_summarize)
+        base_prompt += "\n\nSummary:"
+        return base_prompt
     
-    def answer_with_mistral_only(self, theme, length_mode='moyen', language='en', mode='general'):
+    def answer_with_mistral_only(self, theme, length_mode='moyen', language='en', mode='general', deadline=None,
+                                 model="mistral-large-latest", usage=None):
         """Utilise Mistral AI pour répondre directement sur un thème sans Wikipedia avec mode spécifique"""
-        def _answer():
-            client = self.get_mistral_client()
-            
-            word_count = self.get_word_count_for_length(length_mode)
-            language_instruction = self.get_language_instruction(language)
-            mode_instruction = self.get_mode_instruction(mode, language)
-            
-            base_prompt = f"""You are an expert assistant who must provide complete information on a subject.
+        base_prompt = self.build_direct_prompt(theme, length_mode, language, mode)
+        return self.call_mistral(base_prompt, temperature=0.3, deadline=deadline, model=model, usage=usage)
+    
+    def build_direct_prompt(self, theme, length_mode, language, mode):
+        """Prompt de réponse directe (sans page Wikipedia)"""
+        word_count = self.get_word_count_for_length(length_mode)
+        language_instruction = self.get_language_instruction(language)
+        mode_instruction = self.get_mode_instruction(mode, language)
+        
+        base_prompt = f"""You are an expert assistant who must provide complete information on a subject.
 
 Requested topic: "{theme}"
 
@@ -318,39 +607,105 @@ Instructions: Provide a complete and informative explanation of this topic.
 - Write in plain text, without markdown formatting
 - {language_instruction}"""
 
-            if mode_instruction:
-                base_prompt += f"""
+        if mode_instruction:
+            base_prompt += f"""
 
 Special focus for this explanation:
 {mode_instruction}"""
 
-            base_prompt += "\n\nResponse:"
-            
-            messages = [{"role": "user", "content": base_prompt}]
-            
-            # Essayer d'abord avec le modèle standard, puis avec le modèle plus petit
-            try:
-                response = client.chat.complete(
-                    model="mistral-large-latest", 
-                    messages=messages,
-                    temperature=0.3,
-                    max_tokens=600
-                )
-            except Exception as e:
-                if "429" in str(e) or "capacity exceeded" in str(e):
-                    print("⚠️ Rate limit atteint, utilisation du modèle small...")
-                    response = client.chat.complete(
-                        model="mistral-small-latest",
-                        messages=messages,
-                        temperature=0.3,
-                        max_tokens=600
-                    )
-                else:
-                    raise e
-            
-            return response.choices[0].message.content.strip()
+        base_prompt += "\n\nResponse:"
+        return base_prompt
+    
+    def get_snapshot_fingerprint(self):
+        """Empreinte des prompts et des modèles: un instantané produit avec d'autres est ignoré"""
+        prompts = [
+            builder(length_mode=length_mode, language=language, mode=mode, **placeholders)
+            for builder, placeholders in ((self.build_summary_prompt, {'title': '{title}', 'content': '{content}'}),
+                                          (self.build_direct_prompt, {'theme': '{theme}'}))
+            for language in ('en', 'fr', 'es')
+            for length_mode in ('court', 'moyen', 'long')
+            for mode in ('general', 'historique', 'scientifique', 'biographique', 'scolaire', 'culture', 'faits')
+        ]
+        material = '\n'.join(prompts + [self.router.models['large'], self.router.models['small']])
+        return hashlib.md5(material.encode()).hexdigest()
+
+    def snapshot_entries(self, limit=60):
+        """Résumés à sauvegarder: les plus populaires, puis les plus récents"""
+        counts = {key: (label, count) for key, label, count in self.popularity.most_common(100)}
+        cached = self.cache.items()
+        ordered = sorted(cached, key=lambda item: -counts.get(item[0], (None, 0))[1])
+        
+        items = []
+        for cache_key, result in ordered[:limit]:
+            label, count = counts.get(cache_key, (None, 0))
+            items.append({'key': cache_key, 'label': label, 'count': count, 'entry': result})
+        return items
+    
+    def restore_entry(self, item):
+        """Remet un résumé de l'instantané en cache"""
+        cache_key = item.get('key')
+        result = item.get('entry')
+        if not cache_key or not isinstance(result, dict) or not result.get('success'):
+            return False
+        if self.cache.peek(cache_key):
+            return False
+        
+        self.cache.set(cache_key, result)
+        label = item.get('label')
+        if label:
+            self.index_theme(cache_key, label['theme'], result, label['language'], label['length_mode'], label['mode'])
+            self.record_suggestion(result, label['language'])
+            if item.get('count'):
+                self.popularity.record(cache_key, label, weight=item['count'])
+        return True
+    
+    def index_theme(self, cache_key, theme, result, language, length_mode, mode):
+        """Indexe le thème (et le titre Wikipedia) dans le cache sémantique"""
+        if not self.semantic:
+            return
+        self.semantic.add(cache_key, theme, language, length_mode, mode)
+        if result.get('source') == 'wikipedia' and result.get('title'):
+            self.semantic.add(cache_key, result['title'], language, length_mode, mode)
+    
+    def lookup_similar(self, theme, language, length_mode, mode):
+        """Résumé déjà en cache pour un thème reformulé, ou None"""
+        if not self.semantic:
+            return None
+        
+        match = self.semantic.lookup(theme, language, length_mode, mode)
+        if not match:
+            return None
+        
+        cached = self.cache.get(match[0])
+        if cached is None:
+            # Entrée évincée du cache entre-temps
+            self.semantic.remove(match[0], language, length_mode, mode)
+            return None
+        
+        print(f"🧠 Thème proche trouvé en cache (similarité {match[1]})")
+        return dict(cached, from_cache=True, semantic_similarity=match[1])
+
+    def response_key(self, theme, length_mode, language, mode):
+        """Clé de la réponse pré-sérialisée (None si le thème est invalide)"""
+        if not theme or len(theme.strip()) < 2:
+            return None
+        return self.get_cache_key(theme.strip(), length_mode, language, mode)
+    
+    def touch_entry(self, cache_key, theme, length_mode, language, mode, meta):
+        """Comptabilise un hit servi pré-sérialisé (False si le résumé a quitté le cache)"""
+        if self.cache.backend.get(cache_key) is None:
+            return False
         
-        return self.retry_with_different_keys(_answer)
+        self.stats['requests'] += 1
+        self.stats['cache_hits'] += 1
+        self.popularity.record(cache_key, {'theme': theme.strip(), 'length_mode': length_mode, 'language': language, 'mode': mode})
+        self.record_suggestion(meta, language)
+        return True
+
+    def record_suggestion(self, result, language):
+        """Alimente l'autocomplétion avec le titre Wikipedia trouvé (jamais le thème saisi, visible de tous)"""
+        if result.get('source') == 'wikipedia' and result.get('title'):
+            self.suggestions.get(language, self.suggestions['en']).add(result['title'])
 
     def process_theme(self, theme, length_mode='moyen', language='en', mode='general'):
         """Traite un thème complet avec support multilingue et mode spécifique"""
@@ -365,24 +720,40 @@ Special focus for this explanation:
             }
         
         theme = theme.strip()
-        
-        # Configurer Wikipedia pour la langue demandée
         lang_code = {'en': 'en', 'fr': 'fr', 'es': 'es'}.get(language, 'en')
-        self.setup_wikipedia_language(lang_code)
         
         # Vérifier le cache
         cache_key = self.get_cache_key(theme, length_mode, language, mode)
-        if cache_key in self.cache:
+        self.popularity.record(cache_key, {'theme': theme, 'length_mode': length_mode, 'language': language, 'mode': mode})
+        cached = self.cache.get(cache_key)
+        if cached is not None:
             print("💾 Résultat trouvé en cache")
             self.stats['cache_hits'] += 1
-            return self.cache[cache_key]
+            self.record_suggestion(cached, language)
+            return dict(cached, from_cache=True)
+        
+        # Cache sémantique: même résumé pour un thème formulé autrement
+        similar = self.lookup_similar(theme, language, length_mode, mode)
+        if similar is not None:
+            self.stats['semantic_hits'] += 1
+            self.record_suggestion(similar, language)
+            return similar
+        
+        deadline = start_time + self.llm_deadline
         
         try:
-            wiki_data = self.smart_wikipedia_search(theme)
+            # La langue du module wikipedia est globale: configuration et recherche
+            # sous verrou (requêtes et tâches concurrentes)
+            with self.wikipedia_lock:
+                self.setup_wikipedia_language(lang_code)
+                wiki_data = self.smart_wikipedia_search(theme)
             
             if not wiki_data:
                 print(f"🤖 Génération directe avec Mistral pour: {theme}")
-                mistral_response = self.answer_with_mistral_only(theme, length_mode, language, mode)
+                routing = self.router.choose('direct', length_mode, len(theme), deadline, self.key_pool.headroom())
+                usage = self.token_usage.start(endpoint='direct', language=language, mode=mode, length=length_mode)
+                mistral_response = self.answer_with_mistral_only(theme, length_mode, language, mode, deadline=deadline,
+                                                                 model=routing['model'], usage=usage)
                 
                 if not mistral_response:
                     return {'success': False, 'error': 'Erreur lors de la génération de la réponse'}
@@ -399,14 +770,39 @@ Special focus for this explanation:
                     'processing_time': round(time.time() - start_time, 2),
                     'length_mode': length_mode,
                     'language': language,
-                    'mode': mode
+                    'mode': mode,
+                    'routing': routing
                 }
                 
                 self.stats['mistral_only'] += 1
                 
             else:
                 print(f"📖 Résumé Wikipedia pour: {wiki_data['title']}")
-                summary = self.summarize_with_mistral(wiki_data['title'], wiki_data['content'], length_mode, language, mode)
+                # Modèle choisi en amont (longueur, taille de l'article tronqué, échéance, capacité des clés)
+                routing = self.router.choose('summarize', length_mode, min(len(wiki_data['content']), 6000), deadline,
+                                             self.key_pool.headroom())
+                usage = self.token_usage.start(endpoint='summarize', language=language, mode=mode, length=length_mode)
+                try:
+                    summary = self.summarize_with_mistral(wiki_data['title'], wiki_data['content'], length_mode,
+                                                          language, mode, deadline=deadline, model=routing['model'],
+                                                          usage=usage)
+                except GatewayOverloaded as e:
+                    # Surcharge: premières phrases de l'article plutôt qu'un échec (non mis en cache)
+                    print(f"🪫 Surcharge ({e.reason}), résumé extractif pour: {wiki_data['title']}")
+                    self.stats['degraded'] += 1
+                    return {
+                        'success': True,
+                        'title': wiki_data['title'],
+                        'summary': self.extractive_summary(wiki_data['content'], length_mode),
+                        'url': wiki_data['url'],
+                        'source': 'wikipedia',
+                        'method': 'extractive',
+                        'degraded': True,
+                        'processing_time': round(time.time() - start_time, 2),
+                        'length_mode': length_mode,
+                        'language': language,
+                        'mode': mode
+                    }
                 
                 if not summary:
                     return {'success': False, 'error': 'Erreur lors de la génération du résumé'}
@@ -423,15 +819,24 @@ Special focus for this explanation:
                     'processing_time': round(time.time() - start_time, 2),
                     'length_mode': length_mode,
                     'language': language,
-                    'mode': mode
+                    'mode': mode,
+                    'routing': routing
                 }
                 
                 self.stats['wikipedia_success'] += 1
             
             # Sauvegarder en cache
-            self.cache[cache_key] = result
+            self.cache.set(cache_key, result)
+            self.index_theme(cache_key, theme, result, language, length_mode, mode)
+            self.record_suggestion(result, language)
             print(f"✅ TRAITEMENT TERMINÉ en {result['processing_time']}s")
-            return result
+            # Tokens de cette génération: propres à la réponse, pas à l'entrée de cache
+            return dict(result, usage=self.token_usage.summary(usage))
+            
+        except GatewayOverloaded as e:
+            print(f"🪫 Requête délestée: {e}")
+            self.stats['shed'] += 1
+            return {'success': False, 'error': str(e), 'retry_after': e.retry_after}
             
         except Exception as e:
             print(f"❌ ERREUR GÉNÉRALE: {str(e)}")
@@ -443,1403 +848,35 @@ Special focus for this explanation:
 # Instance globale du résumeur
 summarizer = WikipediaMistralSummarizer()
 
+# Interface: fichiers de static/ hachés et précompressés une fois au démarrage
+assets = StaticAssets(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
+print(f"🎨 Interface: {len(assets.hashed)} fichiers hachés en {assets.stats['build_ms']} ms")
+
 @app.route('/')
 def index():
-    """Page d'accueil avec l'interface en plein écran"""
-    return '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Wikipedia Summarizer Pro</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        
-        :root {
-            --bg-primary: #f8fafc;
-            --bg-secondary: #e2e8f0;
-            --bg-tertiary: #ffffff;
-            --text-primary: #1a202c;
-            --text-secondary: #4a5568;
-            --accent: #667eea;
-            --accent-secondary: #764ba2;
-            --border: #e2e8f0;
-            --shadow: rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] {
-            --bg-primary: #1a202c;
-            --bg-secondary: #2d3748;
-            --bg-tertiary: #4a5568;
-            --text-primary: #f7fafc;
-            --text-secondary: #e2e8f0;
-            --border: #4a5568;
-            --shadow: rgba(0, 0, 0, 0.3);
-        }
-        
-        body {
-            font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            min-height: 100vh;
-            display: flex;
-            flex-direction: column;
-            transition: all 0.3s ease;
-        }
-        
-        [data-theme="light"] body {
-            background: linear-gradient(135deg, var(--accent) 0%, var(--accent-secondary) 100%);
-            color: white;
-        }
-        
-        .top-header {
-            position: fixed; top: 0; left: 0; right: 0; z-index: 1000;
-            background: rgba(255, 255, 255, 0.25);
-            backdrop-filter: blur(20px);
-            border-bottom: 1px solid rgba(255, 255, 255, 0.3);
-            padding: 15px 30px;
-            display: flex; justify-content: space-between; align-items: center;
-        }
-        
-        [data-theme="dark"] .top-header {
-            background: rgba(26, 32, 44, 0.9);
-            border-bottom: 1px solid var(--border);
-        }
-        
-        .back-button {
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border);
-            border-radius: 15px; padding: 10px 20px; 
-            color: var(--text-primary); text-decoration: none;
-            display: flex; align-items: center; gap: 10px; 
-            font-weight: 600; font-size: 0.9rem;
-            transition: all 0.3s ease;
-            box-shadow: 0 2px 10px var(--shadow);
-        }
-        
-        [data-theme="light"] .back-button {
-            background: rgba(255, 255, 255, 0.3);
-            color: white;
-            border: 1px solid rgba(255, 255, 255, 0.4);
-        }
-        
-        .back-button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 8px 20px var(--shadow);
-        }
-        
-        .header-controls {
-            display: flex; gap: 15px; align-items: center;
-        }
-        
-        .language-selector {
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border);
-            border-radius: 15px; padding: 10px 15px; 
-            cursor: pointer; font-size: 0.9rem;
-            color: var(--text-primary); 
-            transition: all 0.2s ease;
-            box-shadow: 0 2px 10px var(--shadow);
-        }
-        
-        [data-theme="light"] .language-selector {
-            background: rgba(255, 255, 255, 0.3);
-            color: white;
-            border: 1px solid rgba(255, 255, 255, 0.4);
-        }
-        
-        .language-selector:hover { 
-            transform: translateY(-2px);
-            box-shadow: 0 8px 20px var(--shadow);
-        }
-        
-        .theme-toggle {
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border);
-            border-radius: 15px; padding: 12px; 
-            cursor: pointer; font-size: 1.2rem; 
-            transition: all 0.2s ease;
-            color: var(--text-primary);
-            box-shadow: 0 2px 10px var(--shadow);
-        }
-        
-        [data-theme="light"] .theme-toggle {
-            background: rgba(255, 255, 255, 0.3);
-            color: white;
-            border: 1px solid rgba(255, 255, 255, 0.4);
-        }
-        
-        .theme-toggle:hover { 
-            transform: translateY(-2px);
-            box-shadow: 0 8px 20px var(--shadow);
-        }
-        
-        .author-link {
-            font-size: 0.85rem; 
-            color: var(--text-primary); 
-            text-decoration: none;
-            font-weight: 500; 
-            transition: all 0.2s ease;
-            opacity: 0.8;
-        }
-        
-        [data-theme="light"] .author-link {
-            color: white;
-        }
-        
-        .author-link:hover { 
-            opacity: 1; 
-            transform: translateY(-1px); 
-        }
-        
-        .container {
-            flex: 1; padding: 100px 30px 30px; max-width: 1200px; margin: 0 auto; width: 100%;
-            display: flex; flex-direction: column; gap: 30px;
-        }
-        
-        .title-section {
-            text-align: center; margin-bottom: 20px;
-        }
-        
-        .title {
-            font-size: 2.5rem; font-weight: 700; margin-bottom: 10px; color: white;
-            text-shadow: 0 4px 20px rgba(0,0,0,0.3);
-        }
-        
-        [data-theme="dark"] .title {
-            color: var(--text-primary);
-            text-shadow: none;
-        }
-        
-        .subtitle { 
-            color: rgba(255,255,255,0.9); 
-            font-size: 1.1rem; 
-        }
-        
-        [data-theme="dark"] .subtitle {
-            color: var(--text-secondary);
-        }
-        
-        .stats {
-            display: flex; justify-content: center; gap: 20px; margin-bottom: 30px; flex-wrap: wrap;
-        }
-        
-        .stat-item {
-            background: rgba(255, 255, 255, 0.25);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            padding: 10px 20px; border-radius: 15px;
-            font-size: 0.9rem; color: rgba(255,255,255,0.95);
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] .stat-item {
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border);
-            color: var(--text-primary);
-            backdrop-filter: none;
-        }
-        
-        .form-section {
-            background: rgba(255, 255, 255, 0.25);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            border-radius: 25px; padding: 30px;
-            box-shadow: 0 8px 30px rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] .form-section {
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border);
-            backdrop-filter: none;
-        }
-        
-        .form-group { margin-bottom: 25px; }
-        
-        .label {
-            display: block; color: white; font-weight: 600; margin-bottom: 12px; font-size: 1rem;
-        }
-        
-        [data-theme="dark"] .label {
-            color: var(--text-primary);
-        }
-        
-        .input {
-            width: 100%; padding: 18px 24px; 
-            background: rgba(255, 255, 255, 0.3);
-            border: 1px solid rgba(255, 255, 255, 0.4);
-            border-radius: 20px; font-size: 1rem; color: white; outline: none; 
-            transition: all 0.3s ease;
-            backdrop-filter: blur(20px);
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] .input {
-            background: var(--bg-primary);
-            border: 1px solid var(--border);
-            color: var(--text-primary);
-            backdrop-filter: none;
-        }
-        
-        .input:focus {
-            background: rgba(255, 255, 255, 0.4);
-            border-color: rgba(255, 255, 255, 0.6);
-            box-shadow: 0 0 0 3px rgba(255,255,255,0.2);
-        }
-        
-        [data-theme="dark"] .input:focus {
-            background: var(--bg-secondary);
-            border-color: var(--accent);
-            box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.2);
-        }
-        
-        .input::placeholder { color: rgba(255,255,255,0.8); }
-        
-        [data-theme="dark"] .input::placeholder {
-            color: var(--text-secondary);
-        }
-        
-        .length-selector { display: flex; gap: 15px; flex-wrap: wrap; }
-        
-        .length-btn {
-            background: rgba(255, 255, 255, 0.25);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            border-radius: 15px; padding: 12px 20px; font-size: 0.9rem; 
-            color: rgba(255,255,255,0.9);
-            cursor: pointer; transition: all 0.2s ease; flex: 1; min-width: 150px;
-            backdrop-filter: blur(20px);
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] .length-btn {
-            background: var(--bg-primary);
-            border: 1px solid var(--border);
-            color: var(--text-primary);
-            backdrop-filter: none;
-        }
-        
-        .length-btn:hover { 
-            transform: translateY(-2px); 
-            background: rgba(255, 255, 255, 0.35);
-            box-shadow: 0 8px 25px rgba(0, 0, 0, 0.15);
-        }
-        
-        [data-theme="dark"] .length-btn:hover {
-            background: var(--bg-secondary);
-            box-shadow: 0 8px 25px var(--shadow);
-        }
-        
-        .length-btn.active {
-            background: rgba(255, 255, 255, 0.5); 
-            color: white; 
-            border-color: rgba(255, 255, 255, 0.6);
-            box-shadow: 0 8px 25px rgba(0, 0, 0, 0.2);
-        }
-        
-        [data-theme="dark"] .length-btn.active {
-            background: var(--accent);
-            color: white;
-            border-color: var(--accent);
-        }
-        
-        .mode-selector { display: flex; flex-wrap: wrap; gap: 8px; margin-top: 8px; }
-        
-        .mode-chip {
-            background: rgba(255, 255, 255, 0.25);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            border-radius: 12px; padding: 8px 14px; font-size: 0.8rem; 
-            color: rgba(255,255,255,0.9);
-            cursor: pointer; transition: all 0.2s ease;
-            backdrop-filter: blur(20px);
-            box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] .mode-chip {
-            background: var(--bg-primary);
-            border: 1px solid var(--border);
-            color: var(--text-primary);
-            backdrop-filter: none;
-        }
-        
-        .mode-chip:hover { 
-            transform: translateY(-1px); 
-            background: rgba(255, 255, 255, 0.35);
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.15);
-        }
-        
-        [data-theme="dark"] .mode-chip:hover {
-            background: var(--bg-secondary);
-            box-shadow: 0 4px 15px var(--shadow);
-        }
-        
-        .mode-chip.active {
-            background: rgba(255, 255, 255, 0.5); 
-            color: white; transform: translateY(-1px);
-            border-color: rgba(255, 255, 255, 0.6);
-            box-shadow: 0 6px 20px rgba(0, 0, 0, 0.2);
-        }
-        
-        [data-theme="dark"] .mode-chip.active {
-            background: var(--accent);
-            color: white;
-            border-color: var(--accent);
-        }
-        
-        .suggestions { margin-top: 15px; }
-        .suggestion-chips { display: flex; flex-wrap: wrap; gap: 8px; margin-top: 10px; }
-        
-        .chip {
-            background: rgba(255, 255, 255, 0.25);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            border-radius: 20px; padding: 8px 16px; font-size: 0.8rem; 
-            color: rgba(255,255,255,0.95);
-            cursor: pointer; transition: all 0.2s ease;
-            backdrop-filter: blur(20px);
-            box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] .chip {
-            background: var(--bg-primary);
-            border: 1px solid var(--border);
-            color: var(--text-primary);
-            backdrop-filter: none;
-        }
-        
-        .chip:hover {
-            background: rgba(255, 255, 255, 0.4); 
-            color: white; transform: translateY(-2px);
-            box-shadow: 0 6px 20px rgba(0, 0, 0, 0.15);
-        }
-        
-        [data-theme="dark"] .chip:hover {
-            background: var(--bg-secondary);
-            color: var(--text-primary);
-            box-shadow: 0 6px 20px var(--shadow);
-        }
-        
-        .btn {
-            background: rgba(255, 255, 255, 0.25);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            border-radius: 20px; padding: 18px 36px; font-size: 1.1rem; font-weight: 600;
-            color: rgba(255,255,255,0.95); cursor: pointer; transition: all 0.2s ease;
-            backdrop-filter: blur(20px);
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] .btn {
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border);
-            color: var(--text-primary);
-            backdrop-filter: none;
-        }
-        
-        .btn:hover:not(:disabled) {
-            transform: translateY(-2px); 
-            background: rgba(255, 255, 255, 0.35);
-            box-shadow: 0 8px 25px rgba(0, 0, 0, 0.15);
-        }
-        
-        [data-theme="dark"] .btn:hover:not(:disabled) {
-            background: var(--bg-secondary);
-            box-shadow: 0 8px 25px var(--shadow);
-        }
-        
-        .btn:active { transform: translateY(0); }
-        .btn:disabled { opacity: 0.6; cursor: not-allowed; }
-        
-        .btn-primary {
-            background: rgba(255, 255, 255, 0.4); 
-            color: white;
-            border-color: rgba(255, 255, 255, 0.5);
-            box-shadow: 0 6px 20px rgba(0, 0, 0, 0.15);
-        }
-        
-        [data-theme="dark"] .btn-primary {
-            background: var(--accent);
-            color: white;
-            border-color: var(--accent);
-        }
-        
-        .btn-primary:hover:not(:disabled) {
-            background: rgba(255, 255, 255, 0.5);
-            box-shadow: 0 10px 30px rgba(0, 0, 0, 0.2);
-        }
-        
-        [data-theme="dark"] .btn-primary:hover:not(:disabled) {
-            background: #5a6fd8;
-            box-shadow: 0 10px 30px rgba(102, 126, 234, 0.3);
-        }
-        
-        .controls {
-            display: flex; justify-content: center; align-items: center;
-            flex-wrap: wrap; gap: 15px;
-        }
-        
-        .status {
-            background: rgba(255, 255, 255, 0.25);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            border-radius: 20px;
-            padding: 25px; display: none;
-            box-shadow: 0 8px 30px rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] .status {
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border);
-            backdrop-filter: none;
-        }
-        
-        .status.active { display: block; animation: slideDown 0.3s ease; }
-        
-        .status-text {
-            color: white; font-weight: 500; margin-bottom: 15px;
-            display: flex; align-items: center;
-        }
-        
-        [data-theme="dark"] .status-text {
-            color: var(--text-primary);
-        }
-        
-        .progress-bar {
-            width: 100%; height: 8px; 
-            background: rgba(255, 255, 255, 0.3); border-radius: 10px; overflow: hidden;
-        }
-        
-        [data-theme="dark"] .progress-bar {
-            background: var(--bg-primary);
-        }
-        
-        .progress-fill {
-            height: 100%; border-radius: 10px; width: 0%; transition: width 0.3s ease;
-            background: linear-gradient(90deg, rgba(255,255,255,0.9), rgba(255,255,255,0.7));
-        }
-        
-        [data-theme="dark"] .progress-fill {
-            background: linear-gradient(90deg, var(--accent), #5a6fd8);
-        }
-        
-        .result {
-            background: rgba(255, 255, 255, 0.25);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            border-radius: 25px;
-            padding: 30px; display: none; position: relative;
-            box-shadow: 0 8px 30px rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] .result {
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border);
-            backdrop-filter: none;
-        }
-        
-        .result.active { display: block; animation: slideUp 0.5s ease; }
-        
-        .result-header {
-            display: flex; justify-content: space-between; align-items: flex-start;
-            margin-bottom: 15px;
-        }
-        
-        .result-title {
-            color: white; font-size: 1.3rem; font-weight: 600;
-            padding-bottom: 15px; border-bottom: 2px solid rgba(255, 255, 255, 0.3);
-            flex: 1; margin-right: 20px;
-        }
-        
-        [data-theme="dark"] .result-title {
-            color: var(--text-primary);
-            border-bottom: 2px solid var(--border);
-        }
-        
-        .copy-btn {
-            background: rgba(255, 255, 255, 0.25);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            border-radius: 12px; padding: 10px; cursor: pointer; font-size: 1rem; 
-            color: rgba(255,255,255,0.9); transition: all 0.2s ease;
-            backdrop-filter: blur(20px);
-            box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
-        }
-        
-        [data-theme="dark"] .copy-btn {
-            background: var(--bg-primary);
-            border: 1px solid var(--border);
-            color: var(--text-primary);
-            backdrop-filter: none;
-        }
-        
-        .copy-btn:hover {
-            transform: translateY(-2px); color: white; 
-            background: rgba(255, 255, 255, 0.35);
-            box-shadow: 0 6px 20px rgba(0, 0, 0, 0.15);
-        }
-        
-        [data-theme="dark"] .copy-btn:hover {
-            background: var(--bg-secondary);
-            color: var(--text-primary);
-            box-shadow: 0 6px 20px var(--shadow);
-        }
-        
-        .copy-btn.success { color: #4ade80; }
-        
-        .result-meta { color: rgba(255,255,255,0.9); font-size: 0.9rem; margin-bottom: 20px; }
-        
-        [data-theme="dark"] .result-meta {
-            color: var(--text-secondary);
-        }
-        
-        .result-content { color: rgba(255,255,255,0.95); line-height: 1.7; font-size: 1rem; }
-        
-        [data-theme="dark"] .result-content {
-            color: var(--text-primary);
-        }
-        
-        .result-content p { margin-bottom: 15px; }
-        .result-content strong { color: white; font-weight: 600; }
-        
-        [data-theme="dark"] .result-content strong {
-            color: var(--text-primary);
-        }
-        
-        .result-content em { font-style: italic; color: rgba(255,255,255,0.98); }
-        
-        [data-theme="dark"] .result-content em {
-            color: var(--text-secondary);
-        }
-        
-        .result-url {
-            margin-top: 20px; padding: 15px; border-radius: 15px;
-            background: rgba(255, 255, 255, 0.2); 
-            border-left: 4px solid rgba(255,255,255,0.6);
-        }
-        
-        [data-theme="dark"] .result-url {
-            background: var(--bg-primary);
-            border-left: 4px solid var(--accent);
-        }
-        
-        .result-url a {
-            color: rgba(255,255,255,0.95); text-decoration: none; font-weight: 500; word-break: break-all;
-        }
-        
-        [data-theme="dark"] .result-url a {
-            color: var(--text-primary);
-        }
-        
-        .result-url a:hover { color: white; text-decoration: underline; }
-        
-        [data-theme="dark"] .result-url a:hover {
-            color: var(--accent);
-        }
-        
-        .loading {
-            display: inline-block; width: 20px; height: 20px; margin-right: 10px;
-            border: 3px solid rgba(255,255,255,0.4); border-radius: 50%;
-            border-top-color: white; animation: spin 1s ease-in-out infinite;
-        }
-        
-        [data-theme="dark"] .loading {
-            border: 3px solid var(--text-secondary);
-            border-top-color: var(--accent);
-        }
-        
-        .modal {
-            position: fixed; top: 0; left: 0; width: 100%; height: 100%;
-            background: rgba(0,0,0,0.6); display: none; align-items: center; justify-content: center;
-            z-index: 1000; backdrop-filter: blur(10px);
-        }
-        
-        .modal.active { display: flex; animation: fadeIn 0.3s ease; }
-        
-        .modal-content {
-            background: rgba(255, 255, 255, 0.25);
-            backdrop-filter: blur(25px);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-            border-radius: 25px; padding: 40px;
-            max-width: 600px; width: 90%; max-height: 80vh; overflow-y: auto;
-            position: relative;
-            box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-        }
-        
-        [data-theme="dark"] .modal-content {
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border);
-            backdrop-filter: none;
-        }
-        
-        .modal-close {
-            position: absolute; top: 20px; right: 20px; background: none;
-            border: none; font-size: 1.5rem; cursor: pointer; 
-            color: rgba(255,255,255,0.9);
-            transition: color 0.2s ease;
-        }
-        
-        [data-theme="dark"] .modal-close {
-            color: var(--text-primary);
-        }
-        
-        .modal-close:hover { color: white; }
-        
-        [data-theme="dark"] .modal-close:hover {
-            color: var(--accent);
-        }
-        
-        .modal h2 {
-            color: white; font-size: 1.8rem; margin-bottom: 20px;
-        }
-        
-        [data-theme="dark"] .modal h2 {
-            color: var(--text-primary);
-        }
-        
-        .modal p {
-            color: rgba(255,255,255,0.95); line-height: 1.6; margin-bottom: 15px;
-        }
-        
-        [data-theme="dark"] .modal p {
-            color: var(--text-primary);
-        }
-        
-        @keyframes spin { to { transform: rotate(360deg); } }
-        @keyframes slideUp { from { opacity: 0; transform: translateY(20px); } to { opacity: 1; transform: translateY(0); } }
-        @keyframes slideDown { from { opacity: 0; transform: translateY(-10px); } to { opacity: 1; transform: translateY(0); } }
-        @keyframes fadeIn { from { opacity: 0; } to { opacity: 1; } }
-        
-        .notification {
-            position: fixed; top: 90px; right: 20px; padding: 15px 25px;
-            border-radius: 15px; color: white; font-weight: 500; z-index: 1000;
-            transform: translateX(400px); transition: all 0.3s ease;
-            backdrop-filter: blur(20px); border: 1px solid rgba(255, 255, 255, 0.3);
-        }
-        
-        .notification.show { transform: translateX(0); }
-        .notification.error { background: rgba(239, 68, 68, 0.9); }
-        .notification.success { background: rgba(34, 197, 94, 0.9); }
-        .notification.info { background: rgba(59, 130, 246, 0.9); }
-        
-        @media (max-width: 768px) {
-            .top-header { padding: 15px 20px; flex-direction: column; gap: 15px; }
-            .header-controls { width: 100%; justify-content: space-between; }
-            .container { padding: 140px 20px 20px; }
-            .title { font-size: 2rem; }
-            .stats { gap: 10px; }
-            .stat-item { padding: 8px 15px; font-size: 0.8rem; }
-            .length-selector { flex-direction: column; gap: 10px; }
-            .length-btn { min-width: auto; }
-            .mode-selector { justify-content: center; }
-            .controls { flex-direction: column; gap: 10px; }
-            .btn { width: 100%; }
-            .result-header { flex-direction: column; align-items: flex-start; }
-            .result-title { margin-right: 0; margin-bottom: 15px; }
-            .modal-content { padding: 25px 20px; }
-        }
-    </style>
-</head>
-<body>
-    <!-- Header fixe avec bouton retour -->
-    <div class="top-header">
-        <a href="/" class="back-button">
-            <span>←</span>
-            <span data-text-key="back_to_hub">Retour au Hub</span>
-        </a>
-        
-        <div class="header-controls">
-            <select class="language-selector" id="languageSelector" onchange="changeLanguage()">
-                <option value="en">🇺🇸 English</option>
-                <option value="fr">🇫🇷 Français</option>
-                <option value="es">🇪🇸 Español</option>
-            </select>
-            
-            <button class="theme-toggle" id="themeToggle" onclick="toggleTheme()">🌙</button>
-            <a href="#" class="author-link" onclick="showAuthorModal()" data-text-key="by_mydd">by Mydd</a>
-        </div>
-    </div>
-
-    <div class="container">
-        <div class="title-section">
-            <h1 class="title" data-text-key="title">Wikipedia Summarizer Pro</h1>
-            <p class="subtitle" data-text-key="subtitle">Smart summaries with Mistral AI</p>
-        </div>
-
-        <div class="stats" id="stats">
-            <div class="stat-item">📊 <span id="totalRequests">0</span> <span data-text-key="requests">requests</span></div>
-            <div class="stat-item">💾 <span id="cacheHits">0</span> <span data-text-key="cached">cached</span></div>
-            <div class="stat-item">📖 <span id="wikiSuccess">0</span> <span data-text-key="wikipedia">Wikipedia</span></div>
-            <div class="stat-item">🤖 <span id="aiOnly">0</span> <span data-text-key="ai_only">AI only</span></div>
-        </div>
-
-        <div class="form-section">
-            <form id="summarizerForm" onsubmit="handleFormSubmit(event)">
-                <div class="form-group">
-                    <label class="label" for="theme">🔍 <span data-text-key="search_theme">Theme to search</span></label>
-                    <input type="text" id="theme" class="input" 
-                           data-placeholder-key="search_placeholder" required>
-                    
-                    <div class="suggestions">
-                        <span style="color: rgba(255,255,255,0.9); font-size: 0.9rem;">💡 <span data-text-key="popular_suggestions">Popular suggestions:</span></span>
-                        <div class="suggestion-chips" id="suggestionChips"></div>
-                    </div>
-                </div>
-
-                <div class="form-group">
-                    <label class="label">📏 <span data-text-key="summary_length">Summary length</span></label>
-                    <div class="length-selector">
-                        <button type="button" class="length-btn" onclick="selectLength('court', this)">
-                            📝 <span data-text-key="short">Short</span><br><small><span data-text-key="short_desc">150-200 words</span></small>
-                        </button>
-                        <button type="button" class="length-btn active" onclick="selectLength('moyen', this)">
-                            📄 <span data-text-key="medium">Medium</span><br><small><span data-text-key="medium_desc">250-350 words</span></small>
-                        </button>
-                        <button type="button" class="length-btn" onclick="selectLength('long', this)">
-                            📚 <span data-text-key="long">Long</span><br><small><span data-text-key="long_desc">400-500 words</span></small>
-                        </button>
-                    </div>
-                </div>
-
-                <div class="form-group">
-                    <label class="label">🎯 <span data-text-key="summary_mode">Summary mode</span> <small style="opacity: 0.8;">(<span data-text-key="optional">optional</span>)</small></label>
-                    <div class="mode-selector">
-                        <button type="button" class="mode-chip active" onclick="selectMode('general', this)">
-                            📋 <span data-text-key="mode_general">General</span>
-                        </button>
-                        <button type="button" class="mode-chip" onclick="selectMode('historique', this)">
-                            ⏳ <span data-text-key="mode_historical">Historical</span>
-                        </button>
-                        <button type="button" class="mode-chip" onclick="selectMode('scientifique', this)">
-                            🔬 <span data-text-key="mode_scientific">Scientific</span>
-                        </button>
-                        <button type="button" class="mode-chip" onclick="selectMode('biographique', this)">
-                            👤 <span data-text-key="mode_biographical">Biographical</span>
-                        </button>
-                        <button type="button" class="mode-chip" onclick="selectMode('scolaire', this)">
-                            🎓 <span data-text-key="mode_educational">Educational</span>
-                        </button>
-                        <button type="button" class="mode-chip" onclick="selectMode('culture', this)">
-                            🎭 <span data-text-key="mode_cultural">Cultural</span>
-                        </button>
-                        <button type="button" class="mode-chip" onclick="selectMode('faits', this)">
-                            ⚡ <span data-text-key="mode_key_facts">Key Facts</span>
-                        </button>
-                    </div>
-                </div>
-
-                <div class="controls">
-                    <button type="submit" class="btn btn-primary" id="generateBtn">
-                        ✨ <span data-text-key="generate">Generate summary</span>
-                    </button>
-                    <button type="button" class="btn" onclick="clearAll()">
-                        🗑️ <span data-text-key="clear">Clear</span>
-                    </button>
-                </div>
-            </form>
-        </div>
-
-        <div id="status" class="status">
-            <div class="status-text">
-                <span class="loading"></span>
-                <span id="statusText" data-text-key="processing">Processing...</span>
-            </div>
-            <div class="progress-bar">
-                <div id="progressFill" class="progress-fill"></div>
-            </div>
-        </div>
-
-        <div id="result" class="result">
-            <div class="result-header">
-                <div class="result-title" id="resultTitle">📖 <span data-text-key="generated_summary">Generated summary</span></div>
-                <button class="copy-btn" id="copyBtn" onclick="copyResult()" title="Copy to clipboard">
-                    📋
-                </button>
-            </div>
-            <div class="result-meta" id="resultMeta">Source: Wikipedia • 2.3s • Medium</div>
-            <div class="result-content" id="resultContent"></div>
-            <div id="resultUrl" class="result-url" style="display: none;">
-                <strong>🔗 <span data-text-key="wikipedia_source">Wikipedia Source:</span></strong><br>
-                <a href="#" target="_blank" id="wikiLink"></a>
-            </div>
-        </div>
-    </div>
-
-    <!-- Author Modal -->
-    <div id="authorModal" class="modal">
-        <div class="modal-content">
-            <button class="modal-close" onclick="hideAuthorModal()">×</button>
-            <h2 data-text-key="about_author">About the Author</h2>
-            <p data-text-key="author_intro">Hi! I'm Mydd, and I'm 16 years old.</p>
-            <p data-text-key="author_student">I'm still a student, passionate about technology and artificial intelligence.</p>
-            <p data-text-key="author_motivation">I created this project because I believe it's important to have reliable sources and that ideas should be well explained, without errors.</p>
-            <p data-text-key="author_mission">My goal is to make information more accessible to everyone through intelligent tools that combine the reliability of Wikipedia with the power of AI.</p>
-            <p data-text-key="author_thanks">Thank you for using Wikipedia Summarizer Pro!</p>
-        </div>
-    </div>
-
-    <script>
-        let isProcessing = false;
-        let currentLength = 'moyen';
-        let currentLanguage = 'en';
-        let currentTheme = 'light';
-        let currentMode = 'general';
-        
-        // Translations object
-        const translations = {
-            en: {
-                title: "Wikipedia Summarizer Pro",
-                subtitle: "Smart summaries with Mistral AI",
-                back_to_hub: "Back to Hub",
-                search_theme: "Theme to search",
-                search_placeholder: "Artificial intelligence, Paris, Einstein...",
-                popular_suggestions: "Popular suggestions:",
-                summary_length: "Summary length",
-                summary_mode: "Summary mode",
-                optional: "optional",
-                short: "Short",
-                medium: "Medium",
-                long: "Long",
-                short_desc: "150-200 words",
-                medium_desc: "250-350 words", 
-                long_desc: "400-500 words",
-                mode_general: "General",
-                mode_historical: "Historical",
-                mode_scientific: "Scientific",
-                mode_biographical: "Biographical",
-                mode_educational: "Educational",
-                mode_cultural: "Cultural",
-                mode_key_facts: "Key Facts",
-                generate: "Generate summary",
-                clear: "Clear",
-                processing: "Processing...",
-                generated_summary: "Generated summary",
-                wikipedia_source: "Wikipedia Source:",
-                requests: "requests",
-                cached: "cached",
-                wikipedia: "Wikipedia",
-                ai_only: "AI only",
-                by_mydd: "by Mydd",
-                about_author: "About the Author",
-                author_intro: "Hi! I'm Mydd, and I'm 16 years old.",
-                author_student: "I'm still a student, passionate about technology and artificial intelligence.",
-                author_motivation: "I created this project because I believe it's important to have reliable sources and that ideas should be well explained, without errors.",
-                author_mission: "My goal is to make information more accessible to everyone through intelligent tools that combine the reliability of Wikipedia with the power of AI.",
-                author_thanks: "Thank you for using Wikipedia Summarizer Pro!",
-                searching: "Searching...",
-                generating: "Generating...",
-                completed: "Completed!",
-                copied: "Copied!",
-                copy_error: "Copy failed",
-                processing_theme: "Processing in progress...",
-                already_processing: "A process is already running...",
-                invalid_theme: "Please enter a valid theme (minimum 2 characters)",
-                summary_generated: "Summary generated!",
-                processing_error: "Processing error"
-            },
-            fr: {
-                title: "Wikipedia Summarizer Pro",
-                subtitle: "Résumés intelligents avec Mistral AI",
-                back_to_hub: "Retour au Hub",
-                search_theme: "Thème à rechercher",
-                search_placeholder: "Intelligence artificielle, Paris, Einstein...",
-                popular_suggestions: "Suggestions populaires:",
-                summary_length: "Longueur du résumé",
-                summary_mode: "Mode de résumé",
-                optional: "optionnel",
-                short: "Court",
-                medium: "Moyen", 
-                long: "Long",
-                short_desc: "150-200 mots",
-                medium_desc: "250-350 mots",
-                long_desc: "400-500 mots",
-                mode_general: "Général",
-                mode_historical: "Historique",
-                mode_scientific: "Scientifique",
-                mode_biographical: "Biographique",
-                mode_educational: "Scolaire",
-                mode_cultural: "Culturel",
-                mode_key_facts: "Faits Clés",
-                generate: "Générer le résumé",
-                clear: "Effacer",
-                processing: "Traitement en cours...",
-                generated_summary: "Résumé généré",
-                wikipedia_source: "Source Wikipedia:",
-                requests: "requêtes",
-                cached: "en cache",
-                wikipedia: "Wikipedia",
-                ai_only: "IA seule",
-                by_mydd: "by Mydd",
-                about_author: "À propos de l'auteur",
-                author_intro: "Salut ! Je suis Mydd, et j'ai 16 ans.",
-                author_student: "Je suis encore étudiant, passionné par la technologie et l'intelligence artificielle.",
-                author_motivation: "J'ai créé ce projet parce que je pense qu'il est important d'avoir des sources fiables et que les idées soient bien expliquées, sans erreurs.",
-                author_mission: "Mon objectif est de rendre l'information plus accessible à tous grâce à des outils intelligents qui combinent la fiabilité de Wikipedia avec la puissance de l'IA.",
-                author_thanks: "Merci d'utiliser Wikipedia Summarizer Pro !",
-                searching: "Recherche en cours...",
-                generating: "Génération...",
-                completed: "Terminé !",
-                copied: "Copié !",
-                copy_error: "Échec de la copie",
-                processing_theme: "Traitement en cours...",
-                already_processing: "Un traitement est déjà en cours...",
-                invalid_theme: "Veuillez entrer un thème valide (minimum 2 caractères)",
-                summary_generated: "Résumé généré !",
-                processing_error: "Erreur de traitement"
-            },
-            es: {
-                title: "Wikipedia Summarizer Pro", 
-                subtitle: "Resúmenes inteligentes con Mistral AI",
-                back_to_hub: "Volver al Hub",
-                search_theme: "Tema a buscar",
-                search_placeholder: "Inteligencia artificial, París, Einstein...",
-                popular_suggestions: "Sugerencias populares:",
-                summary_length: "Longitud del resumen",
-                summary_mode: "Modo de resumen",
-                optional: "opcional",
-                short: "Corto",
-                medium: "Medio",
-                long: "Largo", 
-                short_desc: "150-200 palabras",
-                medium_desc: "250-350 palabras",
-                long_desc: "400-500 palabras",
-                mode_general: "General",
-                mode_historical: "Histórico",
-                mode_scientific: "Científico",
-                mode_biographical: "Biográfico",
-                mode_educational: "Educativo",
-                mode_cultural: "Cultural",
-                mode_key_facts: "Datos Clave",
-                generate: "Generar resumen",
-                clear: "Limpiar",
-                processing: "Procesando...",
-                generated_summary: "Resumen generado",
-                wikipedia_source: "Fuente Wikipedia:",
-                requests: "solicitudes",
-                cached: "en caché", 
-                wikipedia: "Wikipedia",
-                ai_only: "Solo IA",
-                by_mydd: "by Mydd",
-                about_author: "Acerca del Autor",
-                author_intro: "¡Hola! Soy Mydd, y tengo 16 años.",
-                author_student: "Todavía soy estudiante, apasionado por la tecnología y la inteligencia artificial.",
-                author_motivation: "Creé este proyecto porque creo que es importante tener fuentes confiables y que las ideas estén bien explicadas, sin errores.",
-                author_mission: "Mi objetivo es hacer la información más accesible para todos a través de herramientas inteligentes que combinan la confiabilidad de Wikipedia con el poder de la IA.",
-                author_thanks: "¡Gracias por usar Wikipedia Summarizer Pro!",
-                searching: "Buscando...",
-                generating: "Generando...",
-                completed: "¡Completado!",
-                copied: "¡Copiado!",
-                copy_error: "Error al copiar",
-                processing_theme: "Procesamiento en curso...",
-                already_processing: "Ya hay un proceso en ejecución...",
-                invalid_theme: "Por favor ingrese un tema válido (mínimo 2 caracteres)",
-                summary_generated: "¡Resumen generado!",
-                processing_error: "Error de procesamiento"
-            }
-        };
-
-        const popularThemes = {
-            en: ["Artificial Intelligence", "Climate Change", "Einstein", "French Revolution", "Marie Curie", "Paris", "Photosynthesis", "Bitcoin", "Solar System"],
-            fr: ["Intelligence artificielle", "Réchauffement climatique", "Einstein", "Révolution française", "Marie Curie", "Paris", "Photosynthèse", "Bitcoin", "Système solaire"],
-            es: ["Inteligencia Artificial", "Cambio Climático", "Einstein", "Revolución Francesa", "Marie Curie", "París", "Fotosíntesis", "Bitcoin", "Sistema Solar"]
-        };
-
-        document.addEventListener('DOMContentLoaded', function() {
-            initializeApp();
-        });
-
-        function initializeApp() {
-            loadTheme();
-            loadLanguage();
-            initializeSuggestions();
-            loadStats();
-            updateTranslations();
-            const themeInput = document.getElementById('theme');
-            if (themeInput) themeInput.focus();
-        }
-
-        function loadTheme() {
-            const savedTheme = localStorage.getItem('theme') || 'light';
-            currentTheme = savedTheme;
-            document.documentElement.setAttribute('data-theme', savedTheme);
-            updateThemeToggle();
-        }
-
-        function loadLanguage() {
-            const savedLanguage = localStorage.getItem('language') || 'en';
-            currentLanguage = savedLanguage;
-            document.getElementById('languageSelector').value = savedLanguage;
-            updateTranslations();
-        }
-
-        function toggleTheme() {
-            currentTheme = currentTheme === 'light' ? 'dark' : 'light';
-            document.documentElement.setAttribute('data-theme', currentTheme);
-            localStorage.setItem('theme', currentTheme);
-            updateThemeToggle();
-        }
-
-        function updateThemeToggle() {
-            const toggle = document.getElementById('themeToggle');
-            if (toggle) {
-                toggle.textContent = currentTheme === 'light' ? '🌙' : '☀️';
-            }
-        }
-
-        function changeLanguage() {
-            const selector = document.getElementById('languageSelector');
-            currentLanguage = selector.value;
-            localStorage.setItem('language', currentLanguage);
-            updateTranslations();
-            initializeSuggestions();
-        }
-
-        function updateTranslations() {
-            const elements = document.querySelectorAll('[data-text-key]');
-            elements.forEach(element => {
-                const key = element.getAttribute('data-text-key');
-                if (translations[currentLanguage] && translations[currentLanguage][key]) {
-                    element.textContent = translations[currentLanguage][key];
-                }
-            });
-
-            // Update placeholder
-            const themeInput = document.getElementById('theme');
-            if (themeInput && translations[currentLanguage].search_placeholder) {
-                themeInput.placeholder = translations[currentLanguage].search_placeholder;
-            }
-        }
-
-        function selectLength(length, element) {
-            document.querySelectorAll('.length-btn').forEach(btn => btn.classList.remove('active'));
-            element.classList.add('active');
-            currentLength = length;
-        }
-
-        function selectMode(mode, element) {
-            document.querySelectorAll('.mode-chip').forEach(btn => btn.classList.remove('active'));
-            element.classList.add('active');
-            currentMode = mode;
-        }
-
-        function showAuthorModal() {
-            document.getElementById('authorModal').classList.add('active');
-        }
-
-        function hideAuthorModal() {
-            document.getElementById('authorModal').classList.remove('active');
-        }
-
-        function copyResult() {
-            const content = document.getElementById('resultContent');
-            const copyBtn = document.getElementById('copyBtn');
-            
-            if (!content || !content.textContent) {
-                showNotification(translations[currentLanguage].copy_error, 'error');
-                return;
-            }
-
-            const textContent = content.textContent || content.innerText;
-            
-            navigator.clipboard.writeText(textContent).then(function() {
-                copyBtn.textContent = '✅';
-                copyBtn.classList.add('success');
-                showNotification(translations[currentLanguage].copied, 'success');
-                
-                setTimeout(() => {
-                    copyBtn.textContent = '📋';
-                    copyBtn.classList.remove('success');
-                }, 2000);
-            }).catch(function() {
-                showNotification(translations[currentLanguage].copy_error, 'error');
-            });
-        }
-
-        function handleFormSubmit(event) {
-            event.preventDefault();
-            
-            if (isProcessing) {
-                showNotification(translations[currentLanguage].already_processing, 'info');
-                return false;
-            }
-
-            const themeInput = document.getElementById('theme');
-            const theme = themeInput ? themeInput.value.trim() : '';
-            
-            if (!theme || theme.length < 2) {
-                showNotification(translations[currentLanguage].invalid_theme, 'error');
-                if (themeInput) themeInput.focus();
-                return false;
-            }
-
-            processTheme(theme, currentLength, currentLanguage, currentMode);
-            return false;
-        }
-
-        function initializeSuggestions() {
-            const container = document.getElementById('suggestionChips');
-            if (!container) return;
-            
-            container.innerHTML = '';
-            const themes = popularThemes[currentLanguage] || popularThemes.en;
-            const shuffled = [...themes].sort(() => 0.5 - Math.random()).slice(0, 6);
-            
-            shuffled.forEach(theme => {
-                const chip = document.createElement('button');
-                chip.className = 'chip';
-                chip.textContent = theme;
-                chip.type = 'button';
-                chip.onclick = function() {
-                    const themeInput = document.getElementById('theme');
-                    if (themeInput) {
-                        themeInput.value = theme;
-                        themeInput.focus();
-                    }
-                };
-                container.appendChild(chip);
-            });
-        }
-
-        async function loadStats() {
-            try {
-                const response = await fetch('/api/stats');
-                if (response.ok) {
-                    const stats = await response.json();
-                    updateStatsDisplay(stats);
-                }
-            } catch (error) {
-                console.log('Stats error:', error);
-            }
-        }
-
-        function updateStatsDisplay(stats) {
-            const elements = {
-                totalRequests: document.getElementById('totalRequests'),
-                cacheHits: document.getElementById('cacheHits'),
-                wikiSuccess: document.getElementById('wikiSuccess'),
-                aiOnly: document.getElementById('aiOnly')
-            };
-
-            if (elements.totalRequests) elements.totalRequests.textContent = stats.requests || 0;
-            if (elements.cacheHits) elements.cacheHits.textContent = stats.cache_hits || 0;
-            if (elements.wikiSuccess) elements.wikiSuccess.textContent = stats.wikipedia_success || 0;
-            if (elements.aiOnly) elements.aiOnly.textContent = stats.mistral_only || 0;
-        }
-
-        async function processTheme(theme, lengthMode, language, mode) {
-            isProcessing = true;
-            const generateBtn = document.getElementById('generateBtn');
-            const generateText = generateBtn.querySelector('[data-text-key="generate"]');
-            
-            if (generateBtn) {
-                generateBtn.disabled = true;
-                if (generateText) generateText.textContent = translations[currentLanguage].processing_theme;
-            }
-            
-            showStatus(translations[currentLanguage].searching);
-            hideResult();
-
-            try {
-                const requestData = {
-                    theme: theme,
-                    length_mode: lengthMode,
-                    language: language,
-                    mode: mode
-                };
-                
-                updateProgress(20);
-                updateStatus(translations[currentLanguage].searching);
-                
-                const response = await fetch('/api/summarize', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                        'Accept': 'application/json'
-                    },
-                    body: JSON.stringify(requestData)
-                });
-
-                updateProgress(60);
-                updateStatus(translations[currentLanguage].generating);
-
-                if (!response.ok) {
-                    let errorMessage = `HTTP Error ${response.status}`;
-                    try {
-                        const errorData = await response.json();
-                        errorMessage = errorData.error || errorMessage;
-                    } catch (e) {
-                        const errorText = await response.text();
-                        errorMessage = errorText || errorMessage;
-                    }
-                    throw new Error(errorMessage);
-                }
-
-                const data = await response.json();
-
-                if (!data.success) {
-                    throw new Error(data.error || 'Unknown error');
-                }
-
-                updateProgress(100);
-                updateStatus(translations[currentLanguage].completed);
-                await sleep(500);
-
-                showResult(data);
-                hideStatus();
-                
-                setTimeout(loadStats, 500);
-                showNotification(translations[currentLanguage].summary_generated, 'success');
-
-            } catch (error) {
-                console.error('Error:', error);
-                showNotification(error.message || translations[currentLanguage].processing_error, 'error');
-                hideStatus();
-            } finally {
-                isProcessing = false;
-                if (generateBtn && generateText) {
-                    generateBtn.disabled = false;
-                    generateText.textContent = translations[currentLanguage].generate;
-                }
-            }
-        }
-
-        function updateProgress(percent) {
-            const progressFill = document.getElementById('progressFill');
-            if (progressFill) progressFill.style.width = percent + '%';
-        }
-
-        function updateStatus(message) {
-            const statusText = document.getElementById('statusText');
-            if (statusText) statusText.textContent = message;
-        }
-
-        function showStatus(message) {
-            updateStatus(message);
-            const statusDiv = document.getElementById('status');
-            if (statusDiv) statusDiv.classList.add('active');
-            updateProgress(0);
-        }
-
-        function hideStatus() {
-            const statusDiv = document.getElementById('status');
-            if (statusDiv) statusDiv.classList.remove('active');
-            setTimeout(() => updateProgress(0), 300);
-        }
-
-        function showResult(data) {
-            const elements = {
-                title: document.getElementById('resultTitle'),
-                content: document.getElementById('resultContent'),
-                meta: document.getElementById('resultMeta'),
-                url: document.getElementById('resultUrl'),
-                link: document.getElementById('wikiLink'),
-                result: document.getElementById('result')
-            };
-            
-            const titleSpan = elements.title ? elements.title.querySelector('[data-text-key="generated_summary"]') : null;
-            if (titleSpan) {
-                elements.title.innerHTML = '📖 <span data-text-key="generated_summary">' + translations[currentLanguage].generated_summary + '</span>';
-            }
-            if (elements.content) elements.content.innerHTML = data.summary;
-            
-            const sourceIcon = data.source === 'wikipedia' ? '📖' : '🤖';
-            const sourceText = data.source === 'wikipedia' ? translations[currentLanguage].wikipedia : translations[currentLanguage].ai_only;
-            
-            const modeText = currentMode !== 'general' ? ` • ${currentMode}` : '';
-            let metaText = `${sourceIcon} ${sourceText} • ${data.processing_time}s • ${data.length_mode}${modeText}`;
-            
-            if (data.method) metaText += ` • ${data.method}`;
-            if (elements.meta) elements.meta.textContent = metaText;
-            
-            if (data.url && elements.url && elements.link) {
-                const sourceSpan = elements.url.querySelector('[data-text-key="wikipedia_source"]');
-                if (sourceSpan) sourceSpan.textContent = translations[currentLanguage].wikipedia_source;
-                elements.link.href = data.url;
-                elements.link.textContent = data.url;
-                elements.url.style.display = 'block';
-            } else if (elements.url) {
-                elements.url.style.display = 'none';
-            }
-
-            if (elements.result) elements.result.classList.add('active');
-        }
-
-        function hideResult() {
-            const resultDiv = document.getElementById('result');
-            if (resultDiv) resultDiv.classList.remove('active');
-        }
-
-        function clearAll() {
-            const themeInput = document.getElementById('theme');
-            if (themeInput) {
-                themeInput.value = '';
-                themeInput.focus();
-            }
-            hideStatus();
-            hideResult();
-            isProcessing = false;
-            
-            currentMode = 'general';
-            document.querySelectorAll('.mode-chip').forEach(btn => btn.classList.remove('active'));
-            document.querySelector('.mode-chip[onclick*="general"]').classList.add('active');
-            
-            const generateBtn = document.getElementById('generateBtn');
-            const generateText = generateBtn ? generateBtn.querySelector('[data-text-key="generate"]') : null;
-            if (generateBtn) {
-                generateBtn.disabled = false;
-                if (generateText) generateText.textContent = translations[currentLanguage].generate;
-            }
-        }
-
-        function showNotification(message, type = 'info') {
-            document.querySelectorAll('.notification').forEach(n => n.remove());
-            
-            const notification = document.createElement('div');
-            notification.className = `notification ${type}`;
-            notification.textContent = message;
-            
-            document.body.appendChild(notification);
-            setTimeout(() => notification.classList.add('show'), 100);
-            setTimeout(() => {
-                notification.classList.remove('show');
-                setTimeout(() => notification.remove(), 300);
-            }, 3000);
-        }
-
-        function sleep(ms) {
-            return new Promise(resolve => setTimeout(resolve, ms));
-        }
-
-        // Keyboard shortcuts
-        document.addEventListener('keydown', function(e) {
-            if (e.key === 'Enter' && !e.ctrlKey && !e.metaKey) {
-                const target = e.target;
-                if (target && target.id === 'theme' && !isProcessing && target.value.trim()) {
-                    e.preventDefault();
-                    handleFormSubmit(e);
-                }
-            }
-            
-            if (e.key === 'Escape') {
-                hideAuthorModal();
-            }
-        });
-
-        document.getElementById('authorModal').addEventListener('click', function(e) {
-            if (e.target === this) {
-                hideAuthorModal();
-            }
-        });
-    </script>
-</body>
-</html>'''
-
-@app.route('/api/summarize', methods=['POST'])
+    """Page d'accueil avec l'interface en plein écran (précompressée, revalidée par ETag)"""
+    return assets.respond(assets.page)
+
+@app.route('/static/<path:filename>')
+def static_asset(filename):
+    """CSS/JS de l'interface, immuables sous leur nom haché"""
+    response = assets.respond(filename)
+    if response is None:
+        return jsonify({'success': False, 'error': 'Fichier introuvable'}), 404
+    return response
+
+@app.route('/api/summarize', methods=['GET', 'POST'])
 def summarize():
     """API endpoint pour traiter les résumés avec support multilingue et modes thématiques"""
     try:
         print("🚀 REQUÊTE /api/summarize")
         
-        if not request.is_json:
+        if request.method == 'GET':
+            data = request.args.to_dict()
+        elif not request.is_json:
             return jsonify({'success': False, 'error': 'Content-Type doit être application/json'}), 400
-        
-        data = request.get_json()
+        else:
+            data = request.get_json()
         
         if not data:
             return jsonify({'success': False, 'error': 'Données JSON requises'}), 400
@@ -1852,6 +889,17 @@ def summarize():
         if not theme or not theme.strip():
             return jsonify({'success': False, 'error': 'Thème requis'}), 400
         
+        # Réponse déjà sérialisée (sauf revalidation complète demandée par le client)
+        response_key = summarizer.response_key(theme, length_mode, language, mode)
+        refresh = request.cache_control.no_cache or request.cache_control.no_store
+        if response_key and not refresh:
+            encoded = summarizer.responses.get(response_key)
+            if encoded is not None:
+                if summarizer.touch_entry(response_key, theme, length_mode, language, mode, encoded['meta']):
+                    print("⚡ Réponse pré-sérialisée")
+                    return summarizer.responses.respond(encoded)
+                summarizer.responses.discard(response_key)
+        
         print(f"🚀 TRAITEMENT: '{theme}' ({length_mode}, {language}, {mode})")
         
         result = summarizer.process_theme(theme, length_mode, language, mode)
@@ -1859,21 +907,158 @@ def summarize():
         if not result.get('success'):
             error_msg = result.get('error', 'Erreur inconnue')
             print(f"❌ ÉCHEC: {error_msg}")
+            if result.get('retry_after'):
+                response = jsonify({'success': False, 'error': error_msg, 'retry_after': result['retry_after']})
+                response.headers['Retry-After'] = str(result['retry_after'])
+                return response, 503
             return jsonify({'success': False, 'error': error_msg}), 500
         
         print(f"✅ SUCCÈS: {result.get('title', 'Sans titre')}")
-        return jsonify(result), 200
+        
+        # Résumé extractif (surcharge): ni pré-sérialisé ni réutilisable par le navigateur
+        if result.get('degraded'):
+            return jsonify(result), 200
+        
+        encoded = summarizer.responses.encode(result, meta={'title': result.get('title'), 'source': result.get('source')})
+        if response_key and result.get('from_cache') and 'semantic_similarity' not in result:
+            summarizer.responses.store(response_key, encoded)
+        return summarizer.responses.respond(encoded)
         
     except Exception as e:
         error_msg = str(e)
         print(f"💥 ERREUR ENDPOINT: {error_msg}")
         return jsonify({'success': False, 'error': f'Erreur serveur: {error_msg}'}), 500
 
+@app.route('/api/jobs/summarize', methods=['POST'])
+def submit_summarize_job():
+    """Résumé asynchrone: 202 avec l'identifiant de la tâche, résultat via polling ou SSE"""
+    try:
+        if not request.is_json:
+            return jsonify({'success': False, 'error': 'Content-Type doit être application/json'}), 400
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'error': 'Données JSON requises'}), 400
+        
+        theme = data.get('theme')
+        length_mode = data.get('length_mode', 'moyen')
+        language = data.get('language', 'en')
+        mode = data.get('mode', 'general')
+        
+        response_key = summarizer.response_key(theme or '', length_mode, language, mode)
+        if not response_key:
+            return jsonify({'success': False, 'error': 'Le thème doit contenir au moins 2 caractères'}), 400
+        
+        job, deduplicated = summarizer.jobs.submit(
+            response_key,
+            lambda: summarizer.process_theme(theme, length_mode, language, mode)
+        )
+        if job is None:
+            response = jsonify({'success': False, 'error': 'Trop de tâches en attente, réessayez plus tard'})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+        
+        print(f"🧵 Tâche {job['id'][:8]} ({'dédupliquée' if deduplicated else 'créée'}) pour '{theme}'")
+        poll_url = f"{request.script_root}/api/jobs/{job['id']}"
+        response = jsonify(dict(summarizer.jobs.describe(job), success=True, deduplicated=deduplicated,
+                                poll_url=poll_url, events_url=f"{poll_url}/events"))
+        response.headers['Location'] = poll_url
+        return response, 202
+        
+    except Exception as e:
+        print(f"💥 ERREUR JOB: {str(e)}")
+        return jsonify({'success': False, 'error': f'Erreur serveur: {str(e)}'}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """État d'une tâche (polling), avec le résultat une fois terminée"""
+    job = summarizer.jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Tâche inconnue ou expirée'}), 404
+    return jsonify(dict(summarizer.jobs.describe(job), success=True)), 200
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Flux SSE des changements d'état d'une tâche (se termine avec le résultat)"""
+    job = summarizer.jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Tâche inconnue ou expirée'}), 404
+    
+    response = Response(summarizer.jobs.events(job), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/suggest', methods=['GET'])
+def suggest():
+    """API endpoint pour l'autocomplétion des thèmes"""
+    try:
+        query = request.args.get('q', '')[:100]
+        language = request.args.get('language', 'en')
+        trie = summarizer.suggestions.get(language, summarizer.suggestions['en'])
+        
+        try:
+            limit = max(1, min(int(request.args.get('limit', 8)), 8))
+        except ValueError:
+            limit = 8
+        
+        suggestions = trie.search(query, limit) if query.strip() else []
+        return jsonify({'success': True, 'query': query, 'suggestions': suggestions}), 200
+    except Exception as e:
+        print(f"💥 ERREUR SUGGEST: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """API endpoint pour les statistiques"""
     try:
-        return jsonify(summarizer.stats), 200
+        stats = dict(summarizer.stats, cache_size=summarizer.cache.size(), cache_policy=summarizer.cache_policy,
+                     snapshot=summarizer.snapshot.get_stats())
+        if isinstance(summarizer.cache.backend, TinyLFUCache):
+            stats['cache_admission'] = summarizer.cache.backend.stats.copy()
+        stats['cache_compression'] = summarizer.cache.get_stats()
+        stats['responses'] = dict(summarizer.responses.stats, size=summarizer.responses.size())
+        stats['assets'] = assets.get_stats()
+        stats['jobs'] = summarizer.jobs.get_stats()
+        stats['admission'] = summarizer.limiter.get_stats()
+        stats['key_stats'] = summarizer.key_pool.get_stats()
+        stats['hedging'] = summarizer.hedging.get_stats()
+        stats['routing'] = summarizer.router.get_stats()
+        stats['token_usage'] = summarizer.token_usage.get_stats()
+        if summarizer.semantic:
+            stats['semantic'] = summarizer.semantic.get_stats()
+        return jsonify(stats), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/stats/top', methods=['GET'])
+def get_top_queries():
+    """API endpoint pour les thèmes les plus demandés"""
+    try:
+        try:
+            limit = min(int(request.args.get('limit', 20)), 100)
+        except ValueError:
+            limit = 20
+        
+        top = [dict(label, count=count) for _, label, count in summarizer.popularity.most_common(limit)]
+        return jsonify({'top': top, 'popularity': summarizer.popularity.get_stats()}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/stats/usage', methods=['GET'])
+def get_token_usage():
+    """API endpoint pour les tokens consommés sur une fenêtre (5m, 1h, 24h), par dimension"""
+    windows = dict(UsageMeter.WINDOWS)
+    window = request.args.get('window', '1h')
+    if window not in windows:
+        return jsonify({'error': f"Fenêtre inconnue (valeurs: {', '.join(windows)})"}), 400
+    
+    try:
+        return jsonify({
+            'window': window,
+            'usage': summarizer.token_usage.window(windows[window]),
+            'missing_usage': summarizer.token_usage.missing
+        }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,645 @@
+// Mount prefix of the app (Fusia hub: /wikisummarizer), empty when standalone
+const API_BASE = window.location.pathname.replace(/\/+$/, '');
+
+let isProcessing = false;
+let currentLength = 'moyen';
+let currentLanguage = 'en';
+let currentTheme = 'light';
+let currentMode = 'general';
+
+// Translations object
+const translations = {
+    en: {
+        title: "Wikipedia Summarizer Pro",
+        subtitle: "Smart summaries with Mistral AI",
+        back_to_hub: "Back to Hub",
+        search_theme: "Theme to search",
+        search_placeholder: "Artificial intelligence, Paris, Einstein...",
+        popular_suggestions: "Popular suggestions:",
+        summary_length: "Summary length",
+        summary_mode: "Summary mode",
+        optional: "optional",
+        short: "Short",
+        medium: "Medium",
+        long: "Long",
+        short_desc: "150-200 words",
+        medium_desc: "250-350 words", 
+        long_desc: "400-500 words",
+        mode_general: "General",
+        mode_historical: "Historical",
+        mode_scientific: "Scientific",
+        mode_biographical: "Biographical",
+        mode_educational: "Educational",
+        mode_cultural: "Cultural",
+        mode_key_facts: "Key Facts",
+        generate: "Generate summary",
+        clear: "Clear",
+        processing: "Processing...",
+        generated_summary: "Generated summary",
+        wikipedia_source: "Wikipedia Source:",
+        requests: "requests",
+        cached: "cached",
+        wikipedia: "Wikipedia",
+        ai_only: "AI only",
+        by_mydd: "by Mydd",
+        about_author: "About the Author",
+        author_intro: "Hi! I'm Mydd, and I'm 16 years old.",
+        author_student: "I'm still a student, passionate about technology and artificial intelligence.",
+        author_motivation: "I created this project because I believe it's important to have reliable sources and that ideas should be well explained, without errors.",
+        author_mission: "My goal is to make information more accessible to everyone through intelligent tools that combine the reliability of Wikipedia with the power of AI.",
+        author_thanks: "Thank you for using Wikipedia Summarizer Pro!",
+        searching: "Searching...",
+        generating: "Generating...",
+        completed: "Completed!",
+        copied: "Copied!",
+        copy_error: "Copy failed",
+        processing_theme: "Processing in progress...",
+        already_processing: "A process is already running...",
+        invalid_theme: "Please enter a valid theme (minimum 2 characters)",
+        summary_generated: "Summary generated!",
+        processing_error: "Processing error"
+    },
+    fr: {
+        title: "Wikipedia Summarizer Pro",
+        subtitle: "Résumés intelligents avec Mistral AI",
+        back_to_hub: "Retour au Hub",
+        search_theme: "Thème à rechercher",
+        search_placeholder: "Intelligence artificielle, Paris, Einstein...",
+        popular_suggestions: "Suggestions populaires:",
+        summary_length: "Longueur du résumé",
+        summary_mode: "Mode de résumé",
+        optional: "optionnel",
+        short: "Court",
+        medium: "Moyen", 
+        long: "Long",
+        short_desc: "150-200 mots",
+        medium_desc: "250-350 mots",
+        long_desc: "400-500 mots",
+        mode_general: "Général",
+        mode_historical: "Historique",
+        mode_scientific: "Scientifique",
+        mode_biographical: "Biographique",
+        mode_educational: "Scolaire",
+        mode_cultural: "Culturel",
+        mode_key_facts: "Faits Clés",
+        generate: "Générer le résumé",
+        clear: "Effacer",
+        processing: "Traitement en cours...",
+        generated_summary: "Résumé généré",
+        wikipedia_source: "Source Wikipedia:",
+        requests: "requêtes",
+        cached: "en cache",
+        wikipedia: "Wikipedia",
+        ai_only: "IA seule",
+        by_mydd: "by Mydd",
+        about_author: "À propos de l'auteur",
+        author_intro: "Salut ! Je suis Mydd, et j'ai 16 ans.",
+        author_student: "Je suis encore étudiant, passionné par la technologie et l'intelligence artificielle.",
+        author_motivation: "J'ai créé ce projet parce que je pense qu'il est important d'avoir des sources fiables et que les idées soient bien expliquées, sans erreurs.",
+        author_mission: "Mon objectif est de rendre l'information plus accessible à tous grâce à des outils intelligents qui combinent la fiabilité de Wikipedia avec la puissance de l'IA.",
+        author_thanks: "Merci d'utiliser Wikipedia Summarizer Pro !",
+        searching: "Recherche en cours...",
+        generating: "Génération...",
+        completed: "Terminé !",
+        copied: "Copié !",
+        copy_error: "Échec de la copie",
+        processing_theme: "Traitement en cours...",
+        already_processing: "Un traitement est déjà en cours...",
+        invalid_theme: "Veuillez entrer un thème valide (minimum 2 caractères)",
+        summary_generated: "Résumé généré !",
+        processing_error: "Erreur de traitement"
+    },
+    es: {
+        title: "Wikipedia Summarizer Pro", 
+        subtitle: "Resúmenes inteligentes con Mistral AI",
+        back_to_hub: "Volver al Hub",
+        search_theme: "Tema a buscar",
+        search_placeholder: "Inteligencia artificial, París, Einstein...",
+        popular_suggestions: "Sugerencias populares:",
+        summary_length: "Longitud del resumen",
+        summary_mode: "Modo de resumen",
+        optional: "opcional",
+        short: "Corto",
+        medium: "Medio",
+        long: "Largo", 
+        short_desc: "150-200 palabras",
+        medium_desc: "250-350 palabras",
+        long_desc: "400-500 palabras",
+        mode_general: "General",
+        mode_historical: "Histórico",
+        mode_scientific: "Científico",
+        mode_biographical: "Biográfico",
+        mode_educational: "Educativo",
+        mode_cultural: "Cultural",
+        mode_key_facts: "Datos Clave",
+        generate: "Generar resumen",
+        clear: "Limpiar",
+        processing: "Procesando...",
+        generated_summary: "Resumen generado",
+        wikipedia_source: "Fuente Wikipedia:",
+        requests: "solicitudes",
+        cached: "en caché", 
+        wikipedia: "Wikipedia",
+        ai_only: "Solo IA",
+        by_mydd: "by Mydd",
+        about_author: "Acerca del Autor",
+        author_intro: "¡Hola! Soy Mydd, y tengo 16 años.",
+        author_student: "Todavía soy estudiante, apasionado por la tecnología y la inteligencia artificial.",
+        author_motivation: "Creé este proyecto porque creo que es importante tener fuentes confiables y que las ideas estén bien explicadas, sin errores.",
+        author_mission: "Mi objetivo es hacer la información más accesible para todos a través de herramientas inteligentes que combinan la confiabilidad de Wikipedia con el poder de la IA.",
+        author_thanks: "¡Gracias por usar Wikipedia Summarizer Pro!",
+        searching: "Buscando...",
+        generating: "Generando...",
+        completed: "¡Completado!",
+        copied: "¡Copiado!",
+        copy_error: "Error al copiar",
+        processing_theme: "Procesamiento en curso...",
+        already_processing: "Ya hay un proceso en ejecución...",
+        invalid_theme: "Por favor ingrese un tema válido (mínimo 2 caracteres)",
+        summary_generated: "¡Resumen generado!",
+        processing_error: "Error de procesamiento"
+    }
+};
+
+const popularThemes = {
+    en: ["Artificial Intelligence", "Climate Change", "Einstein", "French Revolution", "Marie Curie", "Paris", "Photosynthesis", "Bitcoin", "Solar System"],
+    fr: ["Intelligence artificielle", "Réchauffement climatique", "Einstein", "Révolution française", "Marie Curie", "Paris", "Photosynthèse", "Bitcoin", "Système solaire"],
+    es: ["Inteligencia Artificial", "Cambio Climático", "Einstein", "Revolución Francesa", "Marie Curie", "París", "Fotosíntesis", "Bitcoin", "Sistema Solar"]
+};
+
+document.addEventListener('DOMContentLoaded', function() {
+    initializeApp();
+});
+
+function initializeApp() {
+    loadTheme();
+    loadLanguage();
+    initializeSuggestions();
+    setupAutocomplete();
+    loadStats();
+    updateTranslations();
+    const themeInput = document.getElementById('theme');
+    if (themeInput) themeInput.focus();
+}
+
+function loadTheme() {
+    const savedTheme = localStorage.getItem('theme') || 'light';
+    currentTheme = savedTheme;
+    document.documentElement.setAttribute('data-theme', savedTheme);
+    updateThemeToggle();
+}
+
+function loadLanguage() {
+    const savedLanguage = localStorage.getItem('language') || 'en';
+    currentLanguage = savedLanguage;
+    document.getElementById('languageSelector').value = savedLanguage;
+    updateTranslations();
+}
+
+function toggleTheme() {
+    currentTheme = currentTheme === 'light' ? 'dark' : 'light';
+    document.documentElement.setAttribute('data-theme', currentTheme);
+    localStorage.setItem('theme', currentTheme);
+    updateThemeToggle();
+}
+
+function updateThemeToggle() {
+    const toggle = document.getElementById('themeToggle');
+    if (toggle) {
+        toggle.textContent = currentTheme === 'light' ? '🌙' : '☀️';
+    }
+}
+
+function changeLanguage() {
+    const selector = document.getElementById('languageSelector');
+    currentLanguage = selector.value;
+    localStorage.setItem('language', currentLanguage);
+    updateTranslations();
+    initializeSuggestions();
+}
+
+function updateTranslations() {
+    const elements = document.querySelectorAll('[data-text-key]');
+    elements.forEach(element => {
+        const key = element.getAttribute('data-text-key');
+        if (translations[currentLanguage] && translations[currentLanguage][key]) {
+            element.textContent = translations[currentLanguage][key];
+        }
+    });
+
+    // Update placeholder
+    const themeInput = document.getElementById('theme');
+    if (themeInput && translations[currentLanguage].search_placeholder) {
+        themeInput.placeholder = translations[currentLanguage].search_placeholder;
+    }
+}
+
+function selectLength(length, element) {
+    document.querySelectorAll('.length-btn').forEach(btn => btn.classList.remove('active'));
+    element.classList.add('active');
+    currentLength = length;
+}
+
+function selectMode(mode, element) {
+    document.querySelectorAll('.mode-chip').forEach(btn => btn.classList.remove('active'));
+    element.classList.add('active');
+    currentMode = mode;
+}
+
+function showAuthorModal() {
+    document.getElementById('authorModal').classList.add('active');
+}
+
+function hideAuthorModal() {
+    document.getElementById('authorModal').classList.remove('active');
+}
+
+function copyResult() {
+    const content = document.getElementById('resultContent');
+    const copyBtn = document.getElementById('copyBtn');
+
+    if (!content || !content.textContent) {
+        showNotification(translations[currentLanguage].copy_error, 'error');
+        return;
+    }
+
+    const textContent = content.textContent || content.innerText;
+
+    navigator.clipboard.writeText(textContent).then(function() {
+        copyBtn.textContent = '✅';
+        copyBtn.classList.add('success');
+        showNotification(translations[currentLanguage].copied, 'success');
+
+        setTimeout(() => {
+            copyBtn.textContent = '📋';
+            copyBtn.classList.remove('success');
+        }, 2000);
+    }).catch(function() {
+        showNotification(translations[currentLanguage].copy_error, 'error');
+    });
+}
+
+// Autocomplete: debounced requests, stale responses aborted
+const SUGGEST_DELAY = 200;
+let suggestTimer = null;
+let suggestController = null;
+let suggestIndex = -1;
+
+function setupAutocomplete() {
+    const input = document.getElementById('theme');
+    if (!input) return;
+
+    input.addEventListener('input', function() {
+        clearTimeout(suggestTimer);
+        suggestTimer = setTimeout(() => fetchSuggestions(input.value), SUGGEST_DELAY);
+    });
+    input.addEventListener('keydown', handleAutocompleteKey);
+    input.addEventListener('blur', () => setTimeout(hideSuggestions, 150));
+}
+
+async function fetchSuggestions(query) {
+    if (suggestController) suggestController.abort();
+    if (query.trim().length < 2) {
+        hideSuggestions();
+        return;
+    }
+
+    suggestController = new AbortController();
+    try {
+        const params = new URLSearchParams({ q: query, language: currentLanguage });
+        const response = await fetch(API_BASE + '/api/suggest?' + params.toString(), { signal: suggestController.signal });
+        const data = await response.json();
+        renderSuggestions(data.suggestions || []);
+    } catch (error) {
+        if (error.name !== 'AbortError') console.error('Autocomplete error:', error);
+    }
+}
+
+function renderSuggestions(items) {
+    const list = document.getElementById('autocompleteList');
+    if (!list) return;
+
+    suggestIndex = -1;
+    list.innerHTML = '';
+    items.forEach(item => {
+        const option = document.createElement('div');
+        option.className = 'autocomplete-item';
+        option.textContent = item;
+        option.onmousedown = function(e) {
+            e.preventDefault();
+            selectSuggestion(item);
+        };
+        list.appendChild(option);
+    });
+    list.classList.toggle('active', items.length > 0);
+}
+
+function selectSuggestion(item) {
+    const input = document.getElementById('theme');
+    if (input) {
+        input.value = item;
+        input.focus();
+    }
+    hideSuggestions();
+}
+
+function hideSuggestions() {
+    clearTimeout(suggestTimer);
+    if (suggestController) suggestController.abort();
+    const list = document.getElementById('autocompleteList');
+    if (list) list.classList.remove('active');
+    suggestIndex = -1;
+}
+
+function handleAutocompleteKey(e) {
+    const list = document.getElementById('autocompleteList');
+    const items = list ? list.querySelectorAll('.autocomplete-item') : [];
+    if (!list || !list.classList.contains('active') || items.length === 0) return;
+
+    if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+        e.preventDefault();
+        const step = e.key === 'ArrowDown' ? 1 : -1;
+        suggestIndex = (suggestIndex + step + items.length) % items.length;
+        items.forEach((item, i) => item.classList.toggle('selected', i === suggestIndex));
+    } else if (e.key === 'Enter' && suggestIndex >= 0) {
+        // Select the highlighted item instead of submitting the form
+        e.preventDefault();
+        e.stopPropagation();
+        selectSuggestion(items[suggestIndex].textContent);
+    } else if (e.key === 'Escape') {
+        hideSuggestions();
+    }
+}
+
+function handleFormSubmit(event) {
+    event.preventDefault();
+    hideSuggestions();
+
+    if (isProcessing) {
+        showNotification(translations[currentLanguage].already_processing, 'info');
+        return false;
+    }
+
+    const themeInput = document.getElementById('theme');
+    const theme = themeInput ? themeInput.value.trim() : '';
+
+    if (!theme || theme.length < 2) {
+        showNotification(translations[currentLanguage].invalid_theme, 'error');
+        if (themeInput) themeInput.focus();
+        return false;
+    }
+
+    processTheme(theme, currentLength, currentLanguage, currentMode);
+    return false;
+}
+
+function initializeSuggestions() {
+    const container = document.getElementById('suggestionChips');
+    if (!container) return;
+
+    container.innerHTML = '';
+    const themes = popularThemes[currentLanguage] || popularThemes.en;
+    const shuffled = [...themes].sort(() => 0.5 - Math.random()).slice(0, 6);
+
+    shuffled.forEach(theme => {
+        const chip = document.createElement('button');
+        chip.className = 'chip';
+        chip.textContent = theme;
+        chip.type = 'button';
+        chip.onclick = function() {
+            const themeInput = document.getElementById('theme');
+            if (themeInput) {
+                themeInput.value = theme;
+                themeInput.focus();
+            }
+        };
+        container.appendChild(chip);
+    });
+}
+
+async function loadStats() {
+    try {
+        const response = await fetch(API_BASE + '/api/stats');
+        if (response.ok) {
+            const stats = await response.json();
+            updateStatsDisplay(stats);
+        }
+    } catch (error) {
+        console.log('Stats error:', error);
+    }
+}
+
+function updateStatsDisplay(stats) {
+    const elements = {
+        totalRequests: document.getElementById('totalRequests'),
+        cacheHits: document.getElementById('cacheHits'),
+        wikiSuccess: document.getElementById('wikiSuccess'),
+        aiOnly: document.getElementById('aiOnly')
+    };
+
+    if (elements.totalRequests) elements.totalRequests.textContent = stats.requests || 0;
+    if (elements.cacheHits) elements.cacheHits.textContent = stats.cache_hits || 0;
+    if (elements.wikiSuccess) elements.wikiSuccess.textContent = stats.wikipedia_success || 0;
+    if (elements.aiOnly) elements.aiOnly.textContent = stats.mistral_only || 0;
+}
+
+async function processTheme(theme, lengthMode, language, mode) {
+    isProcessing = true;
+    const generateBtn = document.getElementById('generateBtn');
+    const generateText = generateBtn.querySelector('[data-text-key="generate"]');
+
+    if (generateBtn) {
+        generateBtn.disabled = true;
+        if (generateText) generateText.textContent = translations[currentLanguage].processing_theme;
+    }
+
+    showStatus(translations[currentLanguage].searching);
+    hideResult();
+
+    try {
+        const requestData = {
+            theme: theme,
+            length_mode: lengthMode,
+            language: language,
+            mode: mode
+        };
+
+        updateProgress(20);
+        updateStatus(translations[currentLanguage].searching);
+
+        // GET so repeat views can be answered by the HTTP cache (ETag / 304)
+        const response = await fetch(API_BASE + '/api/summarize?' + new URLSearchParams(requestData).toString(), {
+            headers: { 'Accept': 'application/json' }
+        });
+
+        updateProgress(60);
+        updateStatus(translations[currentLanguage].generating);
+
+        if (!response.ok) {
+            let errorMessage = `HTTP Error ${response.status}`;
+            try {
+                const errorData = await response.json();
+                errorMessage = errorData.error || errorMessage;
+            } catch (e) {
+                const errorText = await response.text();
+                errorMessage = errorText || errorMessage;
+            }
+            throw new Error(errorMessage);
+        }
+
+        const data = await response.json();
+
+        if (!data.success) {
+            throw new Error(data.error || 'Unknown error');
+        }
+
+        updateProgress(100);
+        updateStatus(translations[currentLanguage].completed);
+        await sleep(500);
+
+        showResult(data);
+        hideStatus();
+
+        setTimeout(loadStats, 500);
+        showNotification(translations[currentLanguage].summary_generated, 'success');
+
+    } catch (error) {
+        console.error('Error:', error);
+        showNotification(error.message || translations[currentLanguage].processing_error, 'error');
+        hideStatus();
+    } finally {
+        isProcessing = false;
+        if (generateBtn && generateText) {
+            generateBtn.disabled = false;
+            generateText.textContent = translations[currentLanguage].generate;
+        }
+    }
+}
+
+function updateProgress(percent) {
+    const progressFill = document.getElementById('progressFill');
+    if (progressFill) progressFill.style.width = percent + '%';
+}
+
+function updateStatus(message) {
+    const statusText = document.getElementById('statusText');
+    if (statusText) statusText.textContent = message;
+}
+
+function showStatus(message) {
+    updateStatus(message);
+    const statusDiv = document.getElementById('status');
+    if (statusDiv) statusDiv.classList.add('active');
+    updateProgress(0);
+}
+
+function hideStatus() {
+    const statusDiv = document.getElementById('status');
+    if (statusDiv) statusDiv.classList.remove('active');
+    setTimeout(() => updateProgress(0), 300);
+}
+
+function showResult(data) {
+    const elements = {
+        title: document.getElementById('resultTitle'),
+        content: document.getElementById('resultContent'),
+        meta: document.getElementById('resultMeta'),
+        url: document.getElementById('resultUrl'),
+        link: document.getElementById('wikiLink'),
+        result: document.getElementById('result')
+    };
+
+    const titleSpan = elements.title ? elements.title.querySelector('[data-text-key="generated_summary"]') : null;
+    if (titleSpan) {
+        elements.title.innerHTML = '📖 <span data-text-key="generated_summary">' + translations[currentLanguage].generated_summary + '</span>';
+    }
+    if (elements.content) elements.content.innerHTML = data.summary;
+
+    const sourceIcon = data.source === 'wikipedia' ? '📖' : '🤖';
+    const sourceText = data.source === 'wikipedia' ? translations[currentLanguage].wikipedia : translations[currentLanguage].ai_only;
+
+    const modeText = currentMode !== 'general' ? ` • ${currentMode}` : '';
+    let metaText = `${sourceIcon} ${sourceText} • ${data.processing_time}s • ${data.length_mode}${modeText}`;
+
+    if (data.method) metaText += ` • ${data.method}`;
+    if (elements.meta) elements.meta.textContent = metaText;
+
+    if (data.url && elements.url && elements.link) {
+        const sourceSpan = elements.url.querySelector('[data-text-key="wikipedia_source"]');
+        if (sourceSpan) sourceSpan.textContent = translations[currentLanguage].wikipedia_source;
+        elements.link.href = data.url;
+        elements.link.textContent = data.url;
+        elements.url.style.display = 'block';
+    } else if (elements.url) {
+        elements.url.style.display = 'none';
+    }
+
+    if (elements.result) elements.result.classList.add('active');
+}
+
+function hideResult() {
+    const resultDiv = document.getElementById('result');
+    if (resultDiv) resultDiv.classList.remove('active');
+}
+
+function clearAll() {
+    const themeInput = document.getElementById('theme');
+    if (themeInput) {
+        themeInput.value = '';
+        themeInput.focus();
+    }
+    hideStatus();
+    hideResult();
+    isProcessing = false;
+
+    currentMode = 'general';
+    document.querySelectorAll('.mode-chip').forEach(btn => btn.classList.remove('active'));
+    document.querySelector('.mode-chip[onclick*="general"]').classList.add('active');
+
+    const generateBtn = document.getElementById('generateBtn');
+    const generateText = generateBtn ? generateBtn.querySelector('[data-text-key="generate"]') : null;
+    if (generateBtn) {
+        generateBtn.disabled = false;
+        if (generateText) generateText.textContent = translations[currentLanguage].generate;
+    }
+}
+
+function showNotification(message, type = 'info') {
+    document.querySelectorAll('.notification').forEach(n => n.remove());
+
+    const notification = document.createElement('div');
+    notification.className = `notification ${type}`;
+    notification.textContent = message;
+
+    document.body.appendChild(notification);
+    setTimeout(() => notification.classList.add('show'), 100);
+    setTimeout(() => {
+        notification.classList.remove('show');
+        setTimeout(() => notification.remove(), 300);
+    }, 3000);
+}
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+// Keyboard shortcuts
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Enter' && !e.ctrlKey && !e.metaKey) {
+        const target = e.target;
+        if (target && target.id === 'theme' && !isProcessing && target.value.trim()) {
+            e.preventDefault();
+            handleFormSubmit(e);
+        }
+    }
+
+    if (e.key === 'Escape') {
+        hideAuthorModal();
+    }
+});
+
+document.getElementById('authorModal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        hideAuthorModal();
+    }
+});